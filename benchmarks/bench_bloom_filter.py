@@ -0,0 +1,60 @@
+"""Benchmark de disponibilidad de usernames/emails con y sin filtro de Bloom sobre SQLite.
+
+Consulta una mezcla de nombres libres (--miss-ratio) y ocupados, e informa el costo por
+consulta y las tasas de falsos positivos esperada y observada.
+
+Uso: python -m benchmarks.bench_bloom_filter --users 100000 --lookups 50000 --miss-ratio 0.9
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.user import User
+from src.repositories.bloom_filter import BloomFilteredUserRepository
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.sqlite_user_repository import SQLiteUserRepository
+
+
+def timed(fn, values:list[str]) -> float:
+    """Costo promedio por llamada en microsegundos"""
+    start = time.perf_counter()
+    for value in values:
+        fn(value)
+    return (time.perf_counter() - start) / len(values) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=50_000)
+    parser.add_argument("--miss-ratio", type=float, default=0.9)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    usernames = [f"user{rng.randrange(args.users) if rng.random() >= args.miss_ratio else f'libre{i}'}"
+                 for i in range(args.lookups)]
+    emails = [f"{username}@correo.com" for username in usernames]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = SQLitePool(str(Path(directory) / "bench.db"))
+        sqlite = SQLiteUserRepository(pool)
+        sqlite.add_many([User(f"user{i}", f"user{i}@correo.com", "hash") for i in range(args.users)])
+        start = time.perf_counter()
+        filtered = BloomFilteredUserRepository(sqlite, capacity=args.users, error_rate=args.error_rate)
+        print(f"{args.users} usuarios, filtro construido en {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"{'backend':>8} | {'find us':>8} | {'email us':>8}")
+        for name, repository in (("sqlite", sqlite), ("bloom", filtered)):
+            find = timed(repository.find, usernames)
+            find_email = timed(repository.find_by_email, emails)
+            print(f"{name:>8} | {find:>8.1f} | {find_email:>8.1f}")
+        stats = filtered.stats()
+        print(f"falsos positivos: esperado {stats['expected_false_positive_rate']:.4f}, "
+              f"observado {stats['observed_false_positive_rate']:.4f}")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
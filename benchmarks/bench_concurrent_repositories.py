@@ -0,0 +1,86 @@
+"""Prueba de estres de los repositorios concurrentes: throughput al crecer la cantidad de hilos.
+
+Compara ConcurrentUserRepository (franjas por clave) con el mismo repositorio detras de un
+lock global. En CPython con GIL ambos quedan limitados a un nucleo y se espera ver solo el
+costo de los locks; en la build free-threaded (python3.13t o posterior) las franjas deben
+escalar con los hilos y el lock global no.
+
+Uso: python -m benchmarks.bench_concurrent_repositories --threads 1 2 4 8 --operations 20000
+"""
+import argparse
+import sys
+import threading
+import time
+
+from src.models.user import User
+from src.repositories.user_repository import UserRepository
+from src.repositories.concurrent_repositories import ConcurrentUserRepository
+
+
+class GlobalLockUserRepository(UserRepository):
+    """Referencia: todas las escrituras detras de un unico lock"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def add(self, user:User) -> User:
+        with self._lock:
+            return super().add(user)
+
+    def update_email(self, username:str, new_email:str) -> User:
+        with self._lock:
+            return super().update_email(username, new_email)
+
+    def delete(self, username:str) -> None:
+        with self._lock:
+            super().delete(username)
+
+
+def workload(repository, worker:int, operations:int) -> None:
+    """Por cada usuario: alta, cuatro lecturas, cambio de email y, a veces, baja"""
+    for i in range(operations // 7):
+        username = f"user{worker}_{i}"
+        repository.add(User(username, f"{username}@correo.com", "hash"))
+        for _ in range(4):
+            repository.find(username)
+        repository.update_email(username, f"{username}@nuevo.com")
+        if i % 2:
+            repository.delete(username)
+
+
+def run(repository_cls, threads:int, operations:int) -> float:
+    repository = repository_cls()
+    barrier = threading.Barrier(threads + 1)
+    def target(worker):
+        barrier.wait()
+        workload(repository, worker, operations)
+    workers = [threading.Thread(target=target, args=(worker,)) for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--operations", type=int, default=20_000, help="operaciones por hilo")
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'habilitado' if gil else 'deshabilitado'} (ops/s)")
+    print(f"{'hilos':>6} | {'lock global':>12} | {'franjas':>12} | {'escala':>7}")
+    baseline = None
+    for threads in args.threads:
+        single = run(GlobalLockUserRepository, threads, args.operations)
+        striped = run(ConcurrentUserRepository, threads, args.operations)
+        baseline = baseline or striped
+        print(f"{threads:>6} | {single:>12.0f} | {striped:>12.0f} | {striped / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark del journal (WAL) de los repositorios en memoria: escritura y recuperacion.
+
+Uso: python -m benchmarks.bench_journal --entities 1000000 --threads 8
+"""
+import argparse
+import tempfile
+import threading
+import time
+
+from src.models.user_role import UserRole
+from src.repositories.journaled_repositories import JournaledStore
+
+
+def write(store:JournaledStore, entities:int, threads:int) -> float:
+    """Agrega relaciones desde varios hilos, retorna escrituras por segundo"""
+    per_thread = entities // threads
+    def worker(index:int) -> None:
+        for i in range(per_thread):
+            store.user_roles.add(UserRole(f"u{index}-{i}", f"r{i % 100}"))
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def recover(directory:str, snapshot_every:int) -> tuple[float, int]:
+    start = time.perf_counter()
+    store = JournaledStore(directory, snapshot_every=snapshot_every)
+    elapsed = time.perf_counter() - start
+    count = len(store.user_roles.get_all())
+    store.close()
+    return elapsed, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--snapshot-every", type=int, default=100_000)
+    parser.add_argument("--flush-interval", type=float, default=0.002)
+    args = parser.parse_args()
+
+    print(f"{args.entities} relaciones, {args.threads} hilos, snapshot cada {args.snapshot_every}")
+    print(f"{'modo':>22} | {'escrituras/s':>12} | {'fsyncs':>8} | {'recuperacion':>12}")
+    for name, snapshot_every in (("solo journal", args.entities + 1), ("snapshot + cola", args.snapshot_every)):
+        with tempfile.TemporaryDirectory() as directory:
+            store = JournaledStore(directory, snapshot_every=snapshot_every, flush_interval=args.flush_interval)
+            throughput = write(store, args.entities, args.threads)
+            fsyncs = store.stats()["fsyncs"]
+            store.close()
+            elapsed, count = recover(directory, snapshot_every)
+            print(f"{name:>22} | {throughput:>12.0f} | {fsyncs:>8} | {elapsed:>11.2f}s ({count})")
+
+
+if __name__ == "__main__":
+    main()
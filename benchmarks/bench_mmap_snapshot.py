@@ -0,0 +1,68 @@
+"""Benchmark de arranque en frio: snapshot mmap frente a reconstruir los repositorios en memoria.
+
+Uso: python -m benchmarks.bench_mmap_snapshot --users 1000000 --relations 2000000
+"""
+import argparse
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from src.models.user import User
+from src.models.user_role import UserRole
+from src.repositories.user_repository import UserRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.journaled_repositories import _user_state, _user_from_state
+from src.repositories.mmap_snapshot import MappedSnapshot, write_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--relations", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    users = [User(f"user{i}", f"user{i}@correo.com", "hash") for i in range(args.users)]
+    pairs = {(f"u{rng.randrange(args.users)}", f"r{rng.randrange(100)}") for _ in range(args.relations)}
+    relations = [UserRole(user_id, role_id) for user_id, role_id in pairs]
+    names = [rng.choice(users).username for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, "state.pickle")
+        with open(pickled, "wb") as file:
+            pickle.dump({"users": [_user_state(user) for user in users], "user_roles": list(pairs)}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        mapped_path = write_snapshot(os.path.join(directory, "state.snap"), users=users, user_roles=relations)
+        print(f"{args.users} usuarios, {len(relations)} relaciones")
+        print(f"tamaño: pickle {os.path.getsize(pickled) / 2**20:.1f} MiB, mmap {os.path.getsize(mapped_path) / 2**20:.1f} MiB")
+
+        start = time.perf_counter()
+        with open(pickled, "rb") as file:
+            state = pickle.load(file)
+        user_repository = UserRepository()
+        user_repository.add_many([_user_from_state(item) for item in state["users"]])
+        relation_repository = UserRoleRepository()
+        for user_id, role_id in state["user_roles"]:
+            relation_repository.add(UserRole(user_id, role_id))
+        rebuild = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot = MappedSnapshot(mapped_path)
+        opened = time.perf_counter() - start
+
+        for name, repository in (("memoria", user_repository), ("mmap", snapshot.users)):
+            start = time.perf_counter()
+            for username in names:
+                repository.find(username)
+            elapsed = (time.perf_counter() - start) / len(names) * 1_000_000
+            print(f"{name:>8} | find {elapsed:.2f} us")
+        print(f"arranque reconstruyendo objetos: {rebuild:.3f}s")
+        print(f"arranque con mmap:               {opened * 1000:.3f}ms")
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
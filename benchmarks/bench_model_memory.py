@@ -0,0 +1,117 @@
+"""Benchmark de memoria por entidad (tracemalloc) de los modelos antes y despues de __slots__.
+
+Compara los modelos originales con __dict__ contra los modelos con __slots__, en modo normal
+y en modo compacto (USER_MANAGER_COMPACT_MODELS=1, ejecutado en un subproceso).
+
+Uso: python -m benchmarks.bench_model_memory --count 100000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+
+from uuid6 import uuid7
+
+
+class DictUser:
+    def __init__(self, username, email, password):
+        self.id = str(uuid7())
+        self.username = username
+        self.email = email
+        self.password = password
+        self.status = "inactive"
+        self.roles = []
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+class DictNamed:
+    def __init__(self, name, description=""):
+        self.id = str(uuid7())
+        self.name = name
+        self.description = description
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+class DictUserRole:
+    def __init__(self, user_id, role_id):
+        self.user_id = user_id
+        self.role_id = role_id
+
+
+class DictRolePermission:
+    def __init__(self, role_id, permission_id):
+        self.permission_id = permission_id
+        self.role_id = role_id
+
+
+def bytes_per_entity(factory, count:int) -> float:
+    """Memoria promedio retenida por cada entidad creada con factory(i)"""
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    entities = [factory(i) for i in range(count)]
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in snapshot.compare_to(baseline, "filename"))
+    # Se descuenta la lista que mantiene vivas las entidades
+    retained -= sys.getsizeof(entities)
+    return retained / count
+
+
+def factories(legacy:bool) -> dict:
+    if legacy:
+        user, role, permission, user_role, role_permission = DictUser, DictNamed, DictNamed, DictUserRole, DictRolePermission
+    else:
+        from src.models.user import User as user
+        from src.models.role import Role as role
+        from src.models.permission import Permission as permission
+        from src.models.user_role import UserRole as user_role
+        from src.models.role_permission import RolePermission as role_permission
+    # Los ids de relacion se comparten entre relaciones, como ocurre con ids reales
+    shared_ids = [str(uuid7()) for _ in range(1000)]
+    return {
+        "User": lambda i: user(f"user{i}", f"user{i}@correo.com", "$2b$12$" + "x" * 53),
+        "Role": lambda i: role(f"role{i}"),
+        "Permission": lambda i: permission(f"perm{i}"),
+        "UserRole": lambda i: user_role(shared_ids[i % 1000], shared_ids[(i * 7) % 1000]),
+        "RolePermission": lambda i: role_permission(shared_ids[i % 1000], shared_ids[(i * 7) % 1000]),
+    }
+
+
+def measure(mode:str, count:int) -> dict[str, float]:
+    return {name: bytes_per_entity(factory, count) for name, factory in factories(mode == "dict").items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--mode", choices=["dict", "slots"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        for name, size in measure(args.mode, args.count).items():
+            print(f"{name} {size:.1f}")
+        return
+
+    results = {}
+    runs = (("dict", "0"), ("slots", "0"), ("slots+compact", "1"))
+    for label, compact in runs:
+        env = dict(os.environ, USER_MANAGER_COMPACT_MODELS=compact)
+        mode = "dict" if label == "dict" else "slots"
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_model_memory", "--count", str(args.count), "--mode", mode],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        results[label] = dict((name, float(size)) for name, size in (line.split() for line in output.splitlines()))
+
+    print(f"bytes por entidad ({args.count} entidades)")
+    print(f"{'modelo':>15} | " + " | ".join(f"{label:>14}" for label, _ in runs))
+    for name in results["dict"]:
+        print(f"{name:>15} | " + " | ".join(f"{results[label][name]:>14.1f}" for label, _ in runs))
+
+
+if __name__ == "__main__":
+    main()
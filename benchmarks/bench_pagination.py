@@ -0,0 +1,61 @@
+"""Benchmark del listado de usuarios en NDJSON: tiempo al primer chunk, total y memoria pico.
+
+Compara el listado completo (serializar get_all a una lista JSON) con el streaming por
+pagina de ndjson_pages. La memoria pico (tracemalloc) no cuenta los usuarios ya cargados
+y en el streaming debe mantenerse constante al crecer --users.
+
+Uso: python -m benchmarks.bench_pagination --users 1000000 --page-size 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from src.api.pagination import ndjson_pages
+from src.api.serializers import user_to_dict
+from src.models.user import User
+from src.repositories.user_repository import UserRepository
+from src.services.async_user_service import AsyncUserService
+
+
+async def stream(service:AsyncUserService, page_size:int) -> tuple[float, int]:
+    start = time.perf_counter()
+    first_chunk = None
+    size = 0
+    async for chunk in ndjson_pages(service.get_users_page, user_to_dict, lambda user: user.id, None, page_size):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+        size += len(chunk)
+    return first_chunk or 0.0, size
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    repository = UserRepository()
+    password = "$2b$04$" + "x" * 53
+    repository.add_many([User(f"user{i}", f"user{i}@correo.com", password) for i in range(args.users)])
+    service = AsyncUserService(repository)
+
+    size, elapsed, peak = measure(lambda: len(json.dumps([user_to_dict(user) for user in repository.get_all()])))
+    print(f"lista completa: total {elapsed * 1000:>9.1f} ms, pico {peak:>8.2f} MiB, {size / 2**20:.1f} MiB")
+    (first_chunk, size), elapsed, peak = measure(lambda: asyncio.run(stream(service, args.page_size)))
+    print(f"ndjson:         primer chunk {first_chunk * 1000:.2f} ms, total {elapsed * 1000:>9.1f} ms, "
+          f"pico {peak:>8.2f} MiB, {size / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
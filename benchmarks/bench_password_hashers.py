@@ -0,0 +1,58 @@
+"""Benchmark de algoritmos de hashing de contraseñas: hashes por segundo por nucleo y memoria.
+
+Uso: python -m benchmarks.bench_password_hashers --seconds 2
+"""
+import argparse
+import time
+
+from src.security.hashers import BcryptHasher, ScryptHasher, PBKDF2Hasher
+
+CANDIDATES = [
+    BcryptHasher(rounds=10),
+    BcryptHasher(rounds=12),
+    ScryptHasher(n=2 ** 14, r=8, p=1),
+    ScryptHasher(n=2 ** 15, r=8, p=1),
+    ScryptHasher(n=2 ** 17, r=8, p=1),
+    PBKDF2Hasher(iterations=310_000),
+    PBKDF2Hasher(iterations=600_000),
+    PBKDF2Hasher(iterations=210_000, digest="sha512"),
+]
+
+
+def memory_cost(hasher) -> int:
+    """Memoria de trabajo por hash: scrypt es memory-hard, bcrypt y PBKDF2 usan unos pocos KB"""
+    if isinstance(hasher, ScryptHasher):
+        return hasher.memory_cost()
+    if isinstance(hasher, BcryptHasher):
+        return 4 * 1024
+    return 1024
+
+
+def hashes_per_second(hasher, seconds:float) -> tuple[float, float]:
+    """Ejecuta hashes en un solo hilo durante ~seconds, retorna (hashes/s, ms de verificacion)"""
+    password_hashed = hasher.hash("benchmark-password")
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds or count == 0:
+        hasher.hash("benchmark-password")
+        count += 1
+    rate = count / (time.perf_counter() - start)
+    start = time.perf_counter()
+    hasher.verify("benchmark-password", password_hashed)
+    verify_ms = (time.perf_counter() - start) * 1000
+    return rate, verify_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'algoritmo':>34} | {'hashes/s/nucleo':>15} | {'verify ms':>9} | {'memoria KiB':>11}")
+    for hasher in CANDIDATES:
+        rate, verify_ms = hashes_per_second(hasher, args.seconds)
+        print(f"{hasher.describe():>34} | {rate:>15.2f} | {verify_ms:>9.1f} | {memory_cost(hasher) / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
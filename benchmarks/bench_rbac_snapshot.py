@@ -0,0 +1,80 @@
+"""Benchmark de has_permission con escrituras concurrentes: AuthorizationService frente a snapshots.
+
+Un hilo escritor asigna y quita roles sin pausa mientras --readers hilos consultan
+permisos; se informa el throughput de lectura y el costo de publicar cada version nueva.
+
+Uso: python -m benchmarks.bench_rbac_snapshot --users 100000 --roles 50 --readers 4 --seconds 3
+"""
+import argparse
+import random
+import threading
+import time
+
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.services.authorization_service import AuthorizationService
+from src.services.rbac_snapshot import SnapshotAuthorizationService
+
+
+def run(service, users:int, roles:int, readers:int, seconds:float) -> tuple[float, float]:
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(index):
+        rng = random.Random(index)
+        count = 0
+        while not stop.is_set():
+            for _ in range(1000):
+                service.has_permission(f"u{rng.randrange(users)}", f"p{rng.randrange(roles * 4)}")
+            count += 1000
+        reads[index] = count
+
+    def writer():
+        rng = random.Random(99)
+        while not stop.is_set():
+            user_id, role_id = f"u{rng.randrange(users)}", f"r{rng.randrange(roles)}"
+            service.on_role_assigned(user_id, role_id)
+            service.on_role_removed(user_id, role_id)
+            writes[0] += 2
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    user_roles, role_permissions = UserRoleRepository(), RolePermissionRepository()
+    rng = random.Random(1)
+    for i in range(args.users):
+        user_roles.add(UserRole(f"u{i}", f"r{rng.randrange(args.roles)}"))
+    for role in range(args.roles):
+        for permission in rng.sample(range(args.roles * 4), 8):
+            role_permissions.add(RolePermission(f"r{role}", f"p{permission}"))
+
+    print(f"{args.users} usuarios, {args.roles} roles, {args.readers} lectores")
+    print(f"{'servicio':>10} | {'lecturas/s':>12} | {'escrituras/s':>12}")
+    for name, service in (("cache", AuthorizationService(user_roles, role_permissions)),
+                          ("snapshot", SnapshotAuthorizationService(user_roles, role_permissions))):
+        service.warm()
+        reads, writes = run(service, args.users, args.roles, args.readers, args.seconds)
+        print(f"{name:>10} | {reads:>12.0f} | {writes:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
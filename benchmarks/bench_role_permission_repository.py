@@ -0,0 +1,77 @@
+"""Micro-benchmark de RolePermissionRepository indexado frente a la version basada en lista.
+
+Uso: python -m benchmarks.bench_role_permission_repository --roles 10000 --permissions 1000
+"""
+import argparse
+import random
+import time
+
+from src.models.role_permission import RolePermission
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.repositories.bitset_role_permission_repository import BitsetRolePermissionRepository
+
+
+class ListRolePermissionRepository:
+    """Implementacion original (lista con busqueda lineal), usada como referencia"""
+    def __init__(self):
+        self._relations: list[RolePermission] = []
+
+    def add(self, relation: RolePermission):
+        self._relations.append(relation)
+
+    def find(self, role_id: str, permission_id: str) -> RolePermission | None:
+        for relation in self._relations:
+            if relation.role_id == role_id and relation.permission_id == permission_id:
+                return relation
+        return None
+
+    def role_has_permission(self, role_id: str, permission_id: str) -> bool:
+        return self.find(role_id, permission_id) is not None
+
+    def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
+        return [relation for relation in self._relations if relation.role_id == role_id]
+
+
+def populate(repository, roles:int, permissions:int, per_role:int, seed:int) -> None:
+    rng = random.Random(seed)
+    for r in range(roles):
+        for p in rng.sample(range(permissions), per_role):
+            repository.add(RolePermission(f"r{r}", f"p{p}"))
+
+
+def time_calls(fn, args:list[tuple]) -> float:
+    """Retorna el costo promedio en microsegundos por llamada"""
+    start = time.perf_counter()
+    for call_args in args:
+        fn(*call_args)
+    return (time.perf_counter() - start) / len(args) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--roles", type=int, default=10_000)
+    parser.add_argument("--permissions", type=int, default=1_000)
+    parser.add_argument("--per-role", type=int, default=10)
+    parser.add_argument("--checks", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    checks = [(f"r{rng.randrange(args.roles)}", f"p{rng.randrange(args.permissions)}") for _ in range(args.checks)]
+    roles = [(role_id,) for role_id, _ in checks]
+
+    print(f"{args.roles} roles x {args.permissions} permisos, {args.per_role} permisos por rol")
+    print(f"{'implementacion':>16} | {'has_permission us':>18} | {'by_role us':>12}")
+    implementations = (
+        ("lista", ListRolePermissionRepository()),
+        ("indexada", RolePermissionRepository()),
+        ("bitset", BitsetRolePermissionRepository()),
+    )
+    for name, repository in implementations:
+        populate(repository, args.roles, args.permissions, args.per_role, seed=7)
+        check_cost = time_calls(repository.role_has_permission, checks)
+        by_role_cost = time_calls(repository.get_permissions_by_role, roles)
+        print(f"{name:>16} | {check_cost:>18.2f} | {by_role_cost:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
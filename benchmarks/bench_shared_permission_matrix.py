@@ -0,0 +1,86 @@
+"""Benchmark de la matriz de permisos compartida: memoria frente a repositorios por worker y lecturas/s.
+
+Mide la memoria de los repositorios en memoria (tracemalloc, lo que cada worker duplicaria)
+frente al tamaño del segmento compartido, y el throughput de has_permission en --workers
+procesos lectores conectados al mismo segmento mientras el escritor aplica cambios.
+
+Uso: python -m benchmarks.bench_shared_permission_matrix --users 100000 --roles 64 --workers 4
+"""
+import argparse
+import multiprocessing
+import random
+import time
+import tracemalloc
+
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.repositories.shared_permission_matrix import SharedPermissionMatrix
+
+
+def reader(name:str, users:int, permissions:int, seconds:float, results) -> None:
+    rng = random.Random()
+    with SharedPermissionMatrix.attach(name) as matrix:
+        matrix.warm()
+        count = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for _ in range(1000):
+                matrix.has_permission(f"u{rng.randrange(users)}", f"p{rng.randrange(permissions)}")
+            count += 1000
+    results.put(count / seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=64)
+    parser.add_argument("--permissions", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    user_roles = [UserRole(f"u{i}", f"r{rng.randrange(args.roles)}") for i in range(args.users)]
+    role_permissions = [RolePermission(f"r{role}", f"p{permission}") for role in range(args.roles)
+                        for permission in rng.sample(range(args.permissions), 8)]
+
+    tracemalloc.start()
+    user_role_repo, role_permission_repo = UserRoleRepository(), RolePermissionRepository()
+    for relation in user_roles:
+        user_role_repo.add(relation)
+    for relation in role_permissions:
+        role_permission_repo.add(relation)
+    repositories = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    with SharedPermissionMatrix.create(max_users=args.users, max_roles=args.roles,
+                                       max_permissions=args.permissions) as matrix:
+        matrix.load(user_roles, role_permissions)
+        segment = matrix.size_for(args.users, args.roles, args.permissions) / 2**20
+        print(f"repositorios por worker: {repositories:.1f} MiB ({repositories * args.workers:.1f} MiB con "
+              f"{args.workers} workers); segmento compartido: {segment:.1f} MiB en total")
+
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=reader, args=(matrix.name, args.users, args.permissions,
+                                                                 args.seconds, results))
+                   for _ in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        writes = 0
+        deadline = time.perf_counter() + args.seconds
+        while time.perf_counter() < deadline:
+            user_id, role_id = f"u{rng.randrange(args.users)}", f"r{rng.randrange(args.roles)}"
+            matrix.on_role_assigned(user_id, role_id)
+            matrix.on_role_removed(user_id, role_id)
+            writes += 2
+            time.sleep(0.001)
+        reads = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        print(f"lecturas: {sum(reads):.0f}/s entre {args.workers} workers, escrituras: {writes / args.seconds:.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
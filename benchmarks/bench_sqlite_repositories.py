@@ -0,0 +1,60 @@
+"""Benchmark de los repositorios SQLite frente a los repositorios en memoria.
+
+Uso: python -m benchmarks.bench_sqlite_repositories --users 20000 --relations 50000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.user import User
+from src.models.user_role import UserRole
+from src.repositories.user_repository import UserRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.repositories.sqlite_user_role_repository import SQLiteUserRoleRepository
+
+
+def timed(fn, calls:list[tuple]) -> float:
+    """Costo promedio por llamada en microsegundos"""
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - start) / len(calls) * 1_000_000
+
+
+def run(name:str, users_repo, relations_repo, users:list[User], relations:list[UserRole], lookups:int) -> None:
+    rng = random.Random(3)
+    add_user = timed(users_repo.add, [(user,) for user in users])
+    add_relation = timed(relations_repo.add, [(relation,) for relation in relations])
+    find = timed(users_repo.find, [(rng.choice(users).username,) for _ in range(lookups)])
+    find_email = timed(users_repo.find_by_email, [(rng.choice(users).email,) for _ in range(lookups)])
+    roles = timed(relations_repo.get_roles_by_user, [(rng.choice(relations).user_id,) for _ in range(lookups)])
+    print(f"{name:>10} | {add_user:>9.1f} | {add_relation:>9.1f} | {find:>9.1f} | {find_email:>10.1f} | {roles:>13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--relations", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    users = [User(f"user{i}", f"user{i}@correo.com", "hash") for i in range(args.users)]
+    rng = random.Random(1)
+    pairs = {(f"u{rng.randrange(args.users)}", f"r{rng.randrange(100)}") for _ in range(args.relations)}
+    relations = [UserRole(user_id, role_id) for user_id, role_id in pairs]
+
+    print(f"{args.users} usuarios, {len(relations)} relaciones (us por operacion)")
+    print(f"{'backend':>10} | {'add user':>9} | {'add rel':>9} | {'find':>9} | {'find email':>10} | {'roles by user':>13}")
+    run("memoria", UserRepository(), UserRoleRepository(), users, relations, args.lookups)
+    with tempfile.TemporaryDirectory() as directory:
+        pool = SQLitePool(str(Path(directory) / "bench.db"))
+        run("sqlite", SQLiteUserRepository(pool), SQLiteUserRoleRepository(pool), users, relations, args.lookups)
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
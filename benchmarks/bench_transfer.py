@@ -0,0 +1,51 @@
+"""Benchmark de exportacion/importacion en streaming: filas por segundo y memoria pico.
+
+La memoria pico (tracemalloc) se mide solo durante la transferencia, sin contar los datos
+ya cargados en el repositorio de origen, y debe mantenerse constante al crecer --rows.
+
+Uso: python -m benchmarks.bench_transfer --rows 10000000 --format jsonl.gz
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.models.user_role import UserRole
+from src.repositories.user_role_repository import UserRoleRepository
+from src.services.transfer_service import TransferService, read_rows
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", default="csv", choices=["csv", "jsonl", "csv.gz", "jsonl.gz"])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    repository = UserRoleRepository()
+    for i in range(args.rows):
+        repository.add(UserRole(f"u{i}", f"r{i % 100}"))
+    service = TransferService(user_role_repository=repository, chunk_size=args.chunk_size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"user_roles.{args.format}")
+        elapsed, peak = measure(lambda: service.export_user_roles(path))
+        print(f"exportar: {args.rows / elapsed:>10.0f} filas/s, pico {peak:.2f} MiB, "
+              f"archivo {os.path.getsize(path) / 2**20:.1f} MiB")
+        elapsed, peak = measure(lambda: sum(1 for _ in read_rows(path)))
+        print(f"leer:     {args.rows / elapsed:>10.0f} filas/s, pico {peak:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark de UserRepository.find_by_email con el indice secundario de emails.
+
+Uso: python -m benchmarks.bench_user_email_index --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+
+from src.models.user import User
+from src.repositories.user_repository import UserRepository
+
+
+def build_repository(size:int) -> UserRepository:
+    repository = UserRepository()
+    for i in range(size):
+        repository.add(User(f"user{i}", f"user{i}@correo.com", "hash"))
+    return repository
+
+
+def measure_lookups(repository:UserRepository, size:int, lookups:int) -> float:
+    """Retorna el costo promedio en microsegundos de find_by_email (aciertos y fallos)"""
+    emails = [f"user{random.randrange(size)}@correo.com" for _ in range(lookups // 2)]
+    emails += [f"missing{i}@correo.com" for i in range(lookups - len(emails))]
+    random.shuffle(emails)
+    start = time.perf_counter()
+    for email in emails:
+        repository.find_by_email(email)
+    elapsed = time.perf_counter() - start
+    return elapsed / lookups * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'usuarios':>10} | {'us/lookup':>10}")
+    for size in args.sizes:
+        repository = build_repository(size)
+        cost = measure_lookups(repository, size, args.lookups)
+        print(f"{size:>10} | {cost:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Prueba de carga de la API con solo la biblioteca estandar: latencia p50/p99 por ruta.
+
+Levanta uvicorn en un subproceso (o usa --url para apuntar a un servidor existente), crea
+datos de prueba y luego ejecuta una mezcla de rutas desde varios hilos con conexiones
+keep-alive de http.client.
+
+Uso: python -m benchmarks.load_api --requests 20000 --concurrency 32 --bcrypt-rounds 10
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+class Client:
+    def __init__(self, url:str):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+
+    def request(self, method:str, path:str, body:dict | None = None) -> tuple[int, bytes]:
+        payload = None if body is None else json.dumps(body)
+        headers = {"Content-Type": "application/json"} if payload else {}
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, response.read()
+
+
+def wait_until_ready(url:str, timeout:float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            Client(url).request("GET", "/roles")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"El servidor no respondio en {url}")
+
+
+def seed(url:str, users:int, roles:int, permissions:int) -> None:
+    client = Client(url)
+    for i in range(permissions):
+        client.request("POST", "/permissions", {"name": f"perm{i}"})
+    for i in range(roles):
+        client.request("POST", "/roles", {"name": f"role{i}"})
+        for j in range(0, permissions, roles):
+            client.request("POST", f"/roles/role{i}/permissions", {"permission_id": f"perm{(i + j) % permissions}"})
+    for i in range(users):
+        client.request("POST", "/users", {"username": f"user{i}", "email": f"user{i}@correo.com", "password": "secreto"})
+        client.request("POST", f"/users/user{i}/roles", {"role_id": f"role{i % roles}"})
+
+
+def scenario(rng:random.Random, users:int, permissions:int) -> tuple[str, str, str, dict | None]:
+    """Elige una solicitud de la mezcla; retorna (nombre de ruta, metodo, path, body)"""
+    user = f"user{rng.randrange(users)}"
+    choice = rng.random()
+    if choice < 0.4:
+        return "GET /users/{username}", "GET", f"/users/{user}", None
+    if choice < 0.7:
+        return ("GET /users/{id}/permissions/{p}", "GET",
+                f"/users/{user}/permissions/perm{rng.randrange(permissions)}", None)
+    if choice < 0.85:
+        return "GET /users/{id}/roles", "GET", f"/users/{user}/roles", None
+    if choice < 0.95:
+        return "GET /roles", "GET", "/roles", None
+    return "POST /users/{username}/verify-password", "POST", f"/users/{user}/verify-password", {"password": "secreto"}
+
+
+def run(url:str, requests:int, concurrency:int, users:int, permissions:int) -> tuple[dict, float]:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    per_worker = requests // concurrency
+
+    def worker(index:int) -> None:
+        rng = random.Random(index)
+        client = Client(url)
+        local: list[tuple[str, float, int]] = []
+        for _ in range(per_worker):
+            name, method, path, body = scenario(rng, users, permissions)
+            start = time.perf_counter()
+            status, _ = client.request(method, path, body)
+            local.append((name, time.perf_counter() - start, status))
+        with lock:
+            for name, elapsed, status in local:
+                latencies[name].append(elapsed)
+                if status >= 400:
+                    errors[name] += 1
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {name: (values, errors[name]) for name, values in latencies.items()}, per_worker * concurrency / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="servidor existente; si se omite se levanta uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--roles", type=int, default=10)
+    parser.add_argument("--permissions", type=int, default=50)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        environment = {**os.environ, "USER_MANAGER_BCRYPT_ROUNDS": str(args.bcrypt_rounds)}
+        server = subprocess.Popen([sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(args.port),
+                                   "--workers", str(args.workers), "--log-level", "warning"], env=environment)
+    try:
+        wait_until_ready(url)
+        seed(url, args.users, args.roles, args.permissions)
+        results, throughput = run(url, args.requests, args.concurrency, args.users, args.permissions)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.requests} solicitudes, concurrencia {args.concurrency}: {throughput:.0f} req/s")
+    print(f"{'ruta':<40} | {'n':>6} | {'p50 ms':>8} | {'p99 ms':>8} | {'errores':>7}")
+    for name, (values, errors) in sorted(results.items()):
+        percentiles = statistics.quantiles(values, n=100, method="inclusive")
+        print(f"{name:<40} | {len(values):>6} | {percentiles[49] * 1000:>8.2f} | {percentiles[98] * 1000:>8.2f} | {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Prueba de carga de logins concurrentes sobre el pool de contraseñas.
+
+Lanza N verificaciones bcrypt concurrentes con asyncio contra pools de distinto tamaño y
+reporta el throughput y el retraso maximo del event loop (que debe mantenerse bajo porque
+bcrypt corre fuera del loop).
+
+Uso: python -m benchmarks.load_password_pool --logins 64 --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from src.security import password_utils
+from src.services.user_service import UserService
+
+
+async def measure_loop_lag(stop:asyncio.Event, interval:float = 0.005) -> float:
+    """Mide el mayor retraso observado al despertar un sleep periodico"""
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - expected)
+    return worst
+
+
+async def run_logins(service:UserService, usernames:list[str], password:str) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(service.verify_user_password_async(username, password) for username in usernames))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await lag_task
+    assert all(results)
+    return elapsed, lag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    password = "loadtest123"
+    service = UserService()
+    for i in range(args.users):
+        service.create_user(f"user{i}", f"user{i}@correo.com", password)
+    usernames = [f"user{i % args.users}" for i in range(args.logins)]
+
+    print(f"{args.logins} logins concurrentes, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} | {'logins/s':>9} | {'speedup':>8} | {'lag max ms':>10}")
+    baseline = None
+    for workers in args.workers:
+        pool = password_utils.configure_password_pool(max_workers=workers, max_queue=args.logins)
+        elapsed, lag = asyncio.run(run_logins(service, usernames, password))
+        throughput = args.logins / elapsed
+        baseline = baseline or throughput
+        print(f"{workers:>8} | {throughput:>9.1f} | {throughput / baseline:>7.2f}x | {lag * 1000:>10.1f}")
+        print(f"{'':>8}   metricas: {pool.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
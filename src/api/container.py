@@ -0,0 +1,57 @@
+import os
+
+from src.repositories.user_repository import UserRepository
+from src.repositories.role_repository import RoleRepository
+from src.repositories.permission_repository import PermissionRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.repositories.journaled_repositories import JournaledStore
+from src.services.rbac_snapshot import SnapshotAuthorizationService
+from src.services.async_user_service import AsyncUserService
+from src.services.async_role_service import AsyncRoleService
+from src.services.async_permission_service import AsyncPermissionService
+from src.services.async_user_role_service import AsyncUserRoleService
+from src.services.async_role_permission_service import AsyncRolePermissionService
+from src.security.password_utils import get_password_pool, calibrate_bcrypt_rounds
+
+
+class ServiceContainer:
+    """Servicios de la aplicacion, creados una sola vez en el lifespan y compartidos por todas las rutas.
+
+    Con USER_MANAGER_DATA_DIR los repositorios son los del JournaledStore de ese directorio
+    (durables, con recuperacion al iniciar); sin ella se usan los repositorios en memoria.
+    Con USER_MANAGER_CALIBRATE_BCRYPT=1 el costo de bcrypt se calibra al iniciar para que un
+    hash tarde como maximo USER_MANAGER_BCRYPT_TARGET_MS milisegundos (100 por defecto).
+    """
+
+    def __init__(self, data_dir:str | None = None, calibrate_bcrypt:bool | None = None):
+        data_dir = data_dir or os.getenv("USER_MANAGER_DATA_DIR")
+        if calibrate_bcrypt is None:
+            calibrate_bcrypt = os.getenv("USER_MANAGER_CALIBRATE_BCRYPT", "0") == "1"
+        self.calibrate_bcrypt = calibrate_bcrypt
+        self.store = JournaledStore(data_dir) if data_dir else None
+        if self.store:
+            repositories = (self.store.users, self.store.roles, self.store.permissions,
+                            self.store.user_roles, self.store.role_permissions)
+        else:
+            repositories = (UserRepository(), RoleRepository(), PermissionRepository(),
+                            UserRoleRepository(), RolePermissionRepository())
+        users, roles, permissions, user_roles, role_permissions = repositories
+        # Las consultas de permisos leen un snapshot inmutable y no compiten con las escrituras
+        self.authorization = SnapshotAuthorizationService(user_roles, role_permissions)
+        self.users = AsyncUserService(users)
+        self.roles = AsyncRoleService(roles)
+        self.permissions = AsyncPermissionService(permissions)
+        self.user_roles = AsyncUserRoleService(user_roles, self.authorization)
+        self.role_permissions = AsyncRolePermissionService(role_permissions, self.authorization)
+
+    def warm(self) -> None:
+        """Prepara lo que de otro modo pagaria la primera solicitud: el pool de bcrypt y los permisos efectivos"""
+        if self.calibrate_bcrypt:
+            calibrate_bcrypt_rounds(float(os.getenv("USER_MANAGER_BCRYPT_TARGET_MS", 100)))
+        get_password_pool()
+        self.authorization.warm()
+
+    def close(self) -> None:
+        if self.store:
+            self.store.close()
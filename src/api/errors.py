@@ -0,0 +1,54 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.constants import messages
+from src.exceptions.user_exceptions import UserError, UserNotFoundError
+from src.exceptions.role_exceptions import RoleError, RoleNotFoundError, RoleAlreadyExistsError
+from src.exceptions.permission_exceptions import PermissionError, PermissionNotFoundError, PermissionAlreadyExistsError
+from src.exceptions.security_exceptions import PasswordHashingBusyError
+from src.exceptions.concurrency_exceptions import VersionConflictError
+from src.exceptions.relation_exceptions import RelationError
+from src.exceptions.pagination_exceptions import PaginationError
+
+_CONFLICT_MESSAGES = {messages.USER_ALREADY_EXISTS, messages.EMAIL_ALREADY_REGISTERED}
+
+
+def _error(status_code:int, message:str, headers:dict | None = None) -> JSONResponse:
+    return JSONResponse({"detail": message}, status_code=status_code, headers=headers)
+
+
+async def user_error_handler(request:Request, error:UserError) -> JSONResponse:
+    if isinstance(error, UserNotFoundError):
+        return _error(404, error.message)
+    return _error(409 if error.message in _CONFLICT_MESSAGES else 400, error.message)
+
+async def role_error_handler(request:Request, error:RoleError) -> JSONResponse:
+    if isinstance(error, RoleNotFoundError):
+        return _error(404, str(error))
+    return _error(409 if isinstance(error, RoleAlreadyExistsError) else 400, str(error))
+
+async def permission_error_handler(request:Request, error:PermissionError) -> JSONResponse:
+    if isinstance(error, PermissionNotFoundError):
+        return _error(404, str(error))
+    return _error(409 if isinstance(error, PermissionAlreadyExistsError) else 400, str(error))
+
+async def password_busy_handler(request:Request, error:PasswordHashingBusyError) -> JSONResponse:
+    # Se pide al cliente que reintente en lugar de encolar trabajo de bcrypt sin limite
+    return _error(503, error.message, headers={"Retry-After": "1"})
+
+async def version_conflict_handler(request:Request, error:VersionConflictError) -> JSONResponse:
+    return _error(409, error.message)
+
+async def bad_request_handler(request:Request, error:RelationError | PaginationError) -> JSONResponse:
+    # Solo errores de validacion propios: un ValueError cualquiera es un fallo interno y responde 500
+    return _error(400, error.message)
+
+
+def register_exception_handlers(app:FastAPI) -> None:
+    app.add_exception_handler(UserError, user_error_handler)
+    app.add_exception_handler(RoleError, role_error_handler)
+    app.add_exception_handler(PermissionError, permission_error_handler)
+    app.add_exception_handler(PasswordHashingBusyError, password_busy_handler)
+    app.add_exception_handler(VersionConflictError, version_conflict_handler)
+    app.add_exception_handler(RelationError, bad_request_handler)
+    app.add_exception_handler(PaginationError, bad_request_handler)
@@ -0,0 +1,66 @@
+"""Paginacion por cursor y respuestas NDJSON en streaming para los listados.
+
+El cursor es opaco para el cliente: la clave de orden del ultimo elemento recibido (el id
+uuid7 de una entidad o el par de una relacion) serializada en JSON y codificada en base64url.
+"""
+import base64
+import binascii
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.exceptions.pagination_exceptions import InvalidCursorError
+
+NDJSON = "application/x-ndjson"
+STREAM_PAGE_SIZE = 1000
+
+
+def encode_cursor(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor:str | None, pair:bool = False):
+    """Decodifica el cursor recibido: un id, o con pair un par de ids que vuelve como tupla (relaciones).
+
+    Cualquier otra forma, aunque sea JSON valido, es un cursor invalido y no llega al repositorio.
+    """
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError) as error:
+        raise InvalidCursorError("Cursor invalido") from error
+    if pair:
+        if isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key):
+            return tuple(key)
+    elif isinstance(key, str):
+        return key
+    raise InvalidCursorError("Cursor invalido")
+
+def _dumps(item:dict) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+async def ndjson_pages(fetch_page:Callable[..., Awaitable[list]], serialize:Callable, key:Callable,
+                       after, page_size:int = STREAM_PAGE_SIZE) -> AsyncIterator[bytes]:
+    """Recorre el listado pagina por pagina, emitiendo un chunk NDJSON por pagina"""
+    while True:
+        items = await fetch_page(after, page_size)
+        if items:
+            yield "".join([_dumps(serialize(item)) + "\n" for item in items]).encode()
+        if len(items) < page_size:
+            return
+        after = key(items[-1])
+
+async def list_response(request:Request, fetch_page:Callable[..., Awaitable[list]], serialize:Callable,
+                        key:Callable, cursor:str | None, limit:int, pair_cursor:bool = False):
+    """Con Accept: application/x-ndjson transmite todo el listado desde el cursor; si no, retorna una pagina JSON.
+
+    pair_cursor indica que la clave de orden es un par (listados de relaciones).
+    """
+    after = decode_cursor(cursor, pair_cursor)
+    if NDJSON in request.headers.get("accept", ""):
+        return StreamingResponse(ndjson_pages(fetch_page, serialize, key, after), media_type=NDJSON)
+    items = await fetch_page(after, limit)
+    next_cursor = encode_cursor(key(items[-1])) if len(items) == limit else None
+    return JSONResponse({"items": [serialize(item) for item in items], "next_cursor": next_cursor})
@@ -0,0 +1,65 @@
+from pydantic import BaseModel, Field
+
+from src.models.user_status import UserStatus
+
+
+class UserCreate(BaseModel):
+    username: str
+    email: str
+    password: str
+
+
+class UsernameUpdate(BaseModel):
+    username: str
+    expected_version: int | None = None
+
+
+class EmailUpdate(BaseModel):
+    email: str
+    expected_version: int | None = None
+
+
+class PasswordUpdate(BaseModel):
+    current_password: str
+    new_password: str
+    expected_version: int | None = None
+
+
+class PasswordCheck(BaseModel):
+    password: str
+
+
+class StatusUpdate(BaseModel):
+    status: UserStatus
+    expected_version: int | None = None
+
+
+class NamedCreate(BaseModel):
+    name: str
+    description: str = ""
+
+
+class DescriptionUpdate(BaseModel):
+    description: str
+    expected_version: int | None = None
+
+
+class RoleAssignment(BaseModel):
+    role_id: str
+
+
+class PermissionGrant(BaseModel):
+    permission_id: str
+
+
+class AuthorizationCheck(BaseModel):
+    user_id: str
+    permission_id: str
+
+
+# Tope de pares por solicitud a /authorization/check, para que un solo lote no acapare check_many
+MAX_AUTHORIZATION_CHECKS = 1000
+
+
+class AuthorizationBatch(BaseModel):
+    checks: list[AuthorizationCheck] = Field(max_length=MAX_AUTHORIZATION_CHECKS)
@@ -0,0 +1,50 @@
+"""Serializadores explicitos de los modelos a dicts con tipos JSON nativos.
+
+Las rutas responden con JSONResponse armado con estas funciones, evitando la validacion de
+response_model y el recorrido generico de jsonable_encoder. Nunca se expone el hash de la
+contraseña.
+"""
+from src.models.user import User
+from src.models.user_status import UserStatus
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+
+
+def user_to_dict(user:User) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "status": UserStatus(user.status).value,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+        "version": user.version,
+    }
+
+def role_to_dict(role:Role) -> dict:
+    return {
+        "id": role.id,
+        "name": role.name,
+        "description": role.description,
+        "created_at": role.created_at.isoformat(),
+        "updated_at": role.updated_at.isoformat(),
+        "version": role.version,
+    }
+
+def permission_to_dict(permission:Permission) -> dict:
+    return {
+        "id": permission.id,
+        "name": permission.name,
+        "description": permission.description,
+        "created_at": permission.created_at.isoformat(),
+        "updated_at": permission.updated_at.isoformat(),
+        "version": permission.version,
+    }
+
+def user_role_to_dict(relation:UserRole) -> dict:
+    return {"user_id": relation.user_id, "role_id": relation.role_id}
+
+def role_permission_to_dict(relation:RolePermission) -> dict:
+    return {"role_id": relation.role_id, "permission_id": relation.permission_id}
@@ -8,6 +8,7 @@ SAME_EMAIL = "El nuevo correo no puede ser igual al actual"
 SAME_USERNAME = "El nuevo username no puede ser igual al actual"
 WRONG_PASSWORD = "Contraseña incorrecta"
 EMAIL_ALREADY_REGISTERED = "El email ya se encuentra registrado"
+INVALID_BULK_ROW = "Fila invalida: se esperaba username, email y password como texto"
 
 # Role Messages
 ROLE_INVALID_NAME = "El nombre del rol no puede estar vacio"
@@ -28,3 +29,10 @@ USER_ROLE_ALREADY_EXISTS = "El usuario ya tiene asignado ese rol"
 USER_ROLE_NOT_FOUND = "El usuario no tiene asignado ese rol"
 ROLE_PERMISSION_ALREADY_EXISTS = "El rol ya tiene asignado ese permiso"
 ROLE_PERMISSION_NOT_FOUND = "El rol no tiene asignado ese permiso"
+
+# Security Messages
+PASSWORD_HASHING_BUSY = "El servicio de contraseñas esta saturado, intente nuevamente"
+
+# Concurrency Messages
+VERSION_CONFLICT = "El registro fue modificado por otra operacion, vuelva a leerlo e intente nuevamente"
+SHARED_MATRIX_WRITER_STALLED = "El escritor de la matriz de permisos compartida no termino su escritura a tiempo"
@@ -0,0 +1,16 @@
+class ConcurrencyError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class VersionConflictError(ConcurrencyError):
+    def __init__(self, message: str, expected_version: int | None = None, current_version: int | None = None):
+        super().__init__(message)
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+class StalledWriterError(ConcurrencyError):
+    def __init__(self, message: str):
+        super().__init__(message)
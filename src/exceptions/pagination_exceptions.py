@@ -0,0 +1,9 @@
+class PaginationError(ValueError):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class InvalidCursorError(PaginationError):
+    def __init__(self, message: str):
+        super().__init__(message)
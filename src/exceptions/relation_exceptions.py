@@ -0,0 +1,24 @@
+class RelationError(ValueError):
+    """Base de los errores de asignaciones usuario-rol y rol-permiso.
+
+    Hereda de ValueError porque las relaciones se validaban con ValueError y los
+    llamadores existentes lo siguen capturando.
+    """
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class RelationValidationError(RelationError):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+def require_ids(**ids: str) -> None:
+    """Lanza RelationValidationError nombrando los ids requeridos si alguno falta"""
+    if all(ids.values()):
+        return
+    *rest, last = ids
+    if not rest:
+        raise RelationValidationError(f"{last} es requerido")
+    raise RelationValidationError(f"{', '.join(rest)} y {last} son requeridos")
@@ -0,0 +1,9 @@
+class SecurityError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class PasswordHashingBusyError(SecurityError):
+    def __init__(self, message: str):
+        super().__init__(message)
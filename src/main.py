@@ -0,0 +1,218 @@
+import base64
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from src.api.container import ServiceContainer
+from src.api.errors import register_exception_handlers
+from src.api.pagination import list_response
+from src.api import schemas
+from src.api.serializers import (user_to_dict, role_to_dict, permission_to_dict, user_role_to_dict,
+                                 role_permission_to_dict)
+from src.models.user_status import UserStatus
+
+
+@asynccontextmanager
+async def lifespan(app:FastAPI):
+    services = ServiceContainer()
+    services.warm()
+    app.state.services = services
+    yield
+    services.close()
+
+
+app = FastAPI(title="User Manager", lifespan=lifespan)
+register_exception_handlers(app)
+
+
+def services(request:Request) -> ServiceContainer:
+    return request.app.state.services
+
+def no_content() -> Response:
+    return Response(status_code=204)
+
+def entity_key(entity) -> str:
+    return entity.id
+
+def user_role_key(relation) -> tuple[str, str]:
+    return (relation.user_id, relation.role_id)
+
+def role_permission_key(relation) -> tuple[str, str]:
+    return (relation.role_id, relation.permission_id)
+
+Cursor = Query(None, description="next_cursor de la pagina anterior")
+Limit = Query(100, ge=1, le=1000)
+
+
+#---------------------USERS---------------------
+
+@app.post("/users", status_code=201)
+async def create_user(request:Request, body:schemas.UserCreate) -> JSONResponse:
+    user = await services(request).users.create_user(body.username, body.email, body.password)
+    return JSONResponse(user_to_dict(user), status_code=201)
+
+@app.get("/users")
+async def list_users(request:Request, cursor:str | None = Cursor, limit:int = Limit) -> Response:
+    return await list_response(request, services(request).users.get_users_page, user_to_dict, entity_key, cursor, limit)
+
+@app.get("/users/{username}")
+async def get_user(request:Request, username:str) -> JSONResponse:
+    return JSONResponse(user_to_dict(await services(request).users.get_user(username)))
+
+@app.put("/users/{username}/username")
+async def update_username(request:Request, username:str, body:schemas.UsernameUpdate) -> JSONResponse:
+    return JSONResponse(user_to_dict(await services(request).users.update_username(username, body.username,
+                                                                                        body.expected_version)))
+
+@app.put("/users/{username}/email")
+async def update_email(request:Request, username:str, body:schemas.EmailUpdate) -> JSONResponse:
+    return JSONResponse(await services(request).users.update_email(username, body.email, body.expected_version))
+
+@app.put("/users/{username}/password")
+async def update_password(request:Request, username:str, body:schemas.PasswordUpdate) -> Response:
+    await services(request).users.update_password(username, body.current_password, body.new_password,
+                                                body.expected_version)
+    return no_content()
+
+@app.put("/users/{username}/status")
+async def update_status(request:Request, username:str, body:schemas.StatusUpdate) -> JSONResponse:
+    users = services(request).users
+    actions = {
+        UserStatus.ACTIVE: users.activate_user,
+        UserStatus.INACTIVE: users.deactivate_user,
+        UserStatus.SUSPENDED: users.suspend_user,
+        UserStatus.BLOCKED: users.block_user,
+    }
+    return JSONResponse(user_to_dict(await actions[body.status](username, body.expected_version)))
+
+@app.post("/users/{username}/verify-password")
+async def verify_password(request:Request, username:str, body:schemas.PasswordCheck) -> JSONResponse:
+    return JSONResponse({"valid": await services(request).users.verify_user_password(username, body.password)})
+
+@app.delete("/users/{username}", status_code=204)
+async def delete_user(request:Request, username:str) -> Response:
+    await services(request).users.delete_user(username)
+    return no_content()
+
+
+#---------------------ROLES---------------------
+
+@app.post("/roles", status_code=201)
+async def create_role(request:Request, body:schemas.NamedCreate) -> JSONResponse:
+    role = await services(request).roles.create_role(body.name, body.description)
+    return JSONResponse(role_to_dict(role), status_code=201)
+
+@app.get("/roles")
+async def list_roles(request:Request, cursor:str | None = Cursor, limit:int = Limit) -> Response:
+    return await list_response(request, services(request).roles.get_roles_page, role_to_dict, entity_key, cursor, limit)
+
+@app.get("/roles/{name}")
+async def get_role(request:Request, name:str) -> JSONResponse:
+    return JSONResponse(role_to_dict(await services(request).roles.get_role(name)))
+
+@app.put("/roles/{name}/description")
+async def update_role_description(request:Request, name:str, body:schemas.DescriptionUpdate) -> JSONResponse:
+    return JSONResponse(role_to_dict(await services(request).roles.update_role_description(name, body.description,
+                                                                                            body.expected_version)))
+
+@app.delete("/roles/{name}", status_code=204)
+async def delete_role(request:Request, name:str) -> Response:
+    await services(request).roles.delete_role(name)
+    return no_content()
+
+
+#---------------------PERMISSIONS---------------------
+
+@app.post("/permissions", status_code=201)
+async def create_permission(request:Request, body:schemas.NamedCreate) -> JSONResponse:
+    permission = await services(request).permissions.create_permission(body.name, body.description)
+    return JSONResponse(permission_to_dict(permission), status_code=201)
+
+@app.get("/permissions")
+async def list_permissions(request:Request, cursor:str | None = Cursor, limit:int = Limit) -> Response:
+    return await list_response(request, services(request).permissions.get_permissions_page, permission_to_dict,
+                               entity_key, cursor, limit)
+
+@app.get("/permissions/{name}")
+async def get_permission(request:Request, name:str) -> JSONResponse:
+    return JSONResponse(permission_to_dict(await services(request).permissions.get_permission(name)))
+
+@app.put("/permissions/{name}/description")
+async def update_permission_description(request:Request, name:str, body:schemas.DescriptionUpdate) -> JSONResponse:
+    permission = await services(request).permissions.update_permission_description(name, body.description,
+                                                                                       body.expected_version)
+    return JSONResponse(permission_to_dict(permission))
+
+@app.delete("/permissions/{name}", status_code=204)
+async def delete_permission(request:Request, name:str) -> Response:
+    await services(request).permissions.delete_permission(name)
+    return no_content()
+
+
+#---------------------ASSIGNMENTS---------------------
+
+@app.get("/user-roles")
+async def list_user_roles(request:Request, cursor:str | None = Cursor, limit:int = Limit) -> Response:
+    return await list_response(request, services(request).user_roles.get_relations_page, user_role_to_dict,
+                               user_role_key, cursor, limit, pair_cursor=True)
+
+@app.get("/role-permissions")
+async def list_role_permissions(request:Request, cursor:str | None = Cursor, limit:int = Limit) -> Response:
+    return await list_response(request, services(request).role_permissions.get_relations_page,
+                               role_permission_to_dict, role_permission_key, cursor, limit, pair_cursor=True)
+
+@app.post("/users/{user_id}/roles", status_code=201)
+async def assign_role(request:Request, user_id:str, body:schemas.RoleAssignment) -> JSONResponse:
+    relation = await services(request).user_roles.assign_role(user_id, body.role_id)
+    return JSONResponse(user_role_to_dict(relation), status_code=201)
+
+@app.get("/users/{user_id}/roles")
+async def get_user_roles(request:Request, user_id:str) -> JSONResponse:
+    relations = await services(request).user_roles.get_user_roles(user_id)
+    return JSONResponse([user_role_to_dict(relation) for relation in relations])
+
+@app.delete("/users/{user_id}/roles/{role_id}", status_code=204)
+async def remove_role(request:Request, user_id:str, role_id:str) -> Response:
+    await services(request).user_roles.remove_role(user_id, role_id)
+    return no_content()
+
+@app.get("/roles/{role_id}/users")
+async def get_users_by_role(request:Request, role_id:str) -> JSONResponse:
+    relations = await services(request).user_roles.get_users_by_role(role_id)
+    return JSONResponse([user_role_to_dict(relation) for relation in relations])
+
+@app.post("/roles/{role_id}/permissions", status_code=201)
+async def grant_permission(request:Request, role_id:str, body:schemas.PermissionGrant) -> JSONResponse:
+    relation = await services(request).role_permissions.add_permission_to_role(role_id, body.permission_id)
+    return JSONResponse(role_permission_to_dict(relation), status_code=201)
+
+@app.get("/roles/{role_id}/permissions")
+async def get_role_permissions(request:Request, role_id:str) -> JSONResponse:
+    relations = await services(request).role_permissions.get_permissions_by_role(role_id)
+    return JSONResponse([role_permission_to_dict(relation) for relation in relations])
+
+@app.delete("/roles/{role_id}/permissions/{permission_id}", status_code=204)
+async def revoke_permission(request:Request, role_id:str, permission_id:str) -> Response:
+    await services(request).role_permissions.remove_permission_from_role(role_id, permission_id)
+    return no_content()
+
+@app.get("/users/{user_id}/permissions")
+async def get_user_permissions(request:Request, user_id:str) -> JSONResponse:
+    return JSONResponse(sorted(services(request).authorization.get_user_permissions(user_id)))
+
+@app.get("/users/{user_id}/permissions/{permission_id}")
+async def check_permission(request:Request, user_id:str, permission_id:str) -> JSONResponse:
+    return JSONResponse({"allowed": services(request).authorization.has_permission(user_id, permission_id)})
+
+@app.post("/authorization/check")
+async def check_permissions(request:Request, body:schemas.AuthorizationBatch,
+                            output_format:str = Query("list", alias="format", pattern="^(list|bitmap)$")) -> JSONResponse:
+    """Evalua un lote de hasta schemas.MAX_AUTHORIZATION_CHECKS pares (user_id, permission_id); con
+    ?format=bitmap responde el bitmap en base64"""
+    checks = [(check.user_id, check.permission_id) for check in body.checks]
+    authorization = services(request).authorization
+    if output_format == "bitmap":
+        bitmap = authorization.check_many_bitmap(checks)
+        return JSONResponse({"count": len(checks), "bitmap": base64.b64encode(bitmap).decode()})
+    return JSONResponse({"allowed": authorization.check_many(checks)})
@@ -0,0 +1,79 @@
+"""Almacenamiento compacto opcional para los atributos id y timestamps de los modelos.
+
+Con la variable de entorno USER_MANAGER_COMPACT_MODELS=1 los ids se guardan como los 16
+bytes del uuid y los timestamps como microsegundos enteros desde epoch. Los modelos siguen
+exponiendo los mismos atributos (id como str, created_at/updated_at como datetime).
+"""
+import os
+from datetime import datetime, timedelta
+from uuid import UUID
+
+COMPACT_STORAGE = os.getenv("USER_MANAGER_COMPACT_MODELS", "0") == "1"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_micros(value: datetime) -> int:
+    """Convierte un datetime en microsegundos enteros desde epoch"""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_micros(value: int) -> datetime:
+    """Convierte microsegundos enteros desde epoch en datetime"""
+    return _EPOCH + value * _MICROSECOND
+
+
+class CompactUuid:
+    """Descriptor que guarda un uuid como 16 bytes y lo expone como str"""
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return str(UUID(bytes=getattr(instance, self.slot)))
+
+    def __set__(self, instance, value) -> None:
+        if isinstance(value, UUID):
+            value = value.bytes
+        elif isinstance(value, str):
+            value = UUID(value).bytes
+        setattr(instance, self.slot, value)
+
+
+class CompactTimestamp:
+    """Descriptor que guarda un datetime como microsegundos enteros desde epoch"""
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return from_epoch_micros(getattr(instance, self.slot))
+
+    def __set__(self, instance, value) -> None:
+        if isinstance(value, datetime):
+            value = to_epoch_micros(value)
+        setattr(instance, self.slot, value)
+
+
+def storage_slots(*names: str) -> tuple[str, ...]:
+    """Nombres de slot para los atributos compactables segun el modo de almacenamiento"""
+    if COMPACT_STORAGE:
+        return tuple(f"_{name}" for name in names)
+    return names
+
+
+def compact_fields(uuid_fields: tuple[str, ...] = (), timestamp_fields: tuple[str, ...] = ()):
+    """Decorador que instala los descriptores compactos cuando el modo compacto esta activo"""
+    def decorator(cls):
+        if COMPACT_STORAGE:
+            for name in uuid_fields:
+                setattr(cls, name, CompactUuid(f"_{name}"))
+            for name in timestamp_fields:
+                setattr(cls, name, CompactTimestamp(f"_{name}"))
+        return cls
+    return decorator
@@ -1,21 +1,48 @@
 from uuid6 import uuid7
 from datetime import datetime
+from src.models.compact import compact_fields, storage_slots
 
 
+@compact_fields(uuid_fields=("id",), timestamp_fields=("created_at", "updated_at"))
 class Permission:
+    __slots__ = ("name", "description", "version") + storage_slots("id", "created_at", "updated_at")
+
     def __init__(self, name:str,description:str = ""):
         self._validate_name(name)
         self.id = str(uuid7())
         self.name = name.strip().lower()
         self.description = description.strip()
+        self.version = 1
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
 
+    @classmethod
+    def restore(cls, id:str, name:str, description:str, created_at:datetime, updated_at:datetime,
+                version:int = 1) -> "Permission":
+        """Reconstruye un permiso ya persistido sin volver a validarlo ni generar id o timestamps"""
+        instance = cls.__new__(cls)
+        instance.id = id
+        instance.name = name
+        instance.description = description
+        instance.version = version
+        instance.created_at = created_at
+        instance.updated_at = updated_at
+        return instance
+
+    def validate(self) -> None:
+        """Aplica a una instancia restaurada las validaciones que restore omite (datos de fuentes externas)"""
+        self._validate_name(self.name)
+
     def _validate_name(self, name:str) -> None:
         if not name or not name.strip():
             #Crear un error personalizado al igual que un mensaje
             raise ValueError("El nombre del rol no puede estar vacio")
         
+    def _refresh_updated_at(self) -> None:
+        """Registra una modificacion: actualiza updated_at e incrementa la version"""
+        self.updated_at = datetime.now()
+        self.version += 1
+
     def update_description(self, new_description:str):
         self.description = new_description.strip()
-        self.updated_at = datetime.now()
\ No newline at end of file
+        self._refresh_updated_at()
\ No newline at end of file
@@ -1,4 +1,6 @@
 class RolePermission:
+    __slots__ = ("role_id", "permission_id")
+
     def __init__(self, role_id:str, permission_id:str):
         self.permission_id = permission_id
         self.role_id = role_id
\ No newline at end of file
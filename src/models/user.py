@@ -4,9 +4,12 @@ from src.exceptions.user_exceptions import UserValidationError
 from uuid6 import uuid7
 from datetime import datetime
 from src.models.user_status import UserStatus
+from src.models.compact import compact_fields, storage_slots
 
 
+@compact_fields(uuid_fields=("id",), timestamp_fields=("created_at", "updated_at"))
 class User:
+    __slots__ = ("username", "email", "password", "status", "roles", "version") + storage_slots("id", "created_at", "updated_at")
 
     EMAIL_PATTERN = r"^[A-Za-z0-9._+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
 
@@ -19,9 +22,32 @@ class User:
         self.password = password
         self.status = status
         self.roles: list[str] = []
+        self.version = 1
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
 
+    @classmethod
+    def restore(cls, id:str, username:str, email:str, password:str, status:UserStatus,
+                created_at:datetime, updated_at:datetime, version:int = 1) -> "User":
+        """Reconstruye un usuario ya persistido sin volver a validarlo ni generar id o timestamps"""
+        user = cls.__new__(cls)
+        user.id = id
+        user.username = username
+        user.email = email
+        user.password = password
+        user.status = status
+        user.roles = []
+        user.version = version
+        user.created_at = created_at
+        user.updated_at = updated_at
+        return user
+
+    def validate(self) -> None:
+        """Aplica a un usuario restaurado las validaciones que restore omite (datos de fuentes externas)"""
+        self._validate_username(self.username)
+        self._validate_email(self.email)
+        UserStatus(self.status)
+
     def _validate_username(self, username:str) -> None:
         if not username or not username.strip():
             raise UserValidationError(messages.USER_INVALID_USERNAME)
@@ -31,7 +57,9 @@ class User:
             raise UserValidationError(messages.USER_INVALID_EMAIL)  
 
     def _refresh_updated_at(self) -> None:
+        """Registra una modificacion: actualiza updated_at e incrementa la version"""
         self.updated_at = datetime.now()
+        self.version += 1
     
     def update_username(self, new_username:str) -> None:
         """Actualiza el nombre del usuario"""
@@ -1,4 +1,6 @@
 class UserRole:
+    __slots__ = ("user_id", "role_id")
+
     def __init__(self, user_id:str, role_id:str):
         self.user_id = user_id
         self.role_id = role_id
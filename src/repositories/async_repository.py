@@ -0,0 +1,118 @@
+"""Interfaz asincronica de los repositorios para usarlos desde handlers de FastAPI.
+
+Los servicios async aceptan tres tipos de repositorio:
+
+- repositorios en memoria (UserRepository, RoleRepository, ...): runs_inline los reconoce y los
+  servicios los usan a traves del servicio sincronico, en el loop y sin await, porque cada
+  operacion es un acceso a dict que no bloquea;
+- repositorios sincronicos con I/O (blocking_io = True, por ejemplo SQLite o journal): se
+  envuelven en ThreadedRepository, que ejecuta cada metodo con asyncio.to_thread;
+- implementaciones nativas async que cumplan los protocolos de este modulo, que se usan tal cual.
+"""
+import asyncio
+from inspect import iscoroutinefunction
+from typing import Protocol, runtime_checkable
+
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+
+
+@runtime_checkable
+class AsyncUserRepository(Protocol):
+    async def add(self, user:User) -> User: ...
+    async def add_many(self, users:list[User]) -> list[User]: ...
+    async def find(self, username:str) -> User | None: ...
+    async def find_by_email(self, email:str) -> User | None: ...
+    async def get(self, username:str) -> User: ...
+    async def get_all(self) -> list[User]: ...
+    async def get_page(self, after:str | None = None, limit:int = 100) -> list[User]: ...
+    async def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User: ...
+    async def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User: ...
+    async def update_password(self, username:str, new_password:str,
+                              expected_version:int | None = None) -> User: ...
+    async def update_status(self, username:str, new_status:UserStatus,
+                            expected_version:int | None = None) -> User: ...
+    async def delete(self, username:str) -> None: ...
+
+
+@runtime_checkable
+class AsyncRoleRepository(Protocol):
+    async def add(self, role:Role) -> Role: ...
+    async def find(self, name:str) -> Role | None: ...
+    async def get(self, name:str) -> Role: ...
+    async def get_all(self) -> list[Role]: ...
+    async def get_page(self, after:str | None = None, limit:int = 100) -> list[Role]: ...
+    async def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Role: ...
+    async def delete(self, name:str) -> None: ...
+
+
+@runtime_checkable
+class AsyncPermissionRepository(Protocol):
+    async def add(self, permission:Permission) -> Permission: ...
+    async def find(self, name:str) -> Permission | None: ...
+    async def get(self, name:str) -> Permission: ...
+    async def get_all(self) -> list[Permission]: ...
+    async def get_page(self, after:str | None = None, limit:int = 100) -> list[Permission]: ...
+    async def update_description(self, name:str, new_description:str,
+                                 expected_version:int | None = None) -> Permission: ...
+    async def delete(self, name:str) -> None: ...
+
+
+@runtime_checkable
+class AsyncUserRoleRepository(Protocol):
+    async def add(self, relation:UserRole) -> None: ...
+    async def find(self, user_id:str, role_id:str) -> UserRole | None: ...
+    async def get_all(self) -> list[UserRole]: ...
+    async def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[UserRole]: ...
+    async def get_roles_by_user(self, user_id:str) -> list[UserRole]: ...
+    async def get_users_by_role(self, role_id:str) -> list[UserRole]: ...
+    async def update_role_relation(self, user_id:str, role_id:str, new_role:str) -> UserRole: ...
+    async def delete(self, user_id:str, role_id:str) -> None: ...
+
+
+@runtime_checkable
+class AsyncRolePermissionRepository(Protocol):
+    async def add(self, relation:RolePermission) -> None: ...
+    async def find(self, role_id:str, permission_id:str) -> RolePermission | None: ...
+    async def get_all(self) -> list[RolePermission]: ...
+    async def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[RolePermission]: ...
+    async def get_permissions_by_role(self, role_id:str) -> list[RolePermission]: ...
+    async def get_roles_by_permission(self, permission_id:str) -> list[RolePermission]: ...
+    async def update_permission_relation(self, role_id:str, permission_id:str, new_permission:str) -> RolePermission: ...
+    async def delete(self, role_id:str, permission_id:str) -> None: ...
+
+
+class ThreadedRepository:
+    """Expone un repositorio sincronico con I/O como async, ejecutando cada metodo en un hilo"""
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def __getattr__(self, name:str):
+        attribute = getattr(self.repository, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(attribute, *args, **kwargs)
+        call.__name__ = name
+        # Se guarda en la instancia para no volver a pasar por __getattr__
+        setattr(self, name, call)
+        return call
+
+
+def runs_inline(repository) -> bool:
+    """Indica si el repositorio es sincronico en memoria y sus metodos se pueden llamar en el loop"""
+    return not (isinstance(repository, ThreadedRepository) or getattr(repository, "blocking_io", False)
+                or iscoroutinefunction(getattr(repository, "add", None)))
+
+
+def as_async_repository(repository):
+    """Envuelve en ThreadedRepository los repositorios marcados con blocking_io; el resto se usa tal cual"""
+    if getattr(repository, "blocking_io", False) and not isinstance(repository, ThreadedRepository):
+        return ThreadedRepository(repository)
+    return repository
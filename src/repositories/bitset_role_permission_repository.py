@@ -0,0 +1,134 @@
+from collections.abc import Iterable
+from src.models.role_permission import RolePermission
+from src.exceptions.relation_exceptions import RelationValidationError
+
+
+class BitsetRolePermissionRepository:
+    """Backend alternativo de RolePermissionRepository basado en mascaras de bits.
+
+    Cada permiso recibe un slot entero denso y los permisos de cada rol se guardan como un
+    int de Python con un bit encendido por permiso otorgado. Los objetos RolePermission se
+    construyen solo cuando se consultan, y la union entre roles es un unico OR.
+    """
+
+    def __init__(self):
+        self._slots: dict[str, int] = {}
+        self._permission_ids: list[str] = []
+        self._grants: dict[str, int] = {}
+
+    def add(self, relation: RolePermission):
+        bit = 1 << self._slot_for(relation.permission_id)
+        mask = self._grants.get(relation.role_id, 0)
+        if mask & bit:
+            raise RelationValidationError("La relación ya existe")
+        self._grants[relation.role_id] = mask | bit
+
+    def find(self, role_id: str, permission_id: str) -> RolePermission | None:
+        if self.role_has_permission(role_id, permission_id):
+            return RolePermission(role_id, permission_id)
+        return None
+
+    def role_has_permission(self, role_id: str, permission_id: str) -> bool:
+        slot = self._slots.get(permission_id)
+        if slot is None:
+            return False
+        return (self._grants.get(role_id, 0) >> slot) & 1 == 1
+
+    def get_all(self) -> list[RolePermission]:
+        return [RolePermission(role_id, permission_id)
+                for role_id, mask in self._grants.items()
+                for permission_id in self._iter_permissions(mask)]
+
+    def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
+        return [RolePermission(role_id, permission_id)
+                for permission_id in self._iter_permissions(self._grants.get(role_id, 0))]
+
+    def get_roles_by_permission(self, permission_id: str) -> list[RolePermission]:
+        slot = self._slots.get(permission_id)
+        if slot is None:
+            return []
+        bit = 1 << slot
+        return [RolePermission(role_id, permission_id) for role_id, mask in self._grants.items() if mask & bit]
+
+    def update_permission_relation(self, role_id: str, permission_id: str, new_permission: str) -> RolePermission:
+        if not self.role_has_permission(role_id, permission_id):
+            raise RelationValidationError("El rol no cuenta con ese permiso")
+        if permission_id == new_permission:
+            raise RelationValidationError("El rol ya cuenta con ese permiso")
+        if self.role_has_permission(role_id, new_permission):
+            raise RelationValidationError("La relación ya existe")
+        mask = self._grants[role_id] & ~(1 << self._slots[permission_id])
+        self._grants[role_id] = mask | (1 << self._slot_for(new_permission))
+        return RolePermission(role_id, new_permission)
+
+    def delete(self, role_id: str, permission_id: str) -> None:
+        if not self.role_has_permission(role_id, permission_id):
+            raise RelationValidationError("El rol no cuenta con ese permiso")
+        mask = self._grants[role_id] & ~(1 << self._slots[permission_id])
+        if mask:
+            self._grants[role_id] = mask
+        else:
+            del self._grants[role_id]
+
+    # -------------------- API por lotes --------------------
+
+    def get_role_mask(self, role_id: str) -> int:
+        """Obtiene la mascara de permisos otorgados a un rol"""
+        return self._grants.get(role_id, 0)
+
+    def get_roles_mask(self, role_ids: Iterable[str]) -> int:
+        """Obtiene la union de las mascaras de varios roles"""
+        mask = 0
+        grants = self._grants
+        for role_id in role_ids:
+            mask |= grants.get(role_id, 0)
+        return mask
+
+    def get_permissions_mask(self, permission_ids: Iterable[str]) -> int:
+        """Construye la mascara de un conjunto de permisos, ignorando los que no estan registrados"""
+        mask = 0
+        slots = self._slots
+        for permission_id in permission_ids:
+            slot = slots.get(permission_id)
+            if slot is not None:
+                mask |= 1 << slot
+        return mask
+
+    def get_granted_permissions(self, role_ids: Iterable[str]) -> set[str]:
+        """Obtiene los ids de permisos que otorga cualquiera de los roles"""
+        return set(self._iter_permissions(self.get_roles_mask(role_ids)))
+
+    def check_permissions(self, role_ids: Iterable[str], permission_ids: list[str]) -> list[bool]:
+        """Indica, para cada permiso consultado, si alguno de los roles lo otorga"""
+        mask = self.get_roles_mask(role_ids)
+        slots = self._slots
+        result = []
+        for permission_id in permission_ids:
+            slot = slots.get(permission_id)
+            result.append(slot is not None and (mask >> slot) & 1 == 1)
+        return result
+
+    def roles_grant_all(self, role_ids: Iterable[str], permission_ids: Iterable[str]) -> bool:
+        """Verifica si la union de los roles otorga todos los permisos consultados"""
+        permission_ids = list(permission_ids)
+        required = self.get_permissions_mask(permission_ids)
+        if required.bit_count() != len(set(permission_ids)):
+            return False
+        return self.get_roles_mask(role_ids) & required == required
+
+    # -------------------- Internos --------------------
+
+    def _slot_for(self, permission_id: str) -> int:
+        slot = self._slots.get(permission_id)
+        if slot is None:
+            slot = len(self._permission_ids)
+            self._slots[permission_id] = slot
+            self._permission_ids.append(permission_id)
+        return slot
+
+    def _iter_permissions(self, mask: int):
+        permission_ids = self._permission_ids
+        while mask:
+            lowest = mask & -mask
+            yield permission_ids[lowest.bit_length() - 1]
+            mask ^= lowest
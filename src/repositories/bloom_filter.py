@@ -0,0 +1,220 @@
+"""Filtro de Bloom y repositorio de usuarios que lo usa para responder rapido las busquedas fallidas.
+
+Un filtro de Bloom nunca da falsos negativos: si dice que una clave no esta, no esta. Por
+eso find y find_by_email pueden responder None sin tocar el almacenamiento en la mayoria
+de las consultas por nombres o emails libres (formularios de registro). Los falsos
+positivos solo cuestan la consulta que se hubiera hecho igual.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from src.models.user import User
+from src.models.user_status import UserStatus
+
+
+class BloomFilter:
+    """Filtro de Bloom dimensionado para capacity claves con una tasa de falsos positivos error_rate"""
+
+    def __init__(self, capacity:int, error_rate:float = 0.01):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity debe ser mayor a 0 y error_rate estar entre 0 y 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key:str) -> Iterable[int]:
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de dos hashes de 64 bits
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key:str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key:str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def false_positive_rate(self) -> float:
+        """Tasa de falsos positivos esperada con las claves agregadas hasta ahora"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class BloomFilteredUserRepository():
+    """Decora un repositorio de usuarios con un filtro de Bloom de usernames y emails.
+
+    add, add_many, update_username y update_email agregan las claves nuevas al filtro. Las
+    claves borradas o reemplazadas no se pueden quitar de un filtro de Bloom y solo suben la
+    tasa de falsos positivos, por eso se cuentan y al superar rebuild_after_changes el filtro
+    se reconstruye desde iter_all. rebuild tambien puede invocarse periodicamente.
+
+    El filtro solo ve las escrituras hechas a traves de este decorador: con varios procesos
+    escribiendo sobre la misma base, un alta de otro proceso queda invisible (find responde
+    None) hasta la siguiente reconstruccion. En ese caso rebuild_interval fija cada cuantos
+    segundos se reconstruye como maximo el filtro, acotando ese retraso como el TTL de
+    CachedUserRepository; sin rebuild_interval el decorador asume un unico escritor.
+    """
+
+    def __init__(self, repository, capacity:int = 1_000_000, error_rate:float = 0.01,
+                 rebuild_after_changes:int | None = None, rebuild_interval:float | None = None,
+                 clock:Callable[[], float] = time.monotonic):
+        self.repository = repository
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_after_changes = rebuild_after_changes
+        self.rebuild_interval = rebuild_interval
+        self._clock = clock
+        self._built_at = clock()
+        self._lock = threading.Lock()
+        self.negatives = 0
+        self.false_positives = 0
+        self.true_positives = 0
+        self.stale_keys = 0
+        # Claves agregadas mientras se reconstruye; se vuelcan al filtro nuevo antes de publicarlo
+        self._pending: list[str] | None = None
+        self._bloom = BloomFilter(capacity, error_rate)
+        self.rebuild()
+
+    def __getattr__(self, name:str):
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    @staticmethod
+    def _normalize_email(email:str) -> str:
+        return email.strip().lower()
+
+    @staticmethod
+    def _username_key(username:str) -> str:
+        return "u:" + username
+
+    def _email_key(self, email:str) -> str:
+        return "e:" + self._normalize_email(email)
+
+    def rebuild(self) -> int:
+        """Reconstruye el filtro con los usuarios actuales, retorna cuantos se cargaron"""
+        with self._lock:
+            if self._pending is not None:
+                return 0
+            self._pending = []
+        try:
+            started_at = self._clock()
+            users = list(self.repository.iter_all())
+            # Dos claves por usuario y el doble de margen: si el filtro naciera lleno, la siguiente
+            # alta volveria a disparar una reconstruccion completa
+            bloom = BloomFilter(max(self.capacity, 4 * len(users)), self.error_rate)
+            for user in users:
+                bloom.add(self._username_key(user.username))
+                bloom.add(self._email_key(user.email))
+            with self._lock:
+                for key in self._pending:
+                    bloom.add(key)
+                self._bloom = bloom
+                self.stale_keys = 0
+                self._built_at = started_at
+        finally:
+            with self._lock:
+                self._pending = None
+        return len(users)
+
+    def stats(self) -> dict:
+        """Contadores de consultas y tasas de falsos positivos esperada y observada"""
+        with self._lock:
+            # Entre las claves que no existen, la fraccion que el filtro no pudo descartar
+            absent = self.false_positives + self.negatives
+            return {"keys": self._bloom.count, "stale_keys": self.stale_keys, "negatives": self.negatives,
+                    "false_positives": self.false_positives, "true_positives": self.true_positives,
+                    "expected_false_positive_rate": self._bloom.false_positive_rate(),
+                    "observed_false_positive_rate": self.false_positives / absent if absent else 0.0}
+
+    # -------------------- Lecturas --------------------
+
+    def find(self, username:str) -> User | None:
+        return self._filtered(self._username_key(username), "find", username)
+
+    def find_by_email(self, email:str) -> User | None:
+        return self._filtered(self._email_key(email), "find_by_email", email)
+
+    def might_exist(self, username:str | None = None, email:str | None = None) -> bool:
+        """False si con seguridad no existe un usuario con ese username o email, sin consultar el repositorio"""
+        keys = ([self._username_key(username)] if username else []) + ([self._email_key(email)] if email else [])
+        return any(key in self._bloom for key in keys)
+
+    # -------------------- Escrituras --------------------
+
+    def add(self, user:User) -> User:
+        user = self.repository.add(user)
+        self._add_keys(self._username_key(user.username), self._email_key(user.email))
+        return user
+
+    def add_many(self, users:list[User]) -> list[User]:
+        users = self.repository.add_many(users)
+        self._add_keys(*[key for user in users
+                         for key in (self._username_key(user.username), self._email_key(user.email))])
+        return users
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        user = self.repository.update_username(username, new_username, expected_version)
+        self._add_keys(self._username_key(new_username))
+        self._stale(1)
+        return user
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        user = self.repository.update_email(username, new_email, expected_version)
+        self._add_keys(self._email_key(new_email))
+        self._stale(1)
+        return user
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        return self.repository.update_password(username, new_password, expected_version)
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        return self.repository.update_status(username, new_status, expected_version)
+
+    def delete(self, username:str) -> None:
+        self.repository.delete(username)
+        self._stale(2)
+
+    # -------------------- Internos --------------------
+
+    def _filtered(self, key:str, method:str, value:str) -> User | None:
+        if self.rebuild_interval is not None and self._clock() - self._built_at >= self.rebuild_interval:
+            self.rebuild()
+        if key not in self._bloom:
+            with self._lock:
+                self.negatives += 1
+            return None
+        user = getattr(self.repository, method)(value)
+        with self._lock:
+            if user is None:
+                self.false_positives += 1
+            else:
+                self.true_positives += 1
+        return user
+
+    def _add_keys(self, *keys:str) -> None:
+        with self._lock:
+            bloom = self._bloom
+            for key in keys:
+                bloom.add(key)
+            if self._pending is not None:
+                self._pending.extend(keys)
+            grown = bloom.count > bloom.capacity
+        if grown:
+            self.rebuild()
+
+    def _stale(self, keys:int) -> None:
+        with self._lock:
+            self.stale_keys += keys
+            due = self.rebuild_after_changes is not None and self.stale_keys >= self.rebuild_after_changes
+        if due:
+            self.rebuild()
@@ -0,0 +1,183 @@
+"""Cache de lectura (read-through) con LRU y TTL delante de un repositorio de usuarios.
+
+Pensado para backends persistentes (SQLite): find, get y find_by_email consultan primero
+la cache y solo ante un fallo van al repositorio. Las escrituras pasan por este decorador
+e invalidan la entrada afectada, por lo que dentro del proceso las lecturas nunca quedan
+desactualizadas. Escrituras hechas por otro proceso sobre la misma base solo se ven al
+vencer el TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from src.models.user import User
+from src.models.user_status import UserStatus
+
+
+class CachedUserRepository():
+    """Decora un repositorio de usuarios con una cache LRU acotada a max_size entradas con TTL en segundos.
+
+    Los metodos que no se cachean (get_all, get_page, iter_all, ...) y atributos como
+    blocking_io se delegan al repositorio original.
+    """
+
+    def __init__(self, repository, max_size:int = 10_000, ttl:float = 60.0,
+                 clock:Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size debe ser mayor a 0")
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        # username -> (usuario, email normalizado al cachear, vencimiento)
+        self._entries: OrderedDict[str, tuple[User, str, float]] = OrderedDict()
+        self._emails: dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Cambia con cada invalidacion: una lectura que consulto el repositorio antes de una
+        # escritura concurrente no guarda su resultado, que podria estar desactualizado
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getattr__(self, name:str):
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    @staticmethod
+    def _normalize_email(email:str) -> str:
+        return email.strip().lower()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "expirations": self.expirations}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._emails.clear()
+
+    # -------------------- Lecturas --------------------
+
+    def find(self, username:str) -> User | None:
+        user = self._lookup(username)
+        if user is None:
+            generation = self._generation
+            user = self.repository.find(username)
+            if user is not None:
+                self._store(user, generation)
+        return user
+
+    def get(self, username:str) -> User:
+        user = self._lookup(username)
+        if user is None:
+            generation = self._generation
+            user = self.repository.get(username)
+            self._store(user, generation)
+        return user
+
+    def find_by_email(self, email:str) -> User | None:
+        key = self._normalize_email(email)
+        with self._lock:
+            username = self._emails.get(key)
+        user = self._lookup(username, key) if username is not None else None
+        if user is None:
+            if username is None:
+                with self._lock:
+                    self.misses += 1
+            generation = self._generation
+            user = self.repository.find_by_email(email)
+            if user is not None:
+                self._store(user, generation)
+        return user
+
+    # -------------------- Escrituras --------------------
+
+    def add(self, user:User) -> User:
+        return self.repository.add(user)
+
+    def add_many(self, users:list[User]) -> list[User]:
+        return self.repository.add_many(users)
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        try:
+            return self.repository.update_username(username, new_username, expected_version)
+        finally:
+            self.invalidate(username)
+            self.invalidate(new_username)
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        try:
+            return self.repository.update_email(username, new_email, expected_version)
+        finally:
+            self.invalidate(username)
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        try:
+            return self.repository.update_password(username, new_password, expected_version)
+        finally:
+            self.invalidate(username)
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        try:
+            return self.repository.update_status(username, new_status, expected_version)
+        finally:
+            self.invalidate(username)
+
+    def delete(self, username:str) -> None:
+        try:
+            self.repository.delete(username)
+        finally:
+            self.invalidate(username)
+
+    def invalidate(self, username:str) -> None:
+        """Descarta la entrada de un usuario y la de su email"""
+        with self._lock:
+            self._generation += 1
+            self._discard(username)
+
+    # -------------------- Internos --------------------
+
+    def _lookup(self, username:str, email_key:str | None = None) -> User | None:
+        """Retorna el usuario cacheado o None; email_key exige que la entrada corresponda a ese email"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or (email_key is not None and entry[1] != email_key):
+                self.misses += 1
+                return None
+            user, _, expires_at = entry
+            if expires_at <= self._clock():
+                self._discard(username)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return user
+
+    def _store(self, user:User, generation:int) -> None:
+        key = self._normalize_email(user.email)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._discard(user.username)
+            self._entries[user.username] = (user, key, self._clock() + self.ttl)
+            self._emails[key] = user.username
+            while len(self._entries) > self.max_size:
+                username, (_, email_key, _) = self._entries.popitem(last=False)
+                self._drop_email(username, email_key)
+                self.evictions += 1
+
+    def _discard(self, username:str) -> None:
+        entry = self._entries.pop(username, None)
+        if entry is not None:
+            self._drop_email(username, entry[1])
+
+    def _drop_email(self, username:str, email_key:str) -> None:
+        if self._emails.get(email_key) == username:
+            del self._emails[email_key]
@@ -0,0 +1,230 @@
+import re
+from array import array
+from collections.abc import Iterator
+from datetime import datetime
+from uuid import UUID
+
+from src.models.user import User
+from src.models.user_status import UserStatus
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
+from src.exceptions.concurrency_exceptions import VersionConflictError
+
+STATUS_CODES: dict[UserStatus, int] = {status: code for code, status in enumerate(UserStatus)}
+STATUS_BY_CODE: list[UserStatus] = list(UserStatus)
+COLUMNS = ("id", "username", "email", "password", "status", "created_at", "updated_at", "version")
+
+
+class ColumnarUserRepository():
+    """Repositorio de usuarios en formato columnar (struct of arrays).
+
+    Cada atributo vive en su propia columna: ids como bloques de 16 bytes, estados como
+    codigos de un byte y timestamps como microsegundos en arrays de int64. Un indice
+    username -> fila resuelve las busquedas puntuales y los filtros recorren solo las
+    columnas involucradas. Los objetos User se construyen bajo demanda y son copias:
+    las modificaciones deben hacerse a traves de los metodos update_* del repositorio.
+    """
+
+    def __init__(self):
+        self._ids = bytearray()
+        self._usernames: list[str] = []
+        self._emails: list[str] = []
+        self._passwords: list[str] = []
+        self._statuses = array("b")
+        self._created_at = array("q")
+        self._updated_at = array("q")
+        self._versions = array("q")
+        self._rows: dict[str, int] = {}
+        self._email_rows: dict[str, int] = {}
+
+    @staticmethod
+    def _normalize_email(email:str) -> str:
+        return email.strip().lower()
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    def add(self, user:User) -> User:
+        """Agrega un nuevo usuario al repositorio, retorna el usuario agregado"""
+        if user.username in self._rows:
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
+        email_key = self._normalize_email(user.email)
+        if email_key in self._email_rows:
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        row = len(self._usernames)
+        self._ids += UUID(user.id).bytes
+        self._usernames.append(user.username)
+        self._emails.append(user.email)
+        self._passwords.append(user.password)
+        self._statuses.append(STATUS_CODES[UserStatus(user.status)])
+        self._created_at.append(to_epoch_micros(user.created_at))
+        self._updated_at.append(to_epoch_micros(user.updated_at))
+        self._versions.append(user.version)
+        self._rows[user.username] = row
+        self._email_rows[email_key] = row
+        return user
+
+    def find(self, username:str) -> User | None:
+        """Busca un usuario por username, retorna el usuario o None si no existe"""
+        row = self._rows.get(username.strip())
+        return None if row is None else self._build(row)
+
+    def find_by_email(self, email:str) -> User | None:
+        """Busca un usuario por email, retorna el usuario o None si no existe"""
+        if not email:
+            return None
+        row = self._email_rows.get(self._normalize_email(email))
+        return None if row is None else self._build(row)
+
+    def get(self, username:str) -> User:
+        """Obtiene un usuario por username, lanza una excepcion si no existe"""
+        return self._build(self._row(username))
+
+    def get_all(self) -> list[User]:
+        """Obtiene todos los usuarios"""
+        return [self._build(row) for row in range(len(self._usernames))]
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        """Actualiza el username de un usuario, retorna el usuario actualizado"""
+        row = self._row(username, expected_version)
+        if not new_username or not new_username.strip():
+            raise UserValidationError(messages.USER_INVALID_USERNAME)
+        if new_username in self._rows:
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
+        del self._rows[self._usernames[row]]
+        self._usernames[row] = new_username
+        self._rows[new_username] = row
+        self._touch(row)
+        return self._build(row)
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        """Actualiza el email de un usuario, retorna el usuario actualizado"""
+        row = self._row(username, expected_version)
+        if not new_email or not re.match(User.EMAIL_PATTERN, new_email):
+            raise UserValidationError(messages.USER_INVALID_EMAIL)
+        new_key = self._normalize_email(new_email)
+        owner = self._email_rows.get(new_key)
+        if owner is not None and owner != row:
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        del self._email_rows[self._normalize_email(self._emails[row])]
+        self._emails[row] = new_email
+        self._email_rows[new_key] = row
+        self._touch(row)
+        return self._build(row)
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        """Actualiza la contraseña del usuario"""
+        row = self._row(username, expected_version)
+        if not new_password:
+            raise UserValidationError(messages.USER_INVALID_PASSWORD)
+        self._passwords[row] = new_password
+        self._touch(row)
+        return self._build(row)
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        """Actualiza el estado de un usuario, retorna el usuario actualizado"""
+        row = self._row(username, expected_version)
+        if new_status not in UserStatus.list():
+            raise ValueError("Estado invalido")
+        self._statuses[row] = STATUS_CODES[UserStatus(new_status)]
+        self._touch(row)
+        return self._build(row)
+
+    def delete(self, username:str) -> None:
+        """Elimina un usuario moviendo la ultima fila al hueco para mantener las columnas densas"""
+        row = self._row(username)
+        del self._rows[self._usernames[row]]
+        del self._email_rows[self._normalize_email(self._emails[row])]
+        last = len(self._usernames) - 1
+        if row != last:
+            self._ids[row * 16:(row + 1) * 16] = self._ids[last * 16:(last + 1) * 16]
+            for column in (self._usernames, self._emails, self._passwords,
+                           self._statuses, self._created_at, self._updated_at, self._versions):
+                column[row] = column[last]
+            self._rows[self._usernames[row]] = row
+            self._email_rows[self._normalize_email(self._emails[row])] = row
+        del self._ids[last * 16:]
+        for column in (self._usernames, self._emails, self._passwords,
+                       self._statuses, self._created_at, self._updated_at, self._versions):
+            column.pop()
+
+    # -------------------- Operaciones por columnas --------------------
+
+    def select_rows(self, status:UserStatus | None = None,
+                    created_from:datetime | None = None, created_to:datetime | None = None) -> list[int]:
+        """Obtiene las filas que cumplen los filtros (created_from inclusivo, created_to exclusivo)"""
+        rows: range | list[int] = range(len(self._usernames))
+        if status is not None:
+            code = STATUS_CODES[UserStatus(status)]
+            statuses = self._statuses
+            rows = [row for row in rows if statuses[row] == code]
+        if created_from is not None or created_to is not None:
+            created = self._created_at
+            low = to_epoch_micros(created_from) if created_from is not None else -(1 << 63)
+            high = to_epoch_micros(created_to) if created_to is not None else (1 << 63) - 1
+            rows = [row for row in rows if low <= created[row] < high]
+        return list(rows)
+
+    def count(self, status:UserStatus | None = None,
+              created_from:datetime | None = None, created_to:datetime | None = None) -> int:
+        """Cuenta los usuarios que cumplen los filtros"""
+        if status is not None and created_from is None and created_to is None:
+            return self._statuses.count(STATUS_CODES[UserStatus(status)])
+        return len(self.select_rows(status, created_from, created_to))
+
+    def filter(self, status:UserStatus | None = None,
+               created_from:datetime | None = None, created_to:datetime | None = None) -> Iterator[User]:
+        """Itera los usuarios que cumplen los filtros, construyendo cada User al consumirlo"""
+        for row in self.select_rows(status, created_from, created_to):
+            yield self._build(row)
+
+    def export(self, fields:tuple[str, ...] = ("id", "username", "email", "status", "created_at", "updated_at"),
+               status:UserStatus | None = None,
+               created_from:datetime | None = None, created_to:datetime | None = None) -> Iterator[tuple]:
+        """Itera tuplas con los campos pedidos de las filas filtradas sin construir objetos User"""
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+        readers = [self._column_reader(field) for field in fields]
+        for row in self.select_rows(status, created_from, created_to):
+            yield tuple(reader(row) for reader in readers)
+
+    # -------------------- Internos --------------------
+
+    def _row(self, username:str, expected_version:int | None = None) -> int:
+        row = self._rows.get(username.strip())
+        if row is None:
+            raise UserNotFoundError(messages.USER_NOT_FOUND)
+        # Se compara la columna directamente, sin reconstruir el User
+        if expected_version is not None and self._versions[row] != expected_version:
+            raise VersionConflictError(messages.VERSION_CONFLICT, expected_version, self._versions[row])
+        return row
+
+    def _touch(self, row:int) -> None:
+        self._updated_at[row] = to_epoch_micros(datetime.now())
+        self._versions[row] += 1
+
+    def _column_reader(self, field:str):
+        if field == "id":
+            return lambda row: str(UUID(bytes=bytes(self._ids[row * 16:(row + 1) * 16])))
+        if field == "status":
+            return lambda row: STATUS_BY_CODE[self._statuses[row]]
+        if field in ("created_at", "updated_at"):
+            column = self._created_at if field == "created_at" else self._updated_at
+            return lambda row: from_epoch_micros(column[row])
+        column = {"username": self._usernames, "email": self._emails, "password": self._passwords,
+                  "version": self._versions}[field]
+        return column.__getitem__
+
+    def _build(self, row:int) -> User:
+        return User.restore(
+            id=str(UUID(bytes=bytes(self._ids[row * 16:(row + 1) * 16]))),
+            username=self._usernames[row],
+            email=self._emails[row],
+            password=self._passwords[row],
+            status=STATUS_BY_CODE[self._statuses[row]],
+            created_at=from_epoch_micros(self._created_at[row]),
+            updated_at=from_epoch_micros(self._updated_at[row]),
+            version=self._versions[row],
+        )
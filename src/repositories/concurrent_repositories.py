@@ -0,0 +1,265 @@
+"""Repositorios en memoria seguros para servidores con varios hilos, con bloqueo por franjas (lock striping).
+
+En lugar de un lock global, cada escritura toma solo los locks de las franjas de sus claves
+(username y email, nombre de rol o permiso, extremos de una relacion), asi que escrituras
+sobre claves distintas avanzan en paralelo en CPython sin GIL y no se serializan tras un
+unico lock en CPython con GIL. Las franjas se toman siempre en orden creciente para evitar
+deadlocks entre escrituras que tocan varias claves.
+
+Las lecturas no toman locks: cada una es un unico acceso a dict, atomico tanto con GIL como
+en la build free-threaded. Las comprobaciones de unicidad (check-then-act) de add y de los
+update quedan dentro del lock, por lo que dos altas simultaneas del mismo username o email
+terminan con una sola insercion y una excepcion para la otra; lo mismo vale para la
+comparacion de expected_version en los update. El indice ordenado usado para
+paginar es la unica estructura compartida y tiene su propio lock, tomado solo para la
+operacion sobre el indice.
+"""
+import threading
+from collections.abc import Hashable, Iterator
+
+from src.models.user import User
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError
+from src.repositories.versioning import check_version
+from src.repositories.sorted_index import SortedKeyIndex
+from src.repositories.user_repository import UserRepository
+from src.repositories.role_repository import RoleRepository
+from src.repositories.permission_repository import PermissionRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+
+
+class StripedLock:
+    """Conjunto fijo de locks; cada clave usa el lock de la franja hash(clave) % stripes"""
+
+    def __init__(self, stripes:int = 64):
+        if stripes <= 0:
+            raise ValueError("stripes debe ser mayor a 0")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock(self, key:Hashable) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def locks(self, *keys:Hashable) -> "_HeldStripes":
+        """Context manager que toma las franjas de todas las claves, sin repetir y en orden"""
+        count = len(self._locks)
+        return _HeldStripes([self._locks[index] for index in sorted({hash(key) % count for key in keys})])
+
+
+class _HeldStripes:
+    __slots__ = ("_locks",)
+
+    def __init__(self, locks:list[threading.Lock]):
+        self._locks = locks
+
+    def __enter__(self) -> None:
+        for lock in self._locks:
+            lock.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        for lock in reversed(self._locks):
+            lock.release()
+
+
+class LockedSortedKeyIndex(SortedKeyIndex):
+    """SortedKeyIndex con un lock propio: sus bloques se modifican en varios pasos"""
+
+    def __init__(self, keys=(), load:int = 1000):
+        super().__init__(keys, load)
+        self._lock = threading.Lock()
+
+    def add(self, key) -> None:
+        with self._lock:
+            super().add(key)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            super().discard(key)
+
+    def after(self, key=None, limit:int = 100) -> list:
+        with self._lock:
+            return super().after(key, limit)
+
+
+def _page(by_id:dict, ids:list) -> list:
+    # Un id puede borrarse entre la lectura del indice y la del dict
+    return [entity for entity in map(by_id.get, ids) if entity is not None]
+
+
+class ConcurrentUserRepository(UserRepository):
+    """UserRepository con franjas por username y por email normalizado"""
+
+    def __init__(self, stripes:int = 64):
+        super().__init__()
+        self._ids = LockedSortedKeyIndex()
+        self._stripes = StripedLock(stripes)
+
+    def _user_keys(self, user:User) -> tuple[tuple[str, str], tuple[str, str]]:
+        return ("u", user.username), ("e", self._normalize_email(user.email))
+
+    def add(self, user:User) -> User:
+        with self._stripes.locks(*self._user_keys(user)):
+            return super().add(user)
+
+    def add_many(self, users:list[User]) -> list[User]:
+        with self._stripes.locks(*[key for user in users for key in self._user_keys(user)]):
+            return super().add_many(users)
+
+    def iter_all(self) -> Iterator[User]:
+        """Itera por paginas del indice de ids, sin fallar si el repositorio cambia mientras tanto"""
+        after = None
+        while page := self.get_page(after, 1000):
+            yield from page
+            after = page[-1].id
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[User]:
+        return _page(self._by_id, self._ids.after(after, limit))
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        """Publica el username nuevo antes de quitar el anterior: una lectura sin lock durante el
+        renombre encuentra al usuario por alguno de los dos nombres, nunca por ninguno"""
+        with self._stripes.locks(("u", username), ("u", new_username)):
+            user = self.get(username)
+            check_version(user, expected_version)
+            if new_username in self._data:
+                raise UserValidationError(messages.USER_ALREADY_EXISTS)
+            old_username = user.username
+            user.update_username(new_username)
+            self._data[user.username] = user
+            if user.username != old_username:
+                del self._data[old_username]
+            return user
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        while True:
+            # El email actual se lee sin lock y se confirma ya tomadas las franjas
+            user = self.get(username)
+            email_key = self._normalize_email(user.email)
+            with self._stripes.locks(("u", username), ("e", email_key), ("e", self._normalize_email(new_email))):
+                if self._data.get(username) is user and self._normalize_email(user.email) == email_key:
+                    return super().update_email(username, new_email, expected_version)
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        with self._stripes.lock(("u", username)):
+            return super().update_password(username, new_password, expected_version)
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        with self._stripes.lock(("u", username)):
+            return super().update_status(username, new_status, expected_version)
+
+    def delete(self, username:str) -> None:
+        while True:
+            user = self.get(username)
+            with self._stripes.locks(*self._user_keys(user)):
+                if self._data.get(username) is user and user.username == username:
+                    return super().delete(username)
+
+
+class _ConcurrentNamedMixin:
+    """Franjas por nombre normalizado para roles y permisos"""
+
+    def _init_stripes(self, stripes:int) -> None:
+        self._ids = LockedSortedKeyIndex()
+        self._stripes = StripedLock(stripes)
+
+    def _lock_name(self, name:str) -> threading.Lock:
+        return self._stripes.lock(name.strip().lower())
+
+    def iter_all(self):
+        after = None
+        while page := self.get_page(after, 1000):
+            yield from page
+            after = page[-1].id
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list:
+        return _page(self._by_id, self._ids.after(after, limit))
+
+    def add(self, entity):
+        with self._lock_name(entity.name):
+            return super().add(entity)
+
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None):
+        with self._lock_name(name):
+            return super().update_description(name, new_description, expected_version)
+
+    def delete(self, name:str) -> None:
+        with self._lock_name(name):
+            super().delete(name)
+
+
+class ConcurrentRoleRepository(_ConcurrentNamedMixin, RoleRepository):
+    def __init__(self, stripes:int = 64):
+        super().__init__()
+        self._init_stripes(stripes)
+
+
+class ConcurrentPermissionRepository(_ConcurrentNamedMixin, PermissionRepository):
+    def __init__(self, stripes:int = 64):
+        super().__init__()
+        self._init_stripes(stripes)
+
+
+class ConcurrentUserRoleRepository(UserRoleRepository):
+    """UserRoleRepository con franjas por usuario y por rol: los indices agrupan por ambos extremos"""
+
+    def __init__(self, stripes:int = 64):
+        super().__init__()
+        self._keys = LockedSortedKeyIndex()
+        self._stripes = StripedLock(stripes)
+
+    def add(self, relation:UserRole):
+        with self._stripes.locks(("u", relation.user_id), ("r", relation.role_id)):
+            super().add(relation)
+
+    def iter_all(self) -> Iterator[UserRole]:
+        after = None
+        while page := self.get_page(after, 1000):
+            yield from page
+            after = (page[-1].user_id, page[-1].role_id)
+
+    def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[UserRole]:
+        return _page(self._relations, self._keys.after(after, limit))
+
+    def update_role_relation(self, user_id:str, role_id:str, new_role:str) -> UserRole:
+        with self._stripes.locks(("u", user_id), ("r", role_id), ("r", new_role)):
+            return super().update_role_relation(user_id, role_id, new_role)
+
+    def delete(self, user_id:str, role_id:str) -> None:
+        with self._stripes.locks(("u", user_id), ("r", role_id)):
+            super().delete(user_id, role_id)
+
+
+class ConcurrentRolePermissionRepository(RolePermissionRepository):
+    """RolePermissionRepository con franjas por rol y por permiso"""
+
+    def __init__(self, stripes:int = 64):
+        super().__init__()
+        self._keys = LockedSortedKeyIndex()
+        self._stripes = StripedLock(stripes)
+
+    def add(self, relation:RolePermission):
+        with self._stripes.locks(("r", relation.role_id), ("p", relation.permission_id)):
+            super().add(relation)
+
+    def iter_all(self) -> Iterator[RolePermission]:
+        after = None
+        while page := self.get_page(after, 1000):
+            yield from page
+            after = (page[-1].role_id, page[-1].permission_id)
+
+    def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[RolePermission]:
+        return _page(self._relations, self._keys.after(after, limit))
+
+    def update_permission_relation(self, role_id:str, permission_id:str, new_permission:str) -> RolePermission:
+        with self._stripes.locks(("r", role_id), ("p", permission_id), ("p", new_permission)):
+            return super().update_permission_relation(role_id, permission_id, new_permission)
+
+    def delete(self, role_id:str, permission_id:str) -> None:
+        with self._stripes.locks(("r", role_id), ("p", permission_id)):
+            super().delete(role_id, permission_id)
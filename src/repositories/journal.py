@@ -0,0 +1,149 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from contextlib import suppress
+from collections.abc import Iterator
+
+_HEADER = struct.Struct("<II")
+
+
+class Journal:
+    """Log binario de solo escritura al final con fsync agrupado (group commit).
+
+    Cada registro se guarda como [largo u32][crc32 u32][payload pickle]. Los escritores
+    agregan registros al buffer y, si piden durabilidad, esperan a que un hilo de fondo
+    haga un unico flush+fsync que cubre a todos los registros pendientes en ese momento.
+
+    Si el flush o el fsync fallan (disco lleno, error de E/S) el journal queda inutilizable:
+    se despierta a los escritores en espera y el error se relanza en ellos y en toda llamada
+    posterior, en lugar de dejarlos esperando a un hilo que ya termino.
+    """
+
+    def __init__(self, path:str, flush_interval:float = 0.002):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = open(path, "ab")
+        self._condition = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncs = 0
+        self._closed = False
+        self._error: OSError | None = None
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flush", daemon=True)
+        self._flusher.start()
+
+    def append(self, record:tuple, wait:bool = True) -> int:
+        """Agrega un registro; con wait=True retorna cuando el registro ya esta en disco"""
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        data = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._condition:
+            self._raise_if_failed()
+            if self._closed:
+                raise ValueError("El journal esta cerrado")
+            self._file.write(data)
+            self._written += 1
+            position = self._written
+            self._condition.notify_all()
+        if wait:
+            self.wait_for(position)
+        return position
+
+    def wait_for(self, position:int) -> None:
+        """Espera a que el registro en la posicion indicada (retornada por append) este en disco"""
+        with self._condition:
+            while self._synced < position and self._error is None:
+                self._condition.wait()
+            if self._synced < position:
+                self._raise_if_failed()
+
+    def sync(self) -> None:
+        """Espera a que todos los registros escritos esten en disco"""
+        with self._condition:
+            target = self._written
+            self._condition.notify_all()
+            while self._synced < target and self._error is None:
+                self._condition.wait()
+            self._raise_if_failed()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {"records": self._written, "synced": self._synced, "fsyncs": self._syncs}
+
+    def close(self) -> None:
+        try:
+            self.sync()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._flusher.join()
+            if self._error is None:
+                self._file.close()
+            else:
+                # El buffer que no se pudo escribir volveria a fallar al cerrar
+                with suppress(OSError):
+                    self._file.close()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._synced == self._written and not self._closed:
+                    self._condition.wait()
+                if self._closed and self._synced == self._written:
+                    return
+            # Se deja acumular escrituras concurrentes antes de pagar el fsync
+            if self.flush_interval:
+                time.sleep(self.flush_interval)
+            try:
+                with self._condition:
+                    target = self._written
+                    self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as error:
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._synced = target
+                self._syncs += 1
+                self._condition.notify_all()
+
+    @staticmethod
+    def read(path:str) -> Iterator[tuple]:
+        """Itera los registros validos del log, deteniendose en una cola truncada o corrupta"""
+        for record, _ in Journal._scan(path):
+            yield record
+
+    @staticmethod
+    def repair(path:str) -> int:
+        """Recorta la cola invalida que deja un corte a mitad de escritura, retorna los registros validos"""
+        count = 0
+        valid_length = 0
+        for _, end in Journal._scan(path):
+            count += 1
+            valid_length = end
+        if os.path.getsize(path) != valid_length:
+            with open(path, "r+b") as file:
+                file.truncate(valid_length)
+        return count
+
+    @staticmethod
+    def _scan(path:str) -> Iterator[tuple[tuple, int]]:
+        with open(path, "rb") as file:
+            while True:
+                header = file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                size, checksum = _HEADER.unpack(header)
+                payload = file.read(size)
+                if len(payload) < size or zlib.crc32(payload) != checksum:
+                    return
+                yield pickle.loads(payload), file.tell()
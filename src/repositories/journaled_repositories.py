@@ -0,0 +1,360 @@
+import glob
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.repositories.user_repository import UserRepository
+from src.repositories.role_repository import RoleRepository
+from src.repositories.permission_repository import PermissionRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.repositories.journal import Journal
+
+
+def _user_state(user:User) -> tuple:
+    return (user.id, user.username, user.email, user.password, UserStatus(user.status).value,
+            to_epoch_micros(user.created_at), to_epoch_micros(user.updated_at), user.version)
+
+# Los estados escritos antes de agregar la version no la incluyen; se restauran en la version 1
+def _user_from_state(state:tuple) -> User:
+    id, username, email, password, status, created_at, updated_at, *version = state
+    return User.restore(id, username, email, password, UserStatus(status),
+                        from_epoch_micros(created_at), from_epoch_micros(updated_at), *version)
+
+def _named_state(entity:Role | Permission) -> tuple:
+    return (entity.id, entity.name, entity.description,
+            to_epoch_micros(entity.created_at), to_epoch_micros(entity.updated_at), entity.version)
+
+def _named_from_state(cls, state:tuple):
+    id, name, description, created_at, updated_at, *version = state
+    return cls.restore(id, name, description, from_epoch_micros(created_at), from_epoch_micros(updated_at),
+                       *version)
+
+
+class JournaledStore:
+    """Repositorios en memoria con durabilidad mediante journal (WAL) y snapshots periodicos.
+
+    Cada mutacion se aplica en memoria y se registra en el journal bajo un mismo lock; la
+    espera del fsync ocurre fuera del lock para que escritores concurrentes compartan un
+    mismo fsync. Cada snapshot_every registros se escribe un snapshot completo y se rota el
+    journal. Al abrir el directorio se carga el ultimo snapshot y se reproduce la cola del log.
+    """
+
+    def __init__(self, directory:str, snapshot_every:int = 100_000, flush_interval:float = 0.002, sync:bool = True):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.flush_interval = flush_interval
+        self.sync = sync
+        self._lock = threading.RLock()
+        self.users = JournaledUserRepository(self)
+        self.roles = JournaledRoleRepository(self)
+        self.permissions = JournaledPermissionRepository(self)
+        self.user_roles = JournaledUserRoleRepository(self)
+        self.role_permissions = JournaledRolePermissionRepository(self)
+        self._sequence = 0
+        self._since_snapshot = 0
+        self._recover()
+        self._journal = Journal(self._journal_path(self._sequence), flush_interval)
+
+    # -------------------- Escritura --------------------
+
+    @contextmanager
+    def transaction(self):
+        """Aplica una mutacion y registra sus entradas de forma atomica respecto a otros escritores"""
+        records: list[tuple] = []
+        with self._lock:
+            yield records.append
+            position = 0
+            for record in records:
+                position = self._journal.append(record, wait=False)
+            journal = self._journal
+            self._sequence += len(records)
+            self._since_snapshot += len(records)
+            snapshot_due = self._since_snapshot >= self.snapshot_every
+        if self.sync and position:
+            journal.wait_for(position)
+        if snapshot_due:
+            self.snapshot(force=False)
+
+    def snapshot(self, force:bool = True) -> str | None:
+        """Escribe un snapshot completo del estado actual y rota el journal"""
+        with self._lock:
+            if not force and self._since_snapshot < self.snapshot_every:
+                return None
+            self._journal.close()
+            path = self._snapshot_path(self._sequence)
+            temporary = path + ".tmp"
+            with open(temporary, "wb") as file:
+                pickle.dump(self._export_state(), file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, path)
+            self._journal = Journal(self._journal_path(self._sequence), self.flush_interval)
+            self._since_snapshot = 0
+            self._remove_older_than(self._sequence)
+            return path
+
+    def close(self) -> None:
+        with self._lock:
+            self._journal.close()
+
+    def stats(self) -> dict:
+        return {"sequence": self._sequence, "since_snapshot": self._since_snapshot, **self._journal.stats()}
+
+    # -------------------- Recuperacion --------------------
+
+    def _recover(self) -> None:
+        snapshots = self._files("snapshot-*.bin")
+        start = 0
+        if snapshots:
+            start, path = snapshots[-1]
+            with open(path, "rb") as file:
+                self._import_state(pickle.load(file))
+        self._sequence = start
+        segments = [(first, path) for first, path in self._files("journal-*.log") if first >= start]
+        for first, path in segments:
+            Journal.repair(path)
+            for record in Journal.read(path):
+                self._apply(record)
+                self._sequence += 1
+        self._since_snapshot = self._sequence - start
+
+    def _apply(self, record:tuple) -> None:
+        operation, *args = record
+        if operation == "user.put":
+            previous, state = args
+            if previous is not None and UserRepository.find(self.users, previous):
+                UserRepository.delete(self.users, previous)
+            UserRepository.add(self.users, _user_from_state(state))
+        elif operation == "user.delete":
+            UserRepository.delete(self.users, args[0])
+        elif operation == "role.put":
+            self._put_named(RoleRepository, self.roles, _named_from_state(Role, args[0]))
+        elif operation == "role.delete":
+            RoleRepository.delete(self.roles, args[0])
+        elif operation == "permission.put":
+            self._put_named(PermissionRepository, self.permissions, _named_from_state(Permission, args[0]))
+        elif operation == "permission.delete":
+            PermissionRepository.delete(self.permissions, args[0])
+        elif operation == "user_role.add":
+            UserRoleRepository.add(self.user_roles, UserRole(*args))
+        elif operation == "user_role.update":
+            UserRoleRepository.update_role_relation(self.user_roles, *args)
+        elif operation == "user_role.delete":
+            UserRoleRepository.delete(self.user_roles, *args)
+        elif operation == "role_permission.add":
+            RolePermissionRepository.add(self.role_permissions, RolePermission(*args))
+        elif operation == "role_permission.update":
+            RolePermissionRepository.update_permission_relation(self.role_permissions, *args)
+        elif operation == "role_permission.delete":
+            RolePermissionRepository.delete(self.role_permissions, *args)
+        else:
+            raise ValueError(f"Operacion de journal desconocida: {operation}")
+
+    @staticmethod
+    def _put_named(repository_cls, repository, entity) -> None:
+        """Reemplaza (o agrega) un rol/permiso por nombre sin pasar por el journal"""
+        if entity.name in repository._data:
+            repository_cls.delete(repository, entity.name)
+        repository_cls.add(repository, entity)
+
+    def _export_state(self) -> dict:
+        return {
+            "users": [_user_state(user) for user in self.users._data.values()],
+            "roles": [_named_state(role) for role in self.roles._data.values()],
+            "permissions": [_named_state(permission) for permission in self.permissions._data.values()],
+            "user_roles": [(relation.user_id, relation.role_id) for relation in self.user_roles._relations.values()],
+            "role_permissions": [(relation.role_id, relation.permission_id)
+                                 for relation in self.role_permissions._relations.values()],
+        }
+
+    def _import_state(self, state:dict) -> None:
+        UserRepository.add_many(self.users, [_user_from_state(item) for item in state["users"]])
+        for item in state["roles"]:
+            RoleRepository.add(self.roles, _named_from_state(Role, item))
+        for item in state["permissions"]:
+            PermissionRepository.add(self.permissions, _named_from_state(Permission, item))
+        for user_id, role_id in state["user_roles"]:
+            UserRoleRepository.add(self.user_roles, UserRole(user_id, role_id))
+        for role_id, permission_id in state["role_permissions"]:
+            RolePermissionRepository.add(self.role_permissions, RolePermission(role_id, permission_id))
+
+    # -------------------- Archivos --------------------
+
+    def _snapshot_path(self, sequence:int) -> str:
+        return os.path.join(self.directory, f"snapshot-{sequence:012d}.bin")
+
+    def _journal_path(self, sequence:int) -> str:
+        return os.path.join(self.directory, f"journal-{sequence:012d}.log")
+
+    def _files(self, pattern:str) -> list[tuple[int, str]]:
+        files = []
+        for path in glob.glob(os.path.join(self.directory, pattern)):
+            sequence = os.path.basename(path).split("-")[1].split(".")[0]
+            files.append((int(sequence), path))
+        return sorted(files)
+
+    def _remove_older_than(self, sequence:int) -> None:
+        for pattern in ("snapshot-*.bin", "journal-*.log"):
+            for first, path in self._files(pattern):
+                if first < sequence:
+                    os.remove(path)
+
+
+class JournaledUserRepository(UserRepository):
+    blocking_io = True
+
+    def __init__(self, store:JournaledStore):
+        super().__init__()
+        self._store = store
+
+    def add(self, user:User) -> User:
+        with self._store.transaction() as log:
+            super().add(user)
+            log(("user.put", None, _user_state(user)))
+        return user
+
+    def add_many(self, users:list[User]) -> list[User]:
+        with self._store.transaction() as log:
+            super().add_many(users)
+            for user in users:
+                log(("user.put", None, _user_state(user)))
+        return users
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        with self._store.transaction() as log:
+            previous = self.get(username).username
+            user = super().update_username(username, new_username, expected_version)
+            log(("user.put", previous, _user_state(user)))
+        return user
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        with self._store.transaction() as log:
+            user = super().update_email(username, new_email, expected_version)
+            log(("user.put", user.username, _user_state(user)))
+        return user
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        with self._store.transaction() as log:
+            user = super().update_password(username, new_password, expected_version)
+            log(("user.put", user.username, _user_state(user)))
+        return user
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        with self._store.transaction() as log:
+            user = super().update_status(username, new_status, expected_version)
+            log(("user.put", user.username, _user_state(user)))
+        return user
+
+    def delete(self, username:str) -> None:
+        with self._store.transaction() as log:
+            user = self.get(username)
+            super().delete(username)
+            log(("user.delete", user.username))
+
+
+class JournaledRoleRepository(RoleRepository):
+    blocking_io = True
+
+    def __init__(self, store:JournaledStore):
+        super().__init__()
+        self._store = store
+
+    def add(self, role:Role) -> Role:
+        with self._store.transaction() as log:
+            super().add(role)
+            log(("role.put", _named_state(role)))
+        return role
+
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Role:
+        with self._store.transaction() as log:
+            role = super().update_description(name, new_description, expected_version)
+            log(("role.put", _named_state(role)))
+        return role
+
+    def delete(self, name:str) -> None:
+        with self._store.transaction() as log:
+            super().delete(name)
+            log(("role.delete", name))
+
+
+class JournaledPermissionRepository(PermissionRepository):
+    blocking_io = True
+
+    def __init__(self, store:JournaledStore):
+        super().__init__()
+        self._store = store
+
+    def add(self, permission:Permission) -> Permission:
+        with self._store.transaction() as log:
+            super().add(permission)
+            log(("permission.put", _named_state(permission)))
+        return permission
+
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Permission:
+        with self._store.transaction() as log:
+            permission = super().update_description(name, new_description, expected_version)
+            log(("permission.put", _named_state(permission)))
+        return permission
+
+    def delete(self, name:str) -> None:
+        with self._store.transaction() as log:
+            super().delete(name)
+            log(("permission.delete", name))
+
+
+class JournaledUserRoleRepository(UserRoleRepository):
+    blocking_io = True
+
+    def __init__(self, store:JournaledStore):
+        super().__init__()
+        self._store = store
+
+    def add(self, relation:UserRole):
+        with self._store.transaction() as log:
+            super().add(relation)
+            log(("user_role.add", relation.user_id, relation.role_id))
+
+    def update_role_relation(self, user_id:str, role_id:str, new_role:str) -> UserRole:
+        with self._store.transaction() as log:
+            relation = super().update_role_relation(user_id, role_id, new_role)
+            log(("user_role.update", user_id, role_id, new_role))
+        return relation
+
+    def delete(self, user_id:str, role_id:str) -> None:
+        with self._store.transaction() as log:
+            super().delete(user_id, role_id)
+            log(("user_role.delete", user_id, role_id))
+
+
+class JournaledRolePermissionRepository(RolePermissionRepository):
+    blocking_io = True
+
+    def __init__(self, store:JournaledStore):
+        super().__init__()
+        self._store = store
+
+    def add(self, relation:RolePermission):
+        with self._store.transaction() as log:
+            super().add(relation)
+            log(("role_permission.add", relation.role_id, relation.permission_id))
+
+    def update_permission_relation(self, role_id:str, permission_id:str, new_permission:str) -> RolePermission:
+        with self._store.transaction() as log:
+            relation = super().update_permission_relation(role_id, permission_id, new_permission)
+            log(("role_permission.update", role_id, permission_id, new_permission))
+        return relation
+
+    def delete(self, role_id:str, permission_id:str) -> None:
+        with self._store.transaction() as log:
+            super().delete(role_id, permission_id)
+            log(("role_permission.delete", role_id, permission_id))
@@ -0,0 +1,407 @@
+"""Snapshot binario de solo lectura que se consulta directamente sobre un mmap.
+
+Formato (version 2), todos los enteros en el orden de bytes de la maquina que lo escribio:
+
+    cabecera   magic(8) version u32 marca_de_orden u32 cantidad_de_secciones u32 relleno u32
+    directorio cantidad_de_secciones x [nombre 32s][offset u64][largo u64]
+    secciones  alineadas a 8 bytes
+
+Hay dos tipos de seccion. Una tabla de registros guarda [n u64][offsets u64 * (n+1)][datos]
+con un registro codificado con struct por entidad. Una tabla de claves guarda
+[n u64][offsets u64 * (n+1)][filas u32 * n][relleno][claves ordenadas] y se recorre con
+busqueda binaria. Las relaciones se guardan solo como claves compuestas "a\\0b" en dos
+ordenes, por lo que la consulta por prefijo entrega ambos sentidos sin tabla de registros.
+
+Abrir el archivo solo lee la cabecera y el directorio; los objetos se construyen recien al
+consultarlos. El mapeo es de solo lectura, asi que procesos hijos (workers de uvicorn) que
+abren el mismo archivo comparten las mismas paginas del page cache.
+"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from uuid import UUID
+
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.constants import messages
+from src.exceptions.user_exceptions import UserNotFoundError
+from src.exceptions.role_exceptions import RoleNotFoundError
+from src.exceptions.permission_exceptions import PermissionNotFoundError
+
+MAGIC = b"UMSNAP\x00\x00"
+FORMAT_VERSION = 2
+_BYTE_ORDER_MARK = 0x01020304
+
+_HEADER = struct.Struct("=8sIIII")
+_SECTION = struct.Struct("=32sQQ")
+_USER = struct.Struct("=16sBqqqIII")
+_NAMED = struct.Struct("=16sqqqII")
+_STATUSES = list(UserStatus)
+_SEPARATOR = b"\x00"
+
+
+def _pad(size:int) -> bytes:
+    return b"\x00" * (-size % 8)
+
+def _encode_user(user:User) -> bytes:
+    username, email, password = (user.username.encode(), user.email.encode(), user.password.encode())
+    header = _USER.pack(UUID(user.id).bytes, _STATUSES.index(UserStatus(user.status)),
+                        to_epoch_micros(user.created_at), to_epoch_micros(user.updated_at), user.version,
+                        len(username), len(email), len(password))
+    return header + username + email + password
+
+def _decode_user(data:memoryview) -> User:
+    id, status, created_at, updated_at, version, username_size, email_size, _ = _USER.unpack_from(data)
+    start = _USER.size
+    username = str(data[start:start + username_size], "utf-8")
+    start += username_size
+    email = str(data[start:start + email_size], "utf-8")
+    password = str(data[start + email_size:], "utf-8")
+    return User.restore(str(UUID(bytes=id)), username, email, password, _STATUSES[status],
+                        from_epoch_micros(created_at), from_epoch_micros(updated_at), version)
+
+def _encode_named(entity:Role | Permission) -> bytes:
+    name, description = entity.name.encode(), entity.description.encode()
+    header = _NAMED.pack(UUID(entity.id).bytes, to_epoch_micros(entity.created_at),
+                         to_epoch_micros(entity.updated_at), entity.version, len(name), len(description))
+    return header + name + description
+
+def _decode_named(cls, data:memoryview):
+    id, created_at, updated_at, version, name_size, _ = _NAMED.unpack_from(data)
+    name = str(data[_NAMED.size:_NAMED.size + name_size], "utf-8")
+    description = str(data[_NAMED.size + name_size:], "utf-8")
+    return cls.restore(str(UUID(bytes=id)), name, description,
+                       from_epoch_micros(created_at), from_epoch_micros(updated_at), version)
+
+def _pair_key(first:str, second:str) -> bytes:
+    return first.encode() + _SEPARATOR + second.encode()
+
+def _split_pair(key:bytes) -> tuple[str, str]:
+    first, second = key.split(_SEPARATOR, 1)
+    return first.decode(), second.decode()
+
+
+def _record_section(records:list[bytes]) -> bytes:
+    offsets = array("Q", [0])
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    return array("Q", [len(records)]).tobytes() + offsets.tobytes() + b"".join(records)
+
+def _key_section(keys:list[tuple[bytes, int]]) -> bytes:
+    """keys son pares (clave, fila); se ordenan por clave antes de escribirse"""
+    keys = sorted(keys)
+    offsets = array("Q", [0])
+    for key, _ in keys:
+        offsets.append(offsets[-1] + len(key))
+    rows = array("I", [row for _, row in keys]).tobytes()
+    head = array("Q", [len(keys)]).tobytes() + offsets.tobytes() + rows
+    return head + _pad(len(head)) + b"".join(key for key, _ in keys)
+
+
+def write_snapshot(path:str, users=(), roles=(), permissions=(), user_roles=(), role_permissions=()) -> str:
+    """Escribe un snapshot con las entidades y relaciones dadas; el reemplazo del archivo es atomico"""
+    users, roles, permissions = list(users), list(roles), list(permissions)
+    sections = {
+        "users": _record_section([_encode_user(user) for user in users]),
+        "users.username": _key_section([(user.username.encode(), row) for row, user in enumerate(users)]),
+        "users.email": _key_section([(user.email.strip().lower().encode(), row) for row, user in enumerate(users)]),
+        "roles": _record_section([_encode_named(role) for role in roles]),
+        "roles.name": _key_section([(role.name.encode(), row) for row, role in enumerate(roles)]),
+        "permissions": _record_section([_encode_named(permission) for permission in permissions]),
+        "permissions.name": _key_section([(permission.name.encode(), row)
+                                          for row, permission in enumerate(permissions)]),
+    }
+    user_roles = [(relation.user_id, relation.role_id) for relation in user_roles]
+    sections["user_roles.user"] = _key_section([(_pair_key(user, role), 0) for user, role in user_roles])
+    sections["user_roles.role"] = _key_section([(_pair_key(role, user), 0) for user, role in user_roles])
+    role_permissions = [(relation.role_id, relation.permission_id) for relation in role_permissions]
+    sections["role_permissions.role"] = _key_section([(_pair_key(role, permission), 0)
+                                                      for role, permission in role_permissions])
+    sections["role_permissions.permission"] = _key_section([(_pair_key(permission, role), 0)
+                                                            for role, permission in role_permissions])
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    offset += len(_pad(offset))
+    directory = []
+    for name, data in sections.items():
+        directory.append(_SECTION.pack(name.encode(), offset, len(data)))
+        offset += len(data) + len(_pad(len(data)))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        head = _HEADER.pack(MAGIC, FORMAT_VERSION, _BYTE_ORDER_MARK, len(sections), 0) + b"".join(directory)
+        file.write(head + _pad(len(head)))
+        for data in sections.values():
+            file.write(data + _pad(len(data)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return path
+
+
+class _RecordTable:
+    def __init__(self, view:memoryview):
+        count = struct.unpack_from("=Q", view)[0]
+        self._offsets = view[8:8 * (count + 2)].cast("Q")
+        self._data = view[8 * (count + 2):]
+        self._views = [self._offsets, self._data]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def record(self, row:int) -> memoryview:
+        return self._data[self._offsets[row]:self._offsets[row + 1]]
+
+
+class _KeyTable:
+    """Claves ordenadas; implementa __getitem__/__len__ para usarse directamente con bisect"""
+
+    def __init__(self, view:memoryview):
+        count = struct.unpack_from("=Q", view)[0]
+        rows_start = 8 * (count + 2)
+        keys_start = rows_start + 4 * count
+        keys_start += len(_pad(keys_start))
+        self._offsets = view[8:rows_start].cast("Q")
+        self._rows = view[rows_start:rows_start + 4 * count].cast("I")
+        self._keys = view[keys_start:]
+        self._views = [self._offsets, self._rows, self._keys]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index:int) -> bytes:
+        return bytes(self._keys[self._offsets[index]:self._offsets[index + 1]])
+
+    def row(self, key:bytes) -> int | None:
+        """Fila de la clave exacta, o None si no existe"""
+        index = bisect.bisect_left(self, key)
+        if index < len(self) and self[index] == key:
+            return self._rows[index]
+        return None
+
+    def prefix(self, prefix:bytes) -> range:
+        """Rango de posiciones cuyas claves empiezan con prefix"""
+        start = bisect.bisect_left(self, prefix)
+        # 0xff nunca aparece en utf-8, por lo que acota todas las claves con ese prefijo
+        return range(start, bisect.bisect_left(self, prefix + b"\xff", start))
+
+
+class MappedSnapshot:
+    """Archivo de snapshot abierto con mmap; expone repositorios de solo lectura"""
+
+    def __init__(self, path:str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sections: dict[str, memoryview] = {}
+        self._tables: list[_RecordTable | _KeyTable] = []
+        try:
+            self._read_directory()
+        except Exception:
+            self.close()
+            raise
+        self.users = MappedUserRepository(self)
+        self.roles = MappedRoleRepository(self)
+        self.permissions = MappedPermissionRepository(self)
+        self.user_roles = MappedUserRoleRepository(self)
+        self.role_permissions = MappedRolePermissionRepository(self)
+
+    def _read_directory(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise ValueError("Snapshot invalido: archivo incompleto")
+        magic, version, byte_order, count, _ = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("Snapshot invalido: firma desconocida")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Version de snapshot no soportada: {version}")
+        if byte_order != _BYTE_ORDER_MARK:
+            raise ValueError(f"Snapshot escrito con otro orden de bytes que {sys.byteorder}")
+        for index in range(count):
+            name, offset, size = _SECTION.unpack_from(self._view, _HEADER.size + index * _SECTION.size)
+            self._sections[name.rstrip(b"\x00").decode()] = self._view[offset:offset + size]
+
+    def records(self, name:str) -> _RecordTable:
+        table = _RecordTable(self._sections[name])
+        self._tables.append(table)
+        return table
+
+    def keys(self, name:str) -> _KeyTable:
+        table = _KeyTable(self._sections[name])
+        self._tables.append(table)
+        return table
+
+    def close(self) -> None:
+        """Libera las vistas sobre el mapeo y cierra el archivo"""
+        for table in self._tables:
+            for view in table._views:
+                view.release()
+        for view in self._sections.values():
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class MappedUserRepository:
+    """Consulta de usuarios sobre el snapshot, con la interfaz de lectura de UserRepository"""
+
+    def __init__(self, snapshot:MappedSnapshot):
+        self._records = snapshot.records("users")
+        self._by_username = snapshot.keys("users.username")
+        self._by_email = snapshot.keys("users.email")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def find(self, username:str) -> User | None:
+        """Busca un usuario por username, retorna el usuario o None si no existe"""
+        row = self._by_username.row(username.strip().encode())
+        return None if row is None else _decode_user(self._records.record(row))
+
+    def find_by_email(self, email:str) -> User | None:
+        """Busca un usuario por email, retorna el usuario o None si no existe"""
+        if not email:
+            return None
+        row = self._by_email.row(email.strip().lower().encode())
+        return None if row is None else _decode_user(self._records.record(row))
+
+    def get(self, username:str) -> User:
+        """Obtiene un usuario por username, lanza una excepcion si no existe"""
+        user = self.find(username)
+        if not user:
+            raise UserNotFoundError(messages.USER_NOT_FOUND)
+        return user
+
+    def get_all(self) -> list[User]:
+        """Obtiene todos los usuarios en el orden en que se escribieron"""
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[User]:
+        for row in range(len(self._records)):
+            yield _decode_user(self._records.record(row))
+
+
+class _MappedNamedRepository:
+    model = None
+    section = ""
+    not_found = None
+    not_found_message = ""
+
+    def __init__(self, snapshot:MappedSnapshot):
+        self._records = snapshot.records(self.section)
+        self._by_name = snapshot.keys(f"{self.section}.name")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def find(self, name:str):
+        row = self._by_name.row(name.strip().lower().encode())
+        return None if row is None else _decode_named(self.model, self._records.record(row))
+
+    def get(self, name:str):
+        entity = self.find(name)
+        if not entity:
+            raise self.not_found(self.not_found_message)
+        return entity
+
+    def get_all(self) -> list:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator:
+        for row in range(len(self._records)):
+            yield _decode_named(self.model, self._records.record(row))
+
+
+class MappedRoleRepository(_MappedNamedRepository):
+    model = Role
+    section = "roles"
+    not_found = RoleNotFoundError
+    not_found_message = messages.ROLE_NOT_FOUND
+
+
+class MappedPermissionRepository(_MappedNamedRepository):
+    model = Permission
+    section = "permissions"
+    not_found = PermissionNotFoundError
+    not_found_message = messages.PERMISSION_NOT_FOUND
+
+
+class _MappedRelationRepository:
+    """Relaciones guardadas como claves compuestas en dos ordenes (forward y reverse)"""
+    model = None
+
+    def __init__(self, forward:_KeyTable, reverse:_KeyTable):
+        self._forward = forward
+        self._reverse = reverse
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def _exists(self, first:str, second:str) -> bool:
+        return self._forward.row(_pair_key(first, second)) is not None
+
+    def _by_first(self, first:str) -> list:
+        keys = self._forward
+        return [self.model(*_split_pair(keys[index])) for index in keys.prefix(first.encode() + _SEPARATOR)]
+
+    def _by_second(self, second:str) -> list:
+        keys = self._reverse
+        return [self.model(*reversed(_split_pair(keys[index])))
+                for index in keys.prefix(second.encode() + _SEPARATOR)]
+
+    def get_all(self) -> list:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator:
+        for index in range(len(self._forward)):
+            yield self.model(*_split_pair(self._forward[index]))
+
+
+class MappedUserRoleRepository(_MappedRelationRepository):
+    model = UserRole
+
+    def __init__(self, snapshot:MappedSnapshot):
+        super().__init__(snapshot.keys("user_roles.user"), snapshot.keys("user_roles.role"))
+
+    def find(self, user_id:str, role_id:str) -> UserRole | None:
+        return UserRole(user_id, role_id) if self._exists(user_id, role_id) else None
+
+    def get_roles_by_user(self, user_id:str) -> list[UserRole]:
+        return self._by_first(user_id)
+
+    def get_users_by_role(self, role_id:str) -> list[UserRole]:
+        return self._by_second(role_id)
+
+
+class MappedRolePermissionRepository(_MappedRelationRepository):
+    model = RolePermission
+
+    def __init__(self, snapshot:MappedSnapshot):
+        super().__init__(snapshot.keys("role_permissions.role"), snapshot.keys("role_permissions.permission"))
+
+    def find(self, role_id:str, permission_id:str) -> RolePermission | None:
+        return RolePermission(role_id, permission_id) if self._exists(role_id, permission_id) else None
+
+    def role_has_permission(self, role_id:str, permission_id:str) -> bool:
+        return self._exists(role_id, permission_id)
+
+    def get_permissions_by_role(self, role_id:str) -> list[RolePermission]:
+        return self._by_first(role_id)
+
+    def get_roles_by_permission(self, permission_id:str) -> list[RolePermission]:
+        return self._by_second(permission_id)
@@ -1,4 +1,7 @@
+from collections.abc import Iterator
 from src.models.permission import Permission
+from src.repositories.sorted_index import SortedKeyIndex
+from src.repositories.versioning import check_version
 from src.constants import messages
 from src.exceptions.permission_exceptions import PermissionAlreadyExistsError, PermissionNotFoundError
 
@@ -6,11 +9,15 @@ from src.exceptions.permission_exceptions import PermissionAlreadyExistsError, P
 class PermissionRepository():
     def __init__(self):
         self._data: dict[str, Permission] = {}
+        self._by_id: dict[str, Permission] = {}
+        self._ids = SortedKeyIndex()
 
     def add(self, permission:Permission) -> Permission:
         if permission.name in self._data:
             raise PermissionAlreadyExistsError(messages.PERMISSION_ALREADY_EXISTS)
         self._data[permission.name] = permission
+        self._by_id[permission.id] = permission
+        self._ids.add(permission.id)
         return self._data[permission.name]
     
     def find(self, name:str) -> Permission | None:
@@ -24,13 +31,24 @@ class PermissionRepository():
     
     def get_all(self) -> list[Permission]:
         return list(self._data.values())
+
+    def iter_all(self) -> Iterator[Permission]:
+        """Itera los permisos sin copiar la coleccion"""
+        yield from self._data.values()
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[Permission]:
+        """Pagina por cursor: hasta limit permisos con id mayor que after, en orden de id (uuid7, orden de creacion)"""
+        return [self._by_id[id] for id in self._ids.after(after, limit)]
     
-    def update_description(self, name:str, new_description:str) -> Permission:
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Permission:
         permission = self.get(name)
+        check_version(permission, expected_version)
         permission.update_description(new_description)
         self._data[name] = permission
         return permission
     
     def delete(self, name:str)-> None:
         permission = self.get(name)
-        del self._data[name]
\ No newline at end of file
+        del self._data[name]
+        del self._by_id[permission.id]
+        self._ids.discard(permission.id)
\ No newline at end of file
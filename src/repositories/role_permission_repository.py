@@ -1,43 +1,82 @@
+from collections.abc import Iterator
 from src.models.role_permission import RolePermission
+from src.repositories.sorted_index import SortedKeyIndex
+from src.exceptions.relation_exceptions import RelationValidationError
 
 
 class RolePermissionRepository:
     def __init__(self):
-        self._relations: list[RolePermission] = []
+        self._relations: dict[tuple[str, str], RolePermission] = {}
+        self._keys = SortedKeyIndex()
+        self._permissions_by_role: dict[str, dict[str, RolePermission]] = {}
+        self._roles_by_permission: dict[str, dict[str, RolePermission]] = {}
 
     def add(self, relation: RolePermission):
-        if self.find(relation.role_id, relation.permission_id):
-            raise ValueError("La relación ya existe")
-        self._relations.append(relation)
+        key = (relation.role_id, relation.permission_id)
+        if key in self._relations:
+            raise RelationValidationError("La relación ya existe")
+        self._link(relation)
 
     def find(self, role_id: str, permission_id: str) -> RolePermission | None:
-        for relation in self._relations:
-            if relation.role_id == role_id and relation.permission_id == permission_id:
-                return relation
-        return None
+        return self._relations.get((role_id, permission_id))
+
+    def role_has_permission(self, role_id: str, permission_id: str) -> bool:
+        """Verifica si el rol tiene el permiso sin construir listas intermedias"""
+        return (role_id, permission_id) in self._relations
 
     def get_all(self) -> list[RolePermission]:
-        return self._relations
+        return list(self._relations.values())
+
+    def iter_all(self) -> Iterator[RolePermission]:
+        yield from self._relations.values()
+
+    def get_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[RolePermission]:
+        """Pagina por cursor ordenada por (role_id, permission_id); after es el par de la ultima relacion recibida"""
+        return [self._relations[key] for key in self._keys.after(after, limit)]
 
     def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
-        return [relation for relation in self._relations if relation.role_id == role_id]
+        return list(self._permissions_by_role.get(role_id, {}).values())
 
     def get_roles_by_permission(self, permission_id: str) -> list[RolePermission]:
-        return [relation for relation in self._relations if relation.permission_id == permission_id]
+        return list(self._roles_by_permission.get(permission_id, {}).values())
 
     def update_permission_relation(self, role_id: str, permission_id: str, new_permission: str) -> RolePermission:
         old_relation = self.find(role_id, permission_id)
         if not old_relation:
-            raise ValueError("El rol no cuenta con ese permiso")
+            raise RelationValidationError("El rol no cuenta con ese permiso")
         if old_relation.permission_id == new_permission:
-            raise ValueError("El rol ya cuenta con ese permiso")
+            raise RelationValidationError("El rol ya cuenta con ese permiso")
+        if (role_id, new_permission) in self._relations:
+            raise RelationValidationError("La relación ya existe")
         new_relation = RolePermission(role_id, new_permission)
-        index = self._relations.index(old_relation)
-        self._relations[index] = new_relation
+        self._unlink(old_relation)
+        self._link(new_relation)
         return new_relation
 
     def delete(self, role_id: str, permission_id: str) -> None:
         relation = self.find(role_id, permission_id)
         if not relation:
-            raise ValueError("El rol no cuenta con ese permiso")
-        self._relations.remove(relation)
+            raise RelationValidationError("El rol no cuenta con ese permiso")
+        self._unlink(relation)
+
+    def _link(self, relation: RolePermission) -> None:
+        """Registra la relacion en el conjunto de pares y en ambos indices"""
+        key = (relation.role_id, relation.permission_id)
+        self._relations[key] = relation
+        self._keys.add(key)
+        self._permissions_by_role.setdefault(relation.role_id, {})[relation.permission_id] = relation
+        self._roles_by_permission.setdefault(relation.permission_id, {})[relation.role_id] = relation
+
+    def _unlink(self, relation: RolePermission) -> None:
+        """Elimina la relacion de los indices, descartando los grupos que quedan vacios"""
+        key = (relation.role_id, relation.permission_id)
+        del self._relations[key]
+        self._keys.discard(key)
+        permissions = self._permissions_by_role[relation.role_id]
+        del permissions[relation.permission_id]
+        if not permissions:
+            del self._permissions_by_role[relation.role_id]
+        roles = self._roles_by_permission[relation.permission_id]
+        del roles[relation.role_id]
+        if not roles:
+            del self._roles_by_permission[relation.permission_id]
@@ -1,16 +1,23 @@
+from collections.abc import Iterator
 from src.models.role import Role
+from src.repositories.sorted_index import SortedKeyIndex
+from src.repositories.versioning import check_version
 from src.exceptions.role_exceptions import RoleAlreadyExistsError, RoleNotFoundError
 from src.constants import messages
 
 class RoleRepository():
     def __init__(self):
         self._data: dict[str, Role] = {}
+        self._by_id: dict[str, Role] = {}
+        self._ids = SortedKeyIndex()
 
     def add(self, role:Role) -> Role:
         """Agrega un nuevo rol, retorna el rol creado o una excepcion si ya se encontraba registrado"""
         if role.name in self._data:
             raise RoleAlreadyExistsError(messages.ROLE_ALREADY_EXISTS)
         self._data[role.name] = role
+        self._by_id[role.id] = role
+        self._ids.add(role.id)
         return self._data[role.name]
     
     def find(self, name:str) -> Role | None:
@@ -27,10 +34,19 @@ class RoleRepository():
     def get_all(self) -> list[Role]:
         """Obtiene todos los roles registrados"""
         return list(self._data.values())
+
+    def iter_all(self) -> Iterator[Role]:
+        """Itera los roles sin copiar la coleccion"""
+        yield from self._data.values()
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[Role]:
+        """Pagina por cursor: hasta limit roles con id mayor que after, en orden de id (uuid7, orden de creacion)"""
+        return [self._by_id[id] for id in self._ids.after(after, limit)]
     
-    def update_description(self, name:str, new_description:str) -> Role:
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Role:
         """Actualiza la descripción de un rol, retorna el rol actualizado"""
         role = self.get(name)
+        check_version(role, expected_version)
         role.update_description(new_description)
         self._data[name] = role
         return role
@@ -38,4 +54,6 @@ class RoleRepository():
     def delete(self, name:str)-> None:
         """Elimina un rol registrado"""
         role = self.get(name)
-        del self._data[name]
\ No newline at end of file
+        del self._data[name]
+        del self._by_id[role.id]
+        self._ids.discard(role.id)
\ No newline at end of file
@@ -0,0 +1,350 @@
+"""Matriz de permisos en memoria compartida para varios procesos worker (uvicorn --workers N).
+
+Un segmento de multiprocessing.shared_memory guarda, con capacidad fija:
+
+- tablas de ids de usuarios, roles y permisos (un slot de NAME_SIZE bytes por id, solo se
+  agregan, nunca se reutilizan);
+- una fila de bits por usuario con sus roles y una fila de bits por rol con sus permisos.
+
+Un unico proceso escritor (el que crea el segmento) aplica los cambios; los workers se
+conectan por nombre y leen sin copiar los datos, por lo que la memoria no crece con la
+cantidad de workers y todos ven el mismo estado apenas se publica. La consistencia entre
+procesos usa un contador de generacion estilo seqlock: el escritor lo deja impar mientras
+escribe y par al terminar, y el lector repite la lectura si lo encontro impar o si cambio
+entre el inicio y el final; si el escritor muere a mitad de una escritura la generacion queda
+impar y los lectores fallan con StalledWriterError pasado read_timeout. Python no expone barreras de memoria; el esquema depende del
+orden de escrituras de x86-64 y de que las lecturas alineadas de 8 bytes no se parten.
+"""
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from multiprocessing import shared_memory
+
+from src.constants import messages
+from src.exceptions.concurrency_exceptions import StalledWriterError
+from src.services.authorization_service import pack_bitmap
+
+MAGIC = b"UMPERMX\x00"
+FORMAT_VERSION = 1
+NAME_SIZE = 64
+# magic, version, name_size, generacion, capacidades (usuarios, roles, permisos) y cantidades
+_HEADER = struct.Struct("=8sIIQIIIIII")
+_HEADER_SIZE = 64
+_GENERATION = struct.Struct("=Q")
+_GENERATION_OFFSET = 16
+_COUNT = struct.Struct("=I")
+_COUNT_OFFSETS = {"users": 36, "roles": 40, "permissions": 44}
+_attach_lock = threading.Lock()
+
+
+def _attach(name:str) -> shared_memory.SharedMemory:
+    """Abre un segmento existente sin que el resource_tracker de este proceso lo borre al salir"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Antes de 3.13 no hay track=False: se evita el registro, ya que desregistrar despues borraria
+    # tambien el registro del escritor cuando comparten el resource_tracker (procesos hijos).
+    # El reemplazo de register es global al proceso: solo omite este segmento, para no perder los
+    # registros de otros hilos, y el lock evita que dos attach restauren la funcion equivocada
+    from multiprocessing import resource_tracker
+    with _attach_lock:
+        register = resource_tracker.register
+        def register_others(resource_name, rtype):
+            if rtype != "shared_memory" or resource_name.lstrip("/") != name.lstrip("/"):
+                register(resource_name, rtype)
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedPermissionMatrix:
+    """Matriz usuario->rol y rol->permiso en memoria compartida.
+
+    create crea el segmento y retorna la instancia escritora; attach conecta un lector. La
+    interfaz de consultas y los metodos on_* coinciden con AuthorizationService, asi que el
+    escritor puede pasarse como authorization a UserRoleService y RolePermissionService.
+    """
+
+    # Segundos que un lector espera a una misma escritura antes de dar al escritor por muerto
+    read_timeout = 1.0
+
+    def __init__(self, segment:shared_memory.SharedMemory, owner:bool):
+        self._segment = segment
+        self._buffer = segment.buf
+        self.owner = owner
+        magic, version, name_size, _, max_users, max_roles, max_permissions, *_ = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != FORMAT_VERSION or name_size != NAME_SIZE:
+            raise ValueError(f"El segmento {segment.name} no contiene una matriz de permisos")
+        self.max_users, self.max_roles, self.max_permissions = max_users, max_roles, max_permissions
+        self._role_bytes = (max_roles + 7) // 8
+        self._permission_bytes = (max_permissions + 7) // 8
+        self._capacity = {"users": max_users, "roles": max_roles, "permissions": max_permissions}
+        self._names_offset = {"users": _HEADER_SIZE}
+        self._names_offset["roles"] = self._names_offset["users"] + max_users * NAME_SIZE
+        self._names_offset["permissions"] = self._names_offset["roles"] + max_roles * NAME_SIZE
+        self._user_rows = self._names_offset["permissions"] + max_permissions * NAME_SIZE
+        self._role_rows = self._user_rows + max_users * self._role_bytes
+        # Copia local de las tablas de ids, se completa a medida que el escritor agrega slots
+        self._slots: dict[str, dict[str, int]] = {"users": {}, "roles": {}, "permissions": {}}
+        self._names: dict[str, list[str]] = {"users": [], "roles": [], "permissions": []}
+
+    @staticmethod
+    def size_for(max_users:int, max_roles:int, max_permissions:int) -> int:
+        return (_HEADER_SIZE + (max_users + max_roles + max_permissions) * NAME_SIZE
+                + max_users * ((max_roles + 7) // 8) + max_roles * ((max_permissions + 7) // 8))
+
+    @classmethod
+    def create(cls, name:str | None = None, max_users:int = 100_000, max_roles:int = 256,
+               max_permissions:int = 1024) -> "SharedPermissionMatrix":
+        segment = shared_memory.SharedMemory(name=name, create=True,
+                                             size=cls.size_for(max_users, max_roles, max_permissions))
+        _HEADER.pack_into(segment.buf, 0, MAGIC, FORMAT_VERSION, NAME_SIZE, 0, max_users, max_roles,
+                          max_permissions, 0, 0, 0)
+        return cls(segment, owner=True)
+
+    @classmethod
+    def attach(cls, name:str) -> "SharedPermissionMatrix":
+        segment = _attach(name)
+        try:
+            return cls(segment, owner=False)
+        except ValueError:
+            segment.close()
+            raise
+
+    @property
+    def name(self) -> str:
+        return self._segment.name
+
+    @property
+    def generation(self) -> int:
+        return _GENERATION.unpack_from(self._buffer, _GENERATION_OFFSET)[0]
+
+    def close(self) -> None:
+        """Libera la vista de este proceso; el escritor ademas elimina el segmento"""
+        self._buffer.release()
+        self._segment.close()
+        if self.owner:
+            self._segment.unlink()
+
+    def __enter__(self) -> "SharedPermissionMatrix":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # -------------------- Consultas --------------------
+
+    def has_permission(self, user_id:str, permission_id:str) -> bool:
+        if not user_id or not permission_id:
+            return False
+        return self._read(lambda: self._has_permission(user_id, permission_id))
+
+    def get_user_permissions(self, user_id:str) -> frozenset[str]:
+        return self._read(lambda: self._user_permissions(user_id))
+
+    def check_many(self, checks:Iterable[tuple[str, str]]) -> list[bool]:
+        checks = list(checks)
+        def evaluate() -> list[bool]:
+            by_user: dict[str, frozenset[str]] = {}
+            results = []
+            for user_id, permission_id in checks:
+                if not user_id or not permission_id:
+                    results.append(False)
+                    continue
+                permissions = by_user.get(user_id)
+                if permissions is None:
+                    permissions = by_user[user_id] = self._user_permissions(user_id)
+                results.append(permission_id in permissions)
+            return results
+        return self._read(evaluate)
+
+    def check_many_bitmap(self, checks:Iterable[tuple[str, str]]) -> bytes:
+        return pack_bitmap(self.check_many(checks))
+
+    def warm(self) -> int:
+        """Carga las tablas de ids publicadas hasta ahora, retorna cuantos usuarios hay"""
+        for kind in self._slots:
+            self._refresh(kind)
+        return len(self._names["users"])
+
+    def invalidate(self, user_id:str | None = None) -> None:
+        """Los datos compartidos siempre estan al dia; solo se vuelven a leer las tablas de ids"""
+        self.warm()
+
+    # -------------------- Escrituras (solo el proceso creador) --------------------
+
+    def load(self, user_roles:Iterable, role_permissions:Iterable) -> None:
+        """Carga relaciones existentes (por ejemplo get_all de los repositorios) en una sola generacion"""
+        self._begin()
+        try:
+            for relation in user_roles:
+                self._set_bit(self._user_rows, self._role_bytes, self._slot("users", relation.user_id, True),
+                              self._slot("roles", relation.role_id, True), True)
+            for relation in role_permissions:
+                self._set_bit(self._role_rows, self._permission_bytes, self._slot("roles", relation.role_id, True),
+                              self._slot("permissions", relation.permission_id, True), True)
+        finally:
+            self._end()
+
+    def on_role_assigned(self, user_id:str, role_id:str) -> None:
+        self._write(self._user_rows, self._role_bytes, "users", user_id, "roles", role_id, True)
+
+    def on_role_removed(self, user_id:str, role_id:str) -> None:
+        self._write(self._user_rows, self._role_bytes, "users", user_id, "roles", role_id, False)
+
+    def on_role_replaced(self, user_id:str, old_role_id:str, new_role_id:str) -> None:
+        """Cambia un rol por otro en una sola generacion, sin estado intermedio visible para los lectores"""
+        self._begin()
+        try:
+            user = self._slot("users", user_id, True)
+            old_role = self._slot("roles", old_role_id)
+            if old_role is not None:
+                self._set_bit(self._user_rows, self._role_bytes, user, old_role, False)
+            self._set_bit(self._user_rows, self._role_bytes, user, self._slot("roles", new_role_id, True), True)
+        finally:
+            self._end()
+
+    def on_permission_granted(self, role_id:str, permission_id:str) -> None:
+        self._write(self._role_rows, self._permission_bytes, "roles", role_id, "permissions", permission_id, True)
+
+    def on_permission_revoked(self, role_id:str, permission_id:str) -> None:
+        self._write(self._role_rows, self._permission_bytes, "roles", role_id, "permissions", permission_id, False)
+
+    def on_permission_replaced(self, role_id:str, old_permission_id:str, new_permission_id:str) -> None:
+        """Cambia un permiso por otro en una sola generacion, sin estado intermedio visible para los lectores"""
+        self._begin()
+        try:
+            role = self._slot("roles", role_id, True)
+            old_permission = self._slot("permissions", old_permission_id)
+            if old_permission is not None:
+                self._set_bit(self._role_rows, self._permission_bytes, role, old_permission, False)
+            self._set_bit(self._role_rows, self._permission_bytes, role,
+                          self._slot("permissions", new_permission_id, True), True)
+        finally:
+            self._end()
+
+    # -------------------- Internos --------------------
+
+    def _read(self, evaluate):
+        stalled, deadline = None, 0.0
+        while True:
+            start = self.generation
+            if start & 1:
+                # El plazo corre mientras la generacion no cambie; un escritor vivo la avanza
+                if start != stalled:
+                    stalled, deadline = start, time.monotonic() + self.read_timeout
+                elif time.monotonic() > deadline:
+                    raise StalledWriterError(messages.SHARED_MATRIX_WRITER_STALLED)
+                time.sleep(0)
+                continue
+            try:
+                result = evaluate()
+            except (IndexError, UnicodeDecodeError):
+                # Lectura cruzada con una escritura a medias; se descarta y se reintenta
+                if self.generation == start:
+                    raise
+                continue
+            if self.generation == start:
+                return result
+
+    def _begin(self) -> None:
+        if not self.owner:
+            raise RuntimeError("Solo el proceso que creo la matriz puede modificarla")
+        _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, self.generation + 1)
+
+    def _end(self) -> None:
+        _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, self.generation + 1)
+
+    def _write(self, rows:int, row_bytes:int, row_kind:str, row_id:str, column_kind:str, column_id:str,
+               value:bool) -> None:
+        self._begin()
+        try:
+            row = self._slot(row_kind, row_id, value)
+            column = self._slot(column_kind, column_id, value)
+            if row is not None and column is not None:
+                self._set_bit(rows, row_bytes, row, column, value)
+        finally:
+            self._end()
+
+    def _set_bit(self, rows:int, row_bytes:int, row:int, column:int, value:bool) -> None:
+        offset = rows + row * row_bytes + (column >> 3)
+        if value:
+            self._buffer[offset] |= 1 << (column & 7)
+        else:
+            self._buffer[offset] &= ~(1 << (column & 7)) & 0xFF
+
+    def _count(self, kind:str) -> int:
+        return _COUNT.unpack_from(self._buffer, _COUNT_OFFSETS[kind])[0]
+
+    def _refresh(self, kind:str) -> None:
+        names, slots = self._names[kind], self._slots[kind]
+        base = self._names_offset[kind]
+        for slot in range(len(names), self._count(kind)):
+            offset = base + slot * NAME_SIZE
+            name = bytes(self._buffer[offset:offset + NAME_SIZE]).rstrip(b"\x00").decode()
+            names.append(name)
+            slots[name] = slot
+
+    def _slot(self, kind:str, id:str, create:bool = False) -> int | None:
+        slot = self._slots[kind].get(id)
+        if slot is None:
+            self._refresh(kind)
+            slot = self._slots[kind].get(id)
+        if slot is None and create:
+            slot = self._add_slot(kind, id)
+        return slot
+
+    def _add_slot(self, kind:str, id:str) -> int:
+        encoded = id.encode()
+        if not encoded or len(encoded) > NAME_SIZE or b"\x00" in encoded:
+            raise ValueError(f"Id invalido para la matriz compartida: {id!r}")
+        slot = self._count(kind)
+        if slot >= self._capacity[kind]:
+            raise ValueError(f"Capacidad de {kind} agotada en la matriz compartida ({self._capacity[kind]})")
+        offset = self._names_offset[kind] + slot * NAME_SIZE
+        self._buffer[offset:offset + len(encoded)] = encoded
+        # El id se escribe antes de publicar la nueva cantidad
+        _COUNT.pack_into(self._buffer, _COUNT_OFFSETS[kind], slot + 1)
+        self._names[kind].append(id)
+        self._slots[kind][id] = slot
+        return slot
+
+    def _row(self, rows:int, row_bytes:int, row:int) -> int:
+        offset = rows + row * row_bytes
+        return int.from_bytes(self._buffer[offset:offset + row_bytes], "little")
+
+    def _has_permission(self, user_id:str, permission_id:str) -> bool:
+        user = self._slot("users", user_id)
+        permission = self._slot("permissions", permission_id)
+        if user is None or permission is None:
+            return False
+        roles = self._row(self._user_rows, self._role_bytes, user)
+        byte, bit = permission >> 3, 1 << (permission & 7)
+        while roles:
+            role = (roles & -roles).bit_length() - 1
+            if self._buffer[self._role_rows + role * self._permission_bytes + byte] & bit:
+                return True
+            roles &= roles - 1
+        return False
+
+    def _user_permissions(self, user_id:str) -> frozenset[str]:
+        user = self._slot("users", user_id)
+        if user is None:
+            return frozenset()
+        roles = self._row(self._user_rows, self._role_bytes, user)
+        mask = 0
+        while roles:
+            role = (roles & -roles).bit_length() - 1
+            mask |= self._row(self._role_rows, self._permission_bytes, role)
+            roles &= roles - 1
+        self._refresh("permissions")
+        names = self._names["permissions"]
+        permissions = []
+        while mask:
+            permission = (mask & -mask).bit_length() - 1
+            permissions.append(names[permission])
+            mask &= mask - 1
+        return frozenset(permissions)
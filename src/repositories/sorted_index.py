@@ -0,0 +1,80 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+
+
+class SortedKeyIndex:
+    """Conjunto ordenado de claves para paginar por cursor.
+
+    Las claves se guardan en bloques ordenados de a lo sumo 2 * load elementos junto con el
+    maximo de cada bloque, como SortedList de sortedcontainers: insertar o borrar cuesta una
+    busqueda binaria mas mover un bloque chico, en lugar de desplazar una lista de millones.
+    """
+
+    def __init__(self, keys:Iterable = (), load:int = 1000):
+        self._load = load
+        ordered = sorted(keys)
+        self._buckets: list[list] = [ordered[i:i + load] for i in range(0, len(ordered), load)]
+        self._maxes: list = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def add(self, key) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+        else:
+            index = bisect_left(self._maxes, key)
+            if index == len(self._maxes):
+                # Claves crecientes (uuid7 recien generados) solo agregan al final del ultimo bloque
+                index -= 1
+                self._buckets[index].append(key)
+                self._maxes[index] = key
+            else:
+                insort(self._buckets[index], key)
+            bucket = self._buckets[index]
+            if len(bucket) > 2 * self._load:
+                half = bucket[self._load:]
+                del bucket[self._load:]
+                self._buckets.insert(index + 1, half)
+                self._maxes[index] = bucket[-1]
+                self._maxes.insert(index + 1, half[-1])
+        self._len += 1
+
+    def discard(self, key) -> None:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return
+        bucket = self._buckets[index]
+        position = bisect_left(bucket, key)
+        if position == len(bucket) or bucket[position] != key:
+            return
+        del bucket[position]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[index]
+            del self._maxes[index]
+        elif position == len(bucket):
+            self._maxes[index] = bucket[-1]
+
+    def after(self, key=None, limit:int = 100) -> list:
+        """Retorna hasta limit claves estrictamente mayores que key (o desde el inicio si es None)"""
+        if key is None:
+            index, position = 0, 0
+        else:
+            index = bisect_right(self._maxes, key)
+            if index == len(self._maxes):
+                return []
+            position = bisect_right(self._buckets[index], key)
+        keys: list = []
+        while index < len(self._buckets) and len(keys) < limit:
+            bucket = self._buckets[index]
+            keys.extend(bucket[position:position + limit - len(keys)])
+            index += 1
+            position = 0
+        return keys
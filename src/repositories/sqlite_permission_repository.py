@@ -0,0 +1,104 @@
+import sqlite3
+from collections.abc import Iterator
+
+from src.models.permission import Permission
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.exceptions.permission_exceptions import PermissionAlreadyExistsError, PermissionNotFoundError
+from src.constants import messages
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.versioning import check_version
+
+_COLUMNS = "id, name, description, created_at, updated_at, version"
+_INSERT = f"INSERT INTO permissions ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_SELECT_BY_NAME = f"SELECT {_COLUMNS} FROM permissions WHERE name = ?"
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM permissions ORDER BY rowid"
+_SELECT_PAGE = f"SELECT rowid, {_COLUMNS} FROM permissions WHERE rowid > ? ORDER BY rowid LIMIT ?"
+_SELECT_AFTER_ID = f"SELECT {_COLUMNS} FROM permissions WHERE id > ? ORDER BY id LIMIT ?"
+_UPDATE_DESCRIPTION = "UPDATE permissions SET description = ?, updated_at = ?, version = ? WHERE name = ? AND version = ?"
+_DELETE = "DELETE FROM permissions WHERE name = ?"
+
+
+class SQLitePermissionRepository():
+    """Implementacion de PermissionRepository sobre SQLite, con la misma interfaz publica"""
+    blocking_io = True
+
+    def __init__(self, pool:SQLitePool | None = None):
+        self.pool = pool or SQLitePool()
+
+    @staticmethod
+    def _to_permission(row:tuple) -> Permission:
+        id, name, description, created_at, updated_at, version = row
+        return Permission.restore(id, name, description, from_epoch_micros(created_at), from_epoch_micros(updated_at),
+                                  version)
+
+    def add(self, permission:Permission) -> Permission:
+        """Agrega un nuevo permiso, retorna el permiso creado o una excepcion si ya se encontraba registrado"""
+        try:
+            with self.pool.connection() as connection:
+                connection.execute(_INSERT, (permission.id, permission.name, permission.description,
+                                             to_epoch_micros(permission.created_at), to_epoch_micros(permission.updated_at),
+                                             permission.version))
+        except sqlite3.IntegrityError as error:
+            raise PermissionAlreadyExistsError(messages.PERMISSION_ALREADY_EXISTS) from error
+        return permission
+
+    def find(self, name:str) -> Permission | None:
+        """Busca un permiso por el nombre, retorna el permiso o None en caso de no encontrarlo"""
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_BY_NAME, (name.strip().lower(),)).fetchone()
+        return None if row is None else self._to_permission(row)
+
+    def get(self, name:str) -> Permission:
+        """Obtiene un permiso usando el nombre, retorna una excepcion en caso de no existir"""
+        permission = self.find(name)
+        if not permission:
+            raise PermissionNotFoundError(messages.PERMISSION_NOT_FOUND)
+        return permission
+
+    def get_all(self) -> list[Permission]:
+        """Obtiene todos los permisos registrados"""
+        with self.pool.connection() as connection:
+            return [self._to_permission(row) for row in connection.execute(_SELECT_ALL)]
+
+    def iter_all(self, chunk_size:int = 1000) -> Iterator[Permission]:
+        """Itera los permisos por paginas de rowid sin retener una conexion del pool entre paginas"""
+        last_rowid = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(_SELECT_PAGE, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                return
+            for _, *row in rows:
+                yield self._to_permission(row)
+            last_rowid = rows[-1][0]
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[Permission]:
+        """Pagina por cursor: hasta limit permisos con id mayor que after, en orden de id (usa la clave primaria)"""
+        with self.pool.connection() as connection:
+            return [self._to_permission(row) for row in connection.execute(_SELECT_AFTER_ID, (after or "", limit))]
+
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Permission:
+        """Actualiza la descripción de un permiso, retorna el permiso actualizado.
+
+        Se escribe solo si la fila sigue en la version leida; si no, se vuelve a leer y se reintenta
+        (o falla con VersionConflictError si se indico expected_version).
+        """
+        while True:
+            permission = self.get(name)
+            check_version(permission, expected_version)
+            read_version = permission.version
+            permission.update_description(new_description)
+            with self.pool.connection() as connection:
+                updated = connection.execute(_UPDATE_DESCRIPTION, (permission.description,
+                                                                   to_epoch_micros(permission.updated_at),
+                                                                   permission.version, permission.name,
+                                                                   read_version)).rowcount
+            if updated:
+                return permission
+
+    def delete(self, name:str)-> None:
+        """Elimina un permiso registrado"""
+        with self.pool.connection() as connection:
+            deleted = connection.execute(_DELETE, (name.strip().lower(),)).rowcount
+        if not deleted:
+            raise PermissionNotFoundError(messages.PERMISSION_NOT_FOUND)
@@ -0,0 +1,107 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS roles (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS permissions (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS user_roles (
+    user_id TEXT NOT NULL,
+    role_id TEXT NOT NULL,
+    UNIQUE (user_id, role_id)
+);
+CREATE INDEX IF NOT EXISTS idx_user_roles_role ON user_roles (role_id, user_id);
+CREATE TABLE IF NOT EXISTS role_permissions (
+    role_id TEXT NOT NULL,
+    permission_id TEXT NOT NULL,
+    UNIQUE (role_id, permission_id)
+);
+CREATE INDEX IF NOT EXISTS idx_role_permissions_permission ON role_permissions (permission_id, role_id);
+"""
+
+# Columnas agregadas despues de la primera version del esquema, para migrar bases existentes
+MIGRATIONS = (
+    ("users", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("roles", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("permissions", "version", "INTEGER NOT NULL DEFAULT 1"),
+)
+
+class SQLitePool:
+    """Pool pequeño de conexiones SQLite compartidas entre hilos.
+
+    Las bases en archivo usan WAL, lo que permite lecturas concurrentes con un escritor.
+    Con path=":memory:" el pool tiene una unica conexion que los hilos usan por turnos: con
+    cache compartida entre varias conexiones SQLite responde SQLITE_LOCKED ("database table
+    is locked") sin respetar el timeout, y las escrituras concurrentes fallarian. Cada
+    conexion mantiene su propia cache de sentencias preparadas (cached_statements).
+    """
+
+    def __init__(self, path:str = ":memory:", size:int = 4, cached_statements:int = 128):
+        self._target = path
+        self._memory = path == ":memory:"
+        self.size = 1 if self._memory else size
+        self._cached_statements = cached_statements
+        self._connections: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        for _ in range(self.size):
+            connection = self._connect()
+            self._all.append(connection)
+            self._connections.put(connection)
+        with self.connection() as connection:
+            connection.executescript(SCHEMA)
+            self._migrate(connection)
+
+    @staticmethod
+    def _migrate(connection:sqlite3.Connection) -> None:
+        for table, column, definition in MIGRATIONS:
+            columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._target, check_same_thread=False,
+                                     cached_statements=self._cached_statements, timeout=30)
+        if not self._memory:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """Presta una conexion del pool; el bloque corre en una transaccion que se confirma al salir"""
+        connection = self._connections.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        for connection in self._all:
+            connection.close()
+        self._all.clear()
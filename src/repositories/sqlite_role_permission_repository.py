@@ -0,0 +1,91 @@
+import sqlite3
+from collections.abc import Iterator
+
+from src.models.role_permission import RolePermission
+from src.repositories.sqlite_pool import SQLitePool
+from src.exceptions.relation_exceptions import RelationValidationError
+
+_INSERT = "INSERT INTO role_permissions (role_id, permission_id) VALUES (?, ?)"
+_EXISTS = "SELECT 1 FROM role_permissions WHERE role_id = ? AND permission_id = ?"
+_SELECT_ALL = "SELECT role_id, permission_id FROM role_permissions ORDER BY rowid"
+_SELECT_PAGE = "SELECT rowid, role_id, permission_id FROM role_permissions WHERE rowid > ? ORDER BY rowid LIMIT ?"
+_SELECT_AFTER_KEY = ("SELECT role_id, permission_id FROM role_permissions WHERE (role_id, permission_id) > (?, ?) "
+                     "ORDER BY role_id, permission_id LIMIT ?")
+_SELECT_BY_ROLE = "SELECT role_id, permission_id FROM role_permissions WHERE role_id = ? ORDER BY rowid"
+_SELECT_BY_PERMISSION = "SELECT role_id, permission_id FROM role_permissions WHERE permission_id = ? ORDER BY rowid"
+_UPDATE_PERMISSION = "UPDATE role_permissions SET permission_id = ? WHERE role_id = ? AND permission_id = ?"
+_DELETE = "DELETE FROM role_permissions WHERE role_id = ? AND permission_id = ?"
+
+
+class SQLiteRolePermissionRepository:
+    """Implementacion de RolePermissionRepository sobre SQLite, con la misma interfaz publica"""
+    blocking_io = True
+
+    def __init__(self, pool: SQLitePool | None = None):
+        self.pool = pool or SQLitePool()
+
+    def add(self, relation: RolePermission):
+        try:
+            with self.pool.connection() as connection:
+                connection.execute(_INSERT, (relation.role_id, relation.permission_id))
+        except sqlite3.IntegrityError as error:
+            raise RelationValidationError("La relación ya existe") from error
+
+    def find(self, role_id: str, permission_id: str) -> RolePermission | None:
+        if self.role_has_permission(role_id, permission_id):
+            return RolePermission(role_id, permission_id)
+        return None
+
+    def role_has_permission(self, role_id: str, permission_id: str) -> bool:
+        with self.pool.connection() as connection:
+            return connection.execute(_EXISTS, (role_id, permission_id)).fetchone() is not None
+
+    def get_all(self) -> list[RolePermission]:
+        with self.pool.connection() as connection:
+            return [RolePermission(*row) for row in connection.execute(_SELECT_ALL)]
+
+    def iter_all(self, chunk_size:int = 1000) -> Iterator[RolePermission]:
+        """Itera las relaciones por paginas de rowid sin retener una conexion del pool entre paginas"""
+        last_rowid = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(_SELECT_PAGE, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                return
+            for _, *row in rows:
+                yield RolePermission(*row)
+            last_rowid = rows[-1][0]
+
+    def get_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[RolePermission]:
+        """Pagina por cursor ordenada por (role_id, permission_id), usando el indice UNIQUE del par"""
+        role_id, permission_id = after or ("", "")
+        with self.pool.connection() as connection:
+            return [RolePermission(*row) for row in connection.execute(_SELECT_AFTER_KEY, (role_id, permission_id, limit))]
+
+    def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
+        with self.pool.connection() as connection:
+            return [RolePermission(*row) for row in connection.execute(_SELECT_BY_ROLE, (role_id,))]
+
+    def get_roles_by_permission(self, permission_id: str) -> list[RolePermission]:
+        with self.pool.connection() as connection:
+            return [RolePermission(*row) for row in connection.execute(_SELECT_BY_PERMISSION, (permission_id,))]
+
+    def update_permission_relation(self, role_id: str, permission_id: str, new_permission: str) -> RolePermission:
+        if permission_id == new_permission:
+            if not self.role_has_permission(role_id, permission_id):
+                raise RelationValidationError("El rol no cuenta con ese permiso")
+            raise RelationValidationError("El rol ya cuenta con ese permiso")
+        try:
+            with self.pool.connection() as connection:
+                updated = connection.execute(_UPDATE_PERMISSION, (new_permission, role_id, permission_id)).rowcount
+        except sqlite3.IntegrityError as error:
+            raise RelationValidationError("La relación ya existe") from error
+        if not updated:
+            raise RelationValidationError("El rol no cuenta con ese permiso")
+        return RolePermission(role_id, new_permission)
+
+    def delete(self, role_id: str, permission_id: str) -> None:
+        with self.pool.connection() as connection:
+            deleted = connection.execute(_DELETE, (role_id, permission_id)).rowcount
+        if not deleted:
+            raise RelationValidationError("El rol no cuenta con ese permiso")
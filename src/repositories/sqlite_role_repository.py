@@ -0,0 +1,102 @@
+import sqlite3
+from collections.abc import Iterator
+
+from src.models.role import Role
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.exceptions.role_exceptions import RoleAlreadyExistsError, RoleNotFoundError
+from src.constants import messages
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.versioning import check_version
+
+_COLUMNS = "id, name, description, created_at, updated_at, version"
+_INSERT = f"INSERT INTO roles ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_SELECT_BY_NAME = f"SELECT {_COLUMNS} FROM roles WHERE name = ?"
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM roles ORDER BY rowid"
+_SELECT_PAGE = f"SELECT rowid, {_COLUMNS} FROM roles WHERE rowid > ? ORDER BY rowid LIMIT ?"
+_SELECT_AFTER_ID = f"SELECT {_COLUMNS} FROM roles WHERE id > ? ORDER BY id LIMIT ?"
+_UPDATE_DESCRIPTION = "UPDATE roles SET description = ?, updated_at = ?, version = ? WHERE name = ? AND version = ?"
+_DELETE = "DELETE FROM roles WHERE name = ?"
+
+
+class SQLiteRoleRepository():
+    """Implementacion de RoleRepository sobre SQLite, con la misma interfaz publica"""
+    blocking_io = True
+
+    def __init__(self, pool:SQLitePool | None = None):
+        self.pool = pool or SQLitePool()
+
+    @staticmethod
+    def _to_role(row:tuple) -> Role:
+        id, name, description, created_at, updated_at, version = row
+        return Role.restore(id, name, description, from_epoch_micros(created_at), from_epoch_micros(updated_at),
+                            version)
+
+    def add(self, role:Role) -> Role:
+        """Agrega un nuevo rol, retorna el rol creado o una excepcion si ya se encontraba registrado"""
+        try:
+            with self.pool.connection() as connection:
+                connection.execute(_INSERT, (role.id, role.name, role.description,
+                                             to_epoch_micros(role.created_at), to_epoch_micros(role.updated_at),
+                                             role.version))
+        except sqlite3.IntegrityError as error:
+            raise RoleAlreadyExistsError(messages.ROLE_ALREADY_EXISTS) from error
+        return role
+
+    def find(self, name:str) -> Role | None:
+        """Busca un rol por el nombre, retorna el rol o None en caso de no encontrarlo"""
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_BY_NAME, (name.strip().lower(),)).fetchone()
+        return None if row is None else self._to_role(row)
+
+    def get(self, name:str) -> Role:
+        """Obtiene un rol usando el nombre, retorna una excepcion en caso de no existir"""
+        role = self.find(name)
+        if not role:
+            raise RoleNotFoundError(messages.ROLE_NOT_FOUND)
+        return role
+
+    def get_all(self) -> list[Role]:
+        """Obtiene todos los roles registrados"""
+        with self.pool.connection() as connection:
+            return [self._to_role(row) for row in connection.execute(_SELECT_ALL)]
+
+    def iter_all(self, chunk_size:int = 1000) -> Iterator[Role]:
+        """Itera los roles por paginas de rowid sin retener una conexion del pool entre paginas"""
+        last_rowid = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(_SELECT_PAGE, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                return
+            for _, *row in rows:
+                yield self._to_role(row)
+            last_rowid = rows[-1][0]
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[Role]:
+        """Pagina por cursor: hasta limit roles con id mayor que after, en orden de id (usa la clave primaria)"""
+        with self.pool.connection() as connection:
+            return [self._to_role(row) for row in connection.execute(_SELECT_AFTER_ID, (after or "", limit))]
+
+    def update_description(self, name:str, new_description:str, expected_version:int | None = None) -> Role:
+        """Actualiza la descripción de un rol, retorna el rol actualizado.
+
+        Se escribe solo si la fila sigue en la version leida; si no, se vuelve a leer y se reintenta
+        (o falla con VersionConflictError si se indico expected_version).
+        """
+        while True:
+            role = self.get(name)
+            check_version(role, expected_version)
+            read_version = role.version
+            role.update_description(new_description)
+            with self.pool.connection() as connection:
+                updated = connection.execute(_UPDATE_DESCRIPTION, (role.description, to_epoch_micros(role.updated_at),
+                                                                   role.version, role.name, read_version)).rowcount
+            if updated:
+                return role
+
+    def delete(self, name:str)-> None:
+        """Elimina un rol registrado"""
+        with self.pool.connection() as connection:
+            deleted = connection.execute(_DELETE, (name.strip().lower(),)).rowcount
+        if not deleted:
+            raise RoleNotFoundError(messages.ROLE_NOT_FOUND)
@@ -0,0 +1,178 @@
+import sqlite3
+from collections.abc import Iterator
+
+from src.models.user import User
+from src.models.user_status import UserStatus
+from src.models.compact import to_epoch_micros, from_epoch_micros
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.versioning import check_version
+
+_COLUMNS = "id, username, email, password, status, created_at, updated_at, version"
+_INSERT = ("INSERT INTO users (id, username, email, email_key, password, status, created_at, updated_at, version) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_SELECT_BY_USERNAME = f"SELECT {_COLUMNS} FROM users WHERE username = ?"
+_SELECT_BY_EMAIL = f"SELECT {_COLUMNS} FROM users WHERE email_key = ?"
+_SELECT_ALL = f"SELECT {_COLUMNS} FROM users ORDER BY rowid"
+_SELECT_PAGE = f"SELECT rowid, {_COLUMNS} FROM users WHERE rowid > ? ORDER BY rowid LIMIT ?"
+_SELECT_AFTER_ID = f"SELECT {_COLUMNS} FROM users WHERE id > ? ORDER BY id LIMIT ?"
+_EXISTS_USERNAME = "SELECT 1 FROM users WHERE username = ?"
+# Cada UPDATE solo aplica si la fila sigue en la version leida (control de concurrencia optimista)
+_UPDATE_USERNAME = "UPDATE users SET username = ?, updated_at = ?, version = ? WHERE username = ? AND version = ?"
+_UPDATE_EMAIL = ("UPDATE users SET email = ?, email_key = ?, updated_at = ?, version = ? "
+                 "WHERE username = ? AND version = ?")
+_UPDATE_PASSWORD = "UPDATE users SET password = ?, updated_at = ?, version = ? WHERE username = ? AND version = ?"
+_UPDATE_STATUS = "UPDATE users SET status = ?, updated_at = ?, version = ? WHERE username = ? AND version = ?"
+_DELETE = "DELETE FROM users WHERE username = ?"
+
+
+class SQLiteUserRepository():
+    """Implementacion de UserRepository sobre SQLite, con la misma interfaz publica"""
+    blocking_io = True
+
+    def __init__(self, pool:SQLitePool | None = None):
+        self.pool = pool or SQLitePool()
+
+    @staticmethod
+    def _normalize_email(email:str) -> str:
+        return email.strip().lower()
+
+    @staticmethod
+    def _to_user(row:tuple) -> User:
+        id, username, email, password, status, created_at, updated_at, version = row
+        return User.restore(id, username, email, password, UserStatus(status),
+                            from_epoch_micros(created_at), from_epoch_micros(updated_at), version)
+
+    def _params(self, user:User) -> tuple:
+        return (user.id, user.username, user.email, self._normalize_email(user.email), user.password,
+                UserStatus(user.status).value, to_epoch_micros(user.created_at), to_epoch_micros(user.updated_at),
+                user.version)
+
+    def _raise_conflict(self, error:sqlite3.IntegrityError):
+        if "email_key" in str(error):
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED) from error
+        raise UserValidationError(messages.USER_ALREADY_EXISTS) from error
+
+    def _check_username_free(self, connection:sqlite3.Connection, username:str) -> None:
+        """SQLite informa una sola restriccion violada; el username se valida primero como en UserRepository"""
+        if connection.execute(_EXISTS_USERNAME, (username,)).fetchone():
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
+
+    def add(self, user:User) -> User:
+        """Agrega un nuevo usuario al repositorio, retorna el usuario agregado"""
+        try:
+            with self.pool.connection() as connection:
+                self._check_username_free(connection, user.username)
+                connection.execute(_INSERT, self._params(user))
+        except sqlite3.IntegrityError as error:
+            self._raise_conflict(error)
+        return user
+
+    def add_many(self, users:list[User]) -> list[User]:
+        """Agrega un lote de usuarios en una sola transaccion"""
+        try:
+            with self.pool.connection() as connection:
+                connection.executemany(_INSERT, (self._params(user) for user in users))
+        except sqlite3.IntegrityError as error:
+            self._raise_conflict(error)
+        return users
+
+    def find(self, username:str) -> User | None:
+        """Busca un usuario por username, retorna el usuario o None si no existe"""
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_BY_USERNAME, (username.strip(),)).fetchone()
+        return None if row is None else self._to_user(row)
+
+    def find_by_email(self, email:str) -> User | None:
+        """Busca un usuario por email, retorna el usuario o None si no existe"""
+        if not email:
+            return None
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_BY_EMAIL, (self._normalize_email(email),)).fetchone()
+        return None if row is None else self._to_user(row)
+
+    def get(self, username:str) -> User:
+        """Obtiene un usuario por username, lanza una excepcion si no existe"""
+        user = self.find(username)
+        if not user:
+            raise UserNotFoundError(messages.USER_NOT_FOUND)
+        return user
+
+    def get_all(self) -> list[User]:
+        """Obtiene todos los usuarios"""
+        with self.pool.connection() as connection:
+            return [self._to_user(row) for row in connection.execute(_SELECT_ALL)]
+
+    def iter_all(self, chunk_size:int = 1000) -> Iterator[User]:
+        """Itera los usuarios por paginas de rowid sin retener una conexion del pool entre paginas"""
+        last_rowid = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(_SELECT_PAGE, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                return
+            for _, *row in rows:
+                yield self._to_user(row)
+            last_rowid = rows[-1][0]
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[User]:
+        """Pagina por cursor: hasta limit usuarios con id mayor que after, en orden de id (usa la clave primaria)"""
+        with self.pool.connection() as connection:
+            return [self._to_user(row) for row in connection.execute(_SELECT_AFTER_ID, (after or "", limit))]
+
+    def _update(self, username:str, expected_version:int | None, apply, statement:str, values) -> User:
+        """Lee el usuario, aplica el cambio en el modelo y lo escribe solo si la fila no cambio entretanto.
+
+        Si otra escritura se adelanto se vuelve a leer: sin expected_version el cambio se reintenta
+        sobre la fila nueva; con expected_version la nueva lectura falla con VersionConflictError.
+        """
+        while True:
+            user = self.get(username)
+            check_version(user, expected_version)
+            read_version = user.version
+            apply(user)
+            try:
+                with self.pool.connection() as connection:
+                    updated = connection.execute(statement, (*values(user), user.version, username.strip(),
+                                                             read_version)).rowcount
+            except sqlite3.IntegrityError as error:
+                self._raise_conflict(error)
+            if updated:
+                return user
+
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
+        """Actualiza el username de un usuario, retorna el usuario actualizado"""
+        return self._update(username, expected_version, lambda user: user.update_username(new_username),
+                            _UPDATE_USERNAME, lambda user: (user.username, to_epoch_micros(user.updated_at)))
+
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
+        """Actualiza el email de un usuario, retorna el usuario actualizado"""
+        return self._update(username, expected_version, lambda user: user.update_email(new_email), _UPDATE_EMAIL,
+                            lambda user: (user.email, self._normalize_email(user.email),
+                                          to_epoch_micros(user.updated_at)))
+
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
+        """Actualiza la contraseña del usuario"""
+        return self._update(username, expected_version, lambda user: user.update_password(new_password),
+                            _UPDATE_PASSWORD, lambda user: (user.password, to_epoch_micros(user.updated_at)))
+
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
+        """Actualiza el estado de un usuario, retorna el usuario actualizado"""
+        if new_status not in UserStatus.list():
+            raise ValueError("Estado invalido")
+        actions = {
+            UserStatus.ACTIVE:User.activate,
+            UserStatus.INACTIVE:User.deactivate,
+            UserStatus.SUSPENDED:User.suspend,
+            UserStatus.BLOCKED:User.block
+        }
+        return self._update(username, expected_version, actions[UserStatus(new_status)], _UPDATE_STATUS,
+                            lambda user: (user.status.value, to_epoch_micros(user.updated_at)))
+
+    def delete(self, username:str) -> None:
+        """Elimina un usuario del repositorio"""
+        with self.pool.connection() as connection:
+            deleted = connection.execute(_DELETE, (username.strip(),)).rowcount
+        if not deleted:
+            raise UserNotFoundError(messages.USER_NOT_FOUND)
@@ -0,0 +1,87 @@
+import sqlite3
+from collections.abc import Iterator
+
+from src.models.user_role import UserRole
+from src.repositories.sqlite_pool import SQLitePool
+from src.exceptions.relation_exceptions import RelationValidationError
+
+_INSERT = "INSERT INTO user_roles (user_id, role_id) VALUES (?, ?)"
+_EXISTS = "SELECT 1 FROM user_roles WHERE user_id = ? AND role_id = ?"
+_SELECT_ALL = "SELECT user_id, role_id FROM user_roles ORDER BY rowid"
+_SELECT_PAGE = "SELECT rowid, user_id, role_id FROM user_roles WHERE rowid > ? ORDER BY rowid LIMIT ?"
+_SELECT_AFTER_KEY = ("SELECT user_id, role_id FROM user_roles WHERE (user_id, role_id) > (?, ?) "
+                     "ORDER BY user_id, role_id LIMIT ?")
+_SELECT_BY_USER = "SELECT user_id, role_id FROM user_roles WHERE user_id = ? ORDER BY rowid"
+_SELECT_BY_ROLE = "SELECT user_id, role_id FROM user_roles WHERE role_id = ? ORDER BY rowid"
+_UPDATE_ROLE = "UPDATE user_roles SET role_id = ? WHERE user_id = ? AND role_id = ?"
+_DELETE = "DELETE FROM user_roles WHERE user_id = ? AND role_id = ?"
+
+
+class SQLiteUserRoleRepository():
+    """Implementacion de UserRoleRepository sobre SQLite, con la misma interfaz publica"""
+    blocking_io = True
+
+    def __init__(self, pool:SQLitePool | None = None):
+        self.pool = pool or SQLitePool()
+
+    def add(self, relation:UserRole):
+        try:
+            with self.pool.connection() as connection:
+                connection.execute(_INSERT, (relation.user_id, relation.role_id))
+        except sqlite3.IntegrityError as error:
+            raise RelationValidationError("Relacion ya existe") from error
+
+    def find(self, user_id:str, role_id:str) -> UserRole | None:
+        with self.pool.connection() as connection:
+            row = connection.execute(_EXISTS, (user_id, role_id)).fetchone()
+        return None if row is None else UserRole(user_id, role_id)
+
+    def get_all(self) -> list[UserRole]:
+        with self.pool.connection() as connection:
+            return [UserRole(*row) for row in connection.execute(_SELECT_ALL)]
+
+    def iter_all(self, chunk_size:int = 1000) -> Iterator[UserRole]:
+        """Itera las relaciones por paginas de rowid sin retener una conexion del pool entre paginas"""
+        last_rowid = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(_SELECT_PAGE, (last_rowid, chunk_size)).fetchall()
+            if not rows:
+                return
+            for _, *row in rows:
+                yield UserRole(*row)
+            last_rowid = rows[-1][0]
+
+    def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[UserRole]:
+        """Pagina por cursor ordenada por (user_id, role_id), usando el indice UNIQUE del par"""
+        user_id, role_id = after or ("", "")
+        with self.pool.connection() as connection:
+            return [UserRole(*row) for row in connection.execute(_SELECT_AFTER_KEY, (user_id, role_id, limit))]
+
+    def get_roles_by_user(self, user_id:str) -> list[UserRole]:
+        with self.pool.connection() as connection:
+            return [UserRole(*row) for row in connection.execute(_SELECT_BY_USER, (user_id,))]
+
+    def get_users_by_role(self, role_id:str) -> list[UserRole]:
+        with self.pool.connection() as connection:
+            return [UserRole(*row) for row in connection.execute(_SELECT_BY_ROLE, (role_id,))]
+
+    def update_role_relation(self, user_id:str, role_id:str, new_role:str) -> UserRole:
+        if role_id == new_role:
+            if self.find(user_id, role_id) is None:
+                raise RelationValidationError("El usuario no cuenta con ese permiso")
+            raise RelationValidationError("El usuario ya cuenta con ese rol")
+        try:
+            with self.pool.connection() as connection:
+                updated = connection.execute(_UPDATE_ROLE, (new_role, user_id, role_id)).rowcount
+        except sqlite3.IntegrityError as error:
+            raise RelationValidationError("Relacion ya existe") from error
+        if not updated:
+            raise RelationValidationError("El usuario no cuenta con ese permiso")
+        return UserRole(user_id, new_role)
+
+    def delete(self, user_id:str,role_id:str) -> None:
+        with self.pool.connection() as connection:
+            deleted = connection.execute(_DELETE, (user_id, role_id)).rowcount
+        if not deleted:
+            raise RelationValidationError("El usuario no cuenta con ese permiso")
@@ -1,31 +1,65 @@
+from collections.abc import Iterator
 from src.models.user import User
 from src.constants import messages
 from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
 from src.models.user_status import UserStatus
+from src.repositories.sorted_index import SortedKeyIndex
+from src.repositories.versioning import check_version
 
 
 class UserRepository():
     def __init__(self):
         self._data: dict[str, User] = {}
+        self._email_index: dict[str, User] = {}
+        self._by_id: dict[str, User] = {}
+        self._ids = SortedKeyIndex()
+
+    @staticmethod
+    def _normalize_email(email:str) -> str:
+        return email.strip().lower()
 
     #TODO: Se debe modificar para que retorne un User
     def add(self, user:User) -> User:
         """Agrega un nuevo usuario al repositorio, retorna el usuario agregado"""
         if user.username in self._data:
             raise UserValidationError(messages.USER_ALREADY_EXISTS)
+        email_key = self._normalize_email(user.email)
+        if email_key in self._email_index:
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
         self._data[user.username] = user
+        self._email_index[email_key] = user
+        self._by_id[user.id] = user
+        self._ids.add(user.id)
         return self._data[user.username]
 
+    def add_many(self, users:list[User]) -> list[User]:
+        """Agrega un lote de usuarios de forma atomica: si alguno choca no se inserta ninguno"""
+        usernames: set[str] = set()
+        email_keys: set[str] = set()
+        for user in users:
+            email_key = self._normalize_email(user.email)
+            if user.username in self._data or user.username in usernames:
+                raise UserValidationError(messages.USER_ALREADY_EXISTS)
+            if email_key in self._email_index or email_key in email_keys:
+                raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+            usernames.add(user.username)
+            email_keys.add(email_key)
+        for user in users:
+            self._data[user.username] = user
+            self._email_index[self._normalize_email(user.email)] = user
+            self._by_id[user.id] = user
+            self._ids.add(user.id)
+        return users
+
     def find(self, username:str) -> User | None:
         """Busca un usuario por username, retorna el usuario o None si no existe"""
         return self._data.get(username.strip())
 
     def find_by_email(self, email:str) -> User | None:
         """Busca un usuario por email, retorna el usuario o None si no existe"""
-        for user in self._data.values():
-            if user.email == email:
-                return user
-        return None
+        if not email:
+            return None
+        return self._email_index.get(self._normalize_email(email))
 
     def get(self, username:str) -> User:
         """Obtiene un usuario por username, lanza una excepcion si no existe"""
@@ -38,32 +72,54 @@ class UserRepository():
         """Obtiene todos los usuarios"""
         all_users = list(self._data.values())
         return all_users
+
+    def iter_all(self) -> Iterator[User]:
+        """Itera los usuarios sin copiar la coleccion; el repositorio no debe modificarse mientras tanto"""
+        yield from self._data.values()
+
+    def get_page(self, after:str | None = None, limit:int = 100) -> list[User]:
+        """Pagina por cursor: hasta limit usuarios con id mayor que after, en orden de id (uuid7, orden de creacion)"""
+        return [self._by_id[id] for id in self._ids.after(after, limit)]
         
-    def update_username(self, username:str, new_username:str) -> User:
+    def update_username(self, username:str, new_username:str, expected_version:int | None = None) -> User:
         """Actualiza el username de un usuario, retorna el usuario o una exception en caso de no existir"""
         user = self.get(username)
-        del self._data[username]
+        check_version(user, expected_version)
+        if new_username in self._data:
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
         user.update_username(new_username)
+        del self._data[username]
         self._data[user.username] = user
+        self._email_index[self._normalize_email(user.email)] = user
         return user
 
-    def update_email(self, username:str, new_email:str) -> User:
+    def update_email(self, username:str, new_email:str, expected_version:int | None = None) -> User:
         """Actualiza el email de un usuario, retorna el usuario actualizado"""
         user = self.get(username)
+        check_version(user, expected_version)
+        old_key = self._normalize_email(user.email)
+        new_key = self._normalize_email(new_email)
+        owner = self._email_index.get(new_key)
+        if owner is not None and owner is not user:
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
         user.update_email(new_email)
+        del self._email_index[old_key]
+        self._email_index[new_key] = user
         self._data[user.username] = user
         return user
 
-    def update_password(self, username:str, new_password:str) -> User:
+    def update_password(self, username:str, new_password:str, expected_version:int | None = None) -> User:
         """Actualiza la contraseña del usuario"""
         user = self.get(username)
+        check_version(user, expected_version)
         user.update_password(new_password)
         self._data[user.username] = user
         return user
 
-    def update_status(self, username:str, new_status:UserStatus) -> User:
+    def update_status(self, username:str, new_status:UserStatus, expected_version:int | None = None) -> User:
         """Actualiza el estado de un usuario, retorna el usuario o una Excepcion en caso de que se ingrese un estado no válido"""
         user = self.get(username)
+        check_version(user, expected_version)
         #TODO:Crear mensajes y excepciones personalizadas para en casos de errores con estatus
         if new_status not in UserStatus.list():
             raise ValueError("Estado invalido") 
@@ -80,6 +136,9 @@ class UserRepository():
 
     def delete(self, username:str)-> None:
         """Elimina un usuario del repositorio"""
-        self.get(username)
+        user = self.get(username)
         del self._data[username]
+        self._email_index.pop(self._normalize_email(user.email), None)
+        del self._by_id[user.id]
+        self._ids.discard(user.id)
  
@@ -1,47 +1,79 @@
+from collections.abc import Iterator
 from src.models.user_role import UserRole
+from src.repositories.sorted_index import SortedKeyIndex
+from src.exceptions.relation_exceptions import RelationValidationError
 
 
 class UserRoleRepository():
     def __init__(self):
-        self._relations : list[UserRole] = []
-    
-    def add(self, relation:UserRole):
-        if self.find(relation.user_id, relation.role_id):
-            raise ValueError("Relacion ya existe")
-        self._relations.append(relation)
+        self._relations: dict[tuple[str, str], UserRole] = {}
+        self._keys = SortedKeyIndex()
+        self._roles_by_user: dict[str, dict[str, UserRole]] = {}
+        self._users_by_role: dict[str, dict[str, UserRole]] = {}
 
+    def add(self, relation:UserRole):
+        key = (relation.user_id, relation.role_id)
+        if key in self._relations:
+            raise RelationValidationError("Relacion ya existe")
+        self._link(relation)
 
     def find(self, user_id:str, role_id:str) -> UserRole | None:
-        for relation in self._relations:
-            if relation.user_id == user_id and relation.role_id == role_id:
-                return relation
-        return None
-    
+        return self._relations.get((user_id, role_id))
+
     def get_all(self) -> list[UserRole]:
-        return self._relations
+        return list(self._relations.values())
+
+    def iter_all(self) -> Iterator[UserRole]:
+        yield from self._relations.values()
+
+    def get_page(self, after:tuple[str, str] | None = None, limit:int = 100) -> list[UserRole]:
+        """Pagina por cursor ordenada por (user_id, role_id); after es el par de la ultima relacion recibida"""
+        return [self._relations[key] for key in self._keys.after(after, limit)]
 
     #TODO: Considerar respuestas al buscar un usuario inexistente, actualmente retornaria vacio
     def get_roles_by_user(self, user_id:str) -> list[UserRole]:
-        return [relation for relation in self._relations if relation.user_id == user_id]
-    
+        return list(self._roles_by_user.get(user_id, {}).values())
+
     def get_users_by_role(self, role_id:str) -> list[UserRole]:
-        return [relation for relation in self._relations if relation.role_id == role_id]
-    
+        return list(self._users_by_role.get(role_id, {}).values())
+
     def update_role_relation(self, user_id:str, role_id:str, new_role:str) -> UserRole:
         old_relation = self.find(user_id, role_id)
         if not old_relation:
-            raise ValueError("El usuario no cuenta con ese permiso")
+            raise RelationValidationError("El usuario no cuenta con ese permiso")
         if old_relation.role_id == new_role:
-            raise ValueError("El usuario ya cuenta con ese rol")
+            raise RelationValidationError("El usuario ya cuenta con ese rol")
+        if (user_id, new_role) in self._relations:
+            raise RelationValidationError("Relacion ya existe")
         new_relation = UserRole(user_id, new_role)
-        index = self._relations.index(old_relation)
-        self._relations[index] = new_relation
+        self._unlink(old_relation)
+        self._link(new_relation)
         return new_relation
-    
-    #TODO: refactorizar
+
     def delete(self, user_id:str,role_id:str) -> None:
         relation = self.find(user_id, role_id)
         if not relation:
-            raise ValueError("El usuario no cuenta con ese permiso")
-        self._relations.remove(relation)
+            raise RelationValidationError("El usuario no cuenta con ese permiso")
+        self._unlink(relation)
+
+    def _link(self, relation:UserRole) -> None:
+        """Registra la relacion en el conjunto de pares y en ambos indices"""
+        key = (relation.user_id, relation.role_id)
+        self._relations[key] = relation
+        self._keys.add(key)
+        self._roles_by_user.setdefault(relation.user_id, {})[relation.role_id] = relation
+        self._users_by_role.setdefault(relation.role_id, {})[relation.user_id] = relation
 
+    def _unlink(self, relation:UserRole) -> None:
+        """Elimina la relacion de los indices, descartando los grupos que quedan vacios"""
+        key = (relation.user_id, relation.role_id)
+        del self._relations[key]
+        self._keys.discard(key)
+        roles = self._roles_by_user[relation.user_id]
+        del roles[relation.role_id]
+        if not roles:
+            del self._roles_by_user[relation.user_id]
+        users = self._users_by_role[relation.role_id]
+        del users[relation.user_id]
+        if not users:
+            del self._users_by_role[relation.role_id]
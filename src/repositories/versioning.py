@@ -0,0 +1,11 @@
+from src.constants import messages
+from src.exceptions.concurrency_exceptions import VersionConflictError
+
+
+def check_version(entity, expected_version:int | None) -> None:
+    """Control de concurrencia optimista: falla si la entidad ya no esta en la version esperada.
+
+    expected_version=None conserva el comportamiento anterior (sobrescribir sin comprobar).
+    """
+    if expected_version is not None and entity.version != expected_version:
+        raise VersionConflictError(messages.VERSION_CONFLICT, expected_version, entity.version)
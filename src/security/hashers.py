@@ -0,0 +1,183 @@
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+
+import bcrypt
+
+
+def _b64encode(data:bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+def _b64decode(data:str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+def _parse_params(params:str) -> dict[str, int]:
+    return {key: int(value) for key, value in (item.split("=") for item in params.split(","))}
+
+
+class PasswordHasher(ABC):
+    """Interfaz comun de los algoritmos de hashing de contraseñas"""
+    algorithm = ""
+
+    @abstractmethod
+    def hash(self, password:str) -> str: ...
+
+    @abstractmethod
+    def verify(self, password:str, password_hashed:str) -> bool: ...
+
+    def identify(self, password_hashed:str) -> bool:
+        """Indica si el hash fue generado por este algoritmo segun su prefijo"""
+        return password_hashed.startswith(f"${self.algorithm}$")
+
+    def needs_rehash(self, password_hashed:str) -> bool:
+        """Indica si el hash usa parametros distintos a los configurados"""
+        return False
+
+    def describe(self) -> str:
+        return self.algorithm
+
+
+class BcryptHasher(PasswordHasher):
+    algorithm = "bcrypt"
+    PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds:int = 12):
+        self.rounds = rounds
+
+    def hash(self, password:str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, password:str, password_hashed:str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hashed.encode("utf-8"))
+
+    def identify(self, password_hashed:str) -> bool:
+        return password_hashed.startswith(self.PREFIXES)
+
+    def get_rounds(self, password_hashed:str) -> int | None:
+        """Obtiene el costo de un hash bcrypt ($2b$12$...), o None si no tiene ese formato"""
+        parts = password_hashed.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def needs_rehash(self, password_hashed:str) -> bool:
+        # Solo se sube el costo: hosts calibrados a costos distintos no se reescriben los hashes entre si
+        rounds = self.get_rounds(password_hashed)
+        return rounds is None or rounds < self.rounds
+
+    def describe(self) -> str:
+        return f"bcrypt(rounds={self.rounds})"
+
+
+class ScryptHasher(PasswordHasher):
+    """hashlib.scrypt con formato $scrypt$n=16384,r=8,p=1$<salt>$<hash>"""
+    algorithm = "scrypt"
+
+    def __init__(self, n:int = 2 ** 14, r:int = 8, p:int = 1, salt_size:int = 16, key_size:int = 32):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.key_size = key_size
+
+    def memory_cost(self, n:int | None = None, r:int | None = None, p:int | None = None) -> int:
+        """Memoria en bytes que requiere scrypt con estos parametros"""
+        return 128 * (n or self.n) * (r or self.r) * (p or self.p)
+
+    def _derive(self, password:str, salt:bytes, n:int, r:int, p:int, key_size:int) -> bytes:
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                              maxmem=2 * self.memory_cost(n, r, p), dklen=key_size)
+
+    def hash(self, password:str) -> str:
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.n, self.r, self.p, self.key_size)
+        return f"$scrypt$n={self.n},r={self.r},p={self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password:str, password_hashed:str) -> bool:
+        _, _, params, salt, key = password_hashed.split("$")
+        values = _parse_params(params)
+        expected = _b64decode(key)
+        derived = self._derive(password, _b64decode(salt), values["n"], values["r"], values["p"], len(expected))
+        return hmac.compare_digest(derived, expected)
+
+    def needs_rehash(self, password_hashed:str) -> bool:
+        values = _parse_params(password_hashed.split("$")[2])
+        return (values["n"], values["r"], values["p"]) != (self.n, self.r, self.p)
+
+    def describe(self) -> str:
+        return f"scrypt(n={self.n},r={self.r},p={self.p})"
+
+
+class PBKDF2Hasher(PasswordHasher):
+    """hashlib.pbkdf2_hmac con formato $pbkdf2-sha256$i=600000$<salt>$<hash>.
+
+    Cada digest es un algoritmo distinto en el registro (pbkdf2-sha256, pbkdf2-sha512), por lo
+    que solo se aceptan los que se registran al importar el modulo.
+    """
+    DIGESTS = ("sha256", "sha512")
+
+    def __init__(self, iterations:int = 600_000, digest:str = "sha256", salt_size:int = 16):
+        if digest not in self.DIGESTS:
+            raise ValueError(f"Digest no soportado para PBKDF2: {digest}")
+        self.iterations = iterations
+        self.digest = digest
+        self.salt_size = salt_size
+        self.algorithm = f"pbkdf2-{digest}"
+
+    def hash(self, password:str) -> str:
+        salt = os.urandom(self.salt_size)
+        key = hashlib.pbkdf2_hmac(self.digest, password.encode("utf-8"), salt, self.iterations)
+        return f"${self.algorithm}$i={self.iterations}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password:str, password_hashed:str) -> bool:
+        _, _, params, salt, key = password_hashed.split("$")
+        iterations = _parse_params(params)["i"]
+        derived = hashlib.pbkdf2_hmac(self.digest, password.encode("utf-8"), _b64decode(salt), iterations)
+        return hmac.compare_digest(derived, _b64decode(key))
+
+    def needs_rehash(self, password_hashed:str) -> bool:
+        return _parse_params(password_hashed.split("$")[2])["i"] != self.iterations
+
+    def describe(self) -> str:
+        return f"{self.algorithm}(i={self.iterations})"
+
+
+_hashers: dict[str, PasswordHasher] = {}
+_default_algorithm = "bcrypt"
+
+def register_hasher(hasher:PasswordHasher) -> PasswordHasher:
+    """Registra (o reemplaza) el hasher de un algoritmo"""
+    _hashers[hasher.algorithm] = hasher
+    return hasher
+
+def get_hasher(algorithm:str | None = None) -> PasswordHasher:
+    """Obtiene el hasher de un algoritmo, o el configurado por defecto"""
+    algorithm = algorithm or _default_algorithm
+    hasher = _hashers.get(algorithm)
+    if hasher is None:
+        raise ValueError(f"Algoritmo de hashing desconocido: {algorithm}")
+    return hasher
+
+def set_default_hasher(algorithm:str) -> PasswordHasher:
+    """Define el algoritmo usado para los hashes nuevos"""
+    global _default_algorithm
+    hasher = get_hasher(algorithm)
+    _default_algorithm = algorithm
+    return hasher
+
+def identify_hasher(password_hashed:str) -> PasswordHasher | None:
+    """Detecta el hasher de un hash almacenado segun su prefijo"""
+    for hasher in _hashers.values():
+        if hasher.identify(password_hashed):
+            return hasher
+    return None
+
+
+register_hasher(BcryptHasher(rounds=int(os.getenv("USER_MANAGER_BCRYPT_ROUNDS", 12))))
+register_hasher(ScryptHasher())
+register_hasher(PBKDF2Hasher())
+register_hasher(PBKDF2Hasher(iterations=210_000, digest="sha512"))
+set_default_hasher(os.getenv("USER_MANAGER_PASSWORD_HASHER", "bcrypt"))
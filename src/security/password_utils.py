@@ -1,9 +1,165 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import bcrypt
 
+from src.constants import messages
+from src.exceptions.security_exceptions import PasswordHashingBusyError
+from src.security import hashers
+
+MIN_BCRYPT_ROUNDS = 4
+MAX_BCRYPT_ROUNDS = 31
+
 def hash_password(password:str) -> str:
-    salt = bcrypt.gensalt()
-    password_hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return password_hashed.decode('utf-8')
+    """Genera el hash con el algoritmo configurado por defecto (ver hashers.set_default_hasher)"""
+    return hashers.get_hasher().hash(password)
 
 def verify_password(password:str, password_hashed:str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), password_hashed.encode('utf-8'))
\ No newline at end of file
+    """Verifica la contraseña con el algoritmo detectado a partir del prefijo del hash"""
+    hasher = hashers.identify_hasher(password_hashed)
+    if hasher is None:
+        raise ValueError("Formato de hash desconocido")
+    return hasher.verify(password, password_hashed)
+
+def get_bcrypt_rounds() -> int:
+    return hashers.get_hasher("bcrypt").rounds
+
+def set_bcrypt_rounds(rounds:int) -> None:
+    """Define el costo usado por bcrypt para los hashes nuevos"""
+    if not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise ValueError(f"El costo de bcrypt debe estar entre {MIN_BCRYPT_ROUNDS} y {MAX_BCRYPT_ROUNDS}")
+    hashers.get_hasher("bcrypt").rounds = rounds
+
+def calibrate_bcrypt_rounds(target_ms:float = 100, min_rounds:int = 10, max_rounds:int = 16) -> int:
+    """Elige el mayor costo cuyo hash no supere target_ms en este host y lo aplica.
+
+    Cada punto de costo duplica el trabajo, por lo que basta medir un costo base y extrapolar.
+    Nunca baja de min_rounds aunque el host sea lento.
+    """
+    probe_rounds = MIN_BCRYPT_ROUNDS + 2
+    salt = bcrypt.gensalt(rounds=probe_rounds)
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", salt)
+    probe_ms = (time.perf_counter() - start) * 1000
+    rounds = min_rounds
+    while rounds < max_rounds and probe_ms * 2 ** (rounds + 1 - probe_rounds) <= target_ms:
+        rounds += 1
+    set_bcrypt_rounds(rounds)
+    return rounds
+
+def get_hash_rounds(password_hashed:str) -> int | None:
+    """Obtiene el costo de un hash bcrypt ($2b$12$...), o None si no tiene ese formato"""
+    return hashers.get_hasher("bcrypt").get_rounds(password_hashed)
+
+def needs_rehash(password_hashed:str) -> bool:
+    """Indica si el hash usa otro algoritmo o parametros mas debiles que los configurados"""
+    hasher = hashers.identify_hasher(password_hashed)
+    if hasher is None or hasher is not hashers.get_hasher():
+        return True
+    return hasher.needs_rehash(password_hashed)
+
+
+class PasswordHashingPool:
+    """Executor acotado para hashing y verificacion de contraseñas.
+
+    bcrypt libera el GIL, por lo que varios hilos aprovechan varios nucleos. Se limita el
+    numero de tareas en espera (max_queue) para no acumular trabajo indefinidamente: al
+    superarse se lanza PasswordHashingBusyError.
+    """
+
+    def __init__(self, max_workers:int | None = None, max_queue:int = 1024):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args) -> Future:
+        """Encola fn(*args) en el pool, lanza PasswordHashingBusyError si la cola esta llena"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusyError(messages.PASSWORD_HASHING_BUSY)
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        try:
+            future = self._executor.submit(self._run, fn, args)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    async def run(self, fn, *args):
+        """Ejecuta fn(*args) en el pool sin bloquear el event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def metrics(self) -> dict:
+        """Retorna las metricas actuales de la cola y de las tareas procesadas"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "max_queue_depth": self._max_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait:bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _release_cancelled(self, future:Future) -> None:
+        # Una tarea cancelada antes de empezar nunca pasa por _run: se libera aqui su lugar en la cola
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _run(self, fn, args):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+
+_pool: PasswordHashingPool | None = None
+_pool_lock = threading.Lock()
+
+def get_password_pool() -> PasswordHashingPool:
+    """Obtiene el pool compartido, creandolo con la configuracion por defecto si no existe"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PasswordHashingPool()
+    return _pool
+
+def configure_password_pool(max_workers:int | None = None, max_queue:int = 1024) -> PasswordHashingPool:
+    """Reemplaza el pool compartido, cerrando el anterior"""
+    global _pool
+    with _pool_lock:
+        previous = _pool
+        _pool = PasswordHashingPool(max_workers=max_workers, max_queue=max_queue)
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _pool
+
+async def hash_password_async(password:str) -> str:
+    return await get_password_pool().run(hash_password, password)
+
+async def verify_password_async(password:str, password_hashed:str) -> bool:
+    return await get_password_pool().run(verify_password, password, password_hashed)
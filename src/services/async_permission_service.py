@@ -0,0 +1,55 @@
+from src.models.permission import Permission
+from src.repositories.permission_repository import PermissionRepository
+from src.repositories.async_repository import AsyncPermissionRepository, as_async_repository, runs_inline
+from src.services.permission_service import PermissionService
+
+
+class AsyncPermissionService:
+    """Version async de PermissionService; ver src.repositories.async_repository para los repositorios aceptados.
+
+    Con un repositorio en memoria cada metodo delega en PermissionService sin await sobre el repositorio.
+    """
+
+    def __init__(self, repository: PermissionRepository | AsyncPermissionRepository | None = None):
+        repository = repository or PermissionRepository()
+        self.repository = as_async_repository(repository)
+        self._inline = PermissionService(repository) if runs_inline(repository) else None
+
+    async def create_permission(self, name: str, description: str = "") -> Permission:
+        """Crea un nuevo permiso"""
+        if self._inline:
+            return self._inline.create_permission(name, description)
+        permission = Permission(name=PermissionService.normalize_name(name), description=description)
+        return await self.repository.add(permission)
+
+    async def get_permission(self, name: str) -> Permission:
+        """Obtiene un permiso por nombre"""
+        if self._inline:
+            return self._inline.get_permission(name)
+        return await self.repository.get(PermissionService.normalize_name(name))
+
+    async def get_all_permissions(self) -> list[Permission]:
+        """Obtiene todos los permisos"""
+        if self._inline:
+            return self._inline.get_all_permissions()
+        return await self.repository.get_all()
+
+    async def get_permissions_page(self, after: str | None = None, limit: int = 100) -> list[Permission]:
+        """Obtiene una pagina de permisos ordenada por id, a partir del cursor after"""
+        if self._inline:
+            return self._inline.get_permissions_page(after, limit)
+        return await self.repository.get_page(after, limit)
+
+    async def update_permission_description(self, name: str, new_description: str, expected_version: int | None = None) -> Permission:
+        """Actualiza la descripción de un permiso"""
+        if self._inline:
+            return self._inline.update_permission_description(name, new_description, expected_version)
+        name = PermissionService.normalize_name(name)
+        PermissionService.check_description(new_description)
+        return await self.repository.update_description(name, new_description, expected_version)
+
+    async def delete_permission(self, name: str) -> None:
+        """Elimina un permiso"""
+        if self._inline:
+            return self._inline.delete_permission(name)
+        await self.repository.delete(PermissionService.normalize_name(name))
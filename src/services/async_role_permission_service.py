@@ -0,0 +1,68 @@
+import asyncio
+from src.models.role_permission import RolePermission
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.repositories.async_repository import AsyncRolePermissionRepository, as_async_repository, runs_inline
+from src.services.authorization_service import AuthorizationService
+from src.services.role_permission_service import RolePermissionService
+from src.exceptions.relation_exceptions import require_ids
+
+
+class AsyncRolePermissionService:
+    """Version async de RolePermissionService; ver src.repositories.async_repository para los repositorios aceptados.
+
+    Con un repositorio en memoria cada metodo delega en RolePermissionService, hooks incluidos, sin await sobre el
+    repositorio; con el resto los hooks de authorization se ejecutan fuera del loop con asyncio.to_thread.
+    """
+
+    def __init__(self, repository: RolePermissionRepository | AsyncRolePermissionRepository | None = None,
+                 authorization: AuthorizationService | None = None):
+        repository = repository or RolePermissionRepository()
+        self.repository = as_async_repository(repository)
+        self.authorization = authorization
+        self._inline = RolePermissionService(repository, authorization) if runs_inline(repository) else None
+
+    async def add_permission_to_role(self, role_id: str, permission_id: str) -> RolePermission:
+        if self._inline:
+            return self._inline.add_permission_to_role(role_id, permission_id)
+        require_ids(role_id=role_id, permission_id=permission_id)
+        relation = RolePermission(role_id=role_id, permission_id=permission_id)
+        await self.repository.add(relation)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_permission_granted, role_id, permission_id)
+        return relation
+
+    async def get_all_relations(self) -> list[RolePermission]:
+        if self._inline:
+            return self._inline.get_all_relations()
+        return await self.repository.get_all()
+
+    async def get_relations_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[RolePermission]:
+        if self._inline:
+            return self._inline.get_relations_page(after, limit)
+        return await self.repository.get_page(after, limit)
+
+    async def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
+        if self._inline:
+            return self._inline.get_permissions_by_role(role_id)
+        return await self.repository.get_permissions_by_role(role_id)
+
+    async def get_roles_by_permission(self, permission_id: str) -> list[RolePermission]:
+        if self._inline:
+            return self._inline.get_roles_by_permission(permission_id)
+        return await self.repository.get_roles_by_permission(permission_id)
+
+    async def update_permission_relation(self, role_id: str, permission_id: str, new_permission_id: str) -> RolePermission:
+        if self._inline:
+            return self._inline.update_permission_relation(role_id, permission_id, new_permission_id)
+        relation = await self.repository.update_permission_relation(role_id, permission_id, new_permission_id)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_permission_replaced,
+                                    role_id, permission_id, new_permission_id)
+        return relation
+
+    async def remove_permission_from_role(self, role_id: str, permission_id: str) -> None:
+        if self._inline:
+            return self._inline.remove_permission_from_role(role_id, permission_id)
+        await self.repository.delete(role_id, permission_id)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_permission_revoked, role_id, permission_id)
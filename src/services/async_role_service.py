@@ -0,0 +1,48 @@
+from src.models.role import Role
+from src.repositories.role_repository import RoleRepository
+from src.repositories.async_repository import AsyncRoleRepository, as_async_repository, runs_inline
+from src.services.role_service import RoleService
+
+
+class AsyncRoleService:
+    """Version async de RoleService; ver src.repositories.async_repository para los repositorios aceptados.
+
+    Con un repositorio en memoria cada metodo delega en RoleService sin await sobre el repositorio.
+    """
+
+    def __init__(self, repository: RoleRepository | AsyncRoleRepository | None = None):
+        repository = repository or RoleRepository()
+        self.repository = as_async_repository(repository)
+        self._inline = RoleService(repository) if runs_inline(repository) else None
+
+    async def create_role(self, name: str, description: str = "") -> Role:
+        if self._inline:
+            return self._inline.create_role(name, description)
+        return await self.repository.add(Role(name=RoleService.normalize_name(name), description=description))
+
+    async def get_role(self, name: str) -> Role:
+        if self._inline:
+            return self._inline.get_role(name)
+        return await self.repository.get(RoleService.normalize_name(name))
+
+    async def get_all_roles(self) -> list[Role]:
+        if self._inline:
+            return self._inline.get_all_roles()
+        return await self.repository.get_all()
+
+    async def get_roles_page(self, after: str | None = None, limit: int = 100) -> list[Role]:
+        if self._inline:
+            return self._inline.get_roles_page(after, limit)
+        return await self.repository.get_page(after, limit)
+
+    async def update_role_description(self, name: str, new_description: str, expected_version: int | None = None) -> Role:
+        if self._inline:
+            return self._inline.update_role_description(name, new_description, expected_version)
+        name = RoleService.normalize_name(name)
+        RoleService.check_description(new_description)
+        return await self.repository.update_description(name, new_description, expected_version)
+
+    async def delete_role(self, name: str) -> None:
+        if self._inline:
+            return self._inline.delete_role(name)
+        await self.repository.delete(RoleService.normalize_name(name))
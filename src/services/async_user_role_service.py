@@ -0,0 +1,87 @@
+import asyncio
+from src.models.user_role import UserRole
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.async_repository import AsyncUserRoleRepository, as_async_repository, runs_inline
+from src.services.authorization_service import AuthorizationService
+from src.services.user_role_service import UserRoleService
+from src.exceptions.relation_exceptions import require_ids
+
+
+class AsyncUserRoleService:
+    """Version async de UserRoleService; ver src.repositories.async_repository para los repositorios aceptados.
+
+    Con un repositorio en memoria cada metodo delega en UserRoleService, hooks incluidos, sin await sobre el
+    repositorio; con el resto los hooks de authorization se ejecutan fuera del loop con asyncio.to_thread.
+    """
+
+    def __init__(self, repository: UserRoleRepository | AsyncUserRoleRepository | None = None,
+                 authorization: AuthorizationService | None = None):
+        repository = repository or UserRoleRepository()
+        self.repository = as_async_repository(repository)
+        self.authorization = authorization
+        self._inline = UserRoleService(repository, authorization) if runs_inline(repository) else None
+
+    async def assign_role(self, user_id: str, role_id: str) -> UserRole:
+        """Asigna un rol a un usuario"""
+        if self._inline:
+            return self._inline.assign_role(user_id, role_id)
+        require_ids(user_id=user_id, role_id=role_id)
+        relation = UserRole(user_id, role_id)
+        await self.repository.add(relation)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_role_assigned, user_id, role_id)
+        return relation
+
+    async def get_user_roles(self, user_id: str) -> list[UserRole]:
+        """Obtiene todos los roles de un usuario"""
+        if self._inline:
+            return self._inline.get_user_roles(user_id)
+        require_ids(user_id=user_id)
+        return await self.repository.get_roles_by_user(user_id)
+
+    async def get_users_by_role(self, role_id: str) -> list[UserRole]:
+        """Obtiene todos los usuarios que tienen un rol específico"""
+        if self._inline:
+            return self._inline.get_users_by_role(role_id)
+        require_ids(role_id=role_id)
+        return await self.repository.get_users_by_role(role_id)
+
+    async def get_all_relations(self) -> list[UserRole]:
+        """Obtiene todas las relaciones usuario-rol"""
+        if self._inline:
+            return self._inline.get_all_relations()
+        return await self.repository.get_all()
+
+    async def get_relations_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[UserRole]:
+        """Obtiene una pagina de relaciones ordenada por (user_id, role_id), a partir del cursor after"""
+        if self._inline:
+            return self._inline.get_relations_page(after, limit)
+        return await self.repository.get_page(after, limit)
+
+    async def update_user_role(self, user_id: str, old_role_id: str, new_role_id: str) -> UserRole:
+        """Actualiza el rol de un usuario"""
+        if self._inline:
+            return self._inline.update_user_role(user_id, old_role_id, new_role_id)
+        require_ids(user_id=user_id, old_role_id=old_role_id, new_role_id=new_role_id)
+        relation = await self.repository.update_role_relation(user_id, old_role_id, new_role_id)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_role_replaced,
+                                    user_id, old_role_id, new_role_id)
+        return relation
+
+    async def user_has_role(self, user_id: str, role_id: str) -> bool:
+        """Verifica si un usuario tiene un rol específico"""
+        if self._inline:
+            return self._inline.user_has_role(user_id, role_id)
+        if not user_id or not role_id:
+            return False
+        return await self.repository.find(user_id, role_id) is not None
+
+    async def remove_role(self, user_id: str, role_id: str) -> None:
+        """Remueve un rol de un usuario"""
+        if self._inline:
+            return self._inline.remove_role(user_id, role_id)
+        require_ids(user_id=user_id, role_id=role_id)
+        await self.repository.delete(user_id, role_id)
+        if self.authorization:
+            await asyncio.to_thread(self.authorization.on_role_removed, user_id, role_id)
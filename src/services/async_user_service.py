@@ -0,0 +1,176 @@
+import asyncio
+from src.models.user import User
+from src.models.user_status import UserStatus
+from src.exceptions.user_exceptions import UserValidationError
+from src.exceptions.security_exceptions import PasswordHashingBusyError
+from src.exceptions.concurrency_exceptions import VersionConflictError
+from src.constants import messages
+from src.repositories.user_repository import UserRepository
+from src.repositories.async_repository import AsyncUserRepository, as_async_repository, runs_inline
+from src.security.password_utils import verify_password_async, hash_password_async, needs_rehash
+from src.services.user_service import UserService
+
+
+class AsyncUserService():
+    """Version async de UserService: los hashes se calculan en el pool de contraseñas y los
+    repositorios con I/O se ejecutan fuera del loop (ver src.repositories.async_repository).
+
+    Con un repositorio en memoria las operaciones que no calculan hashes delegan en UserService
+    sin await sobre el repositorio.
+    """
+
+    def __init__(self, repository:UserRepository | AsyncUserRepository | None = None, rehash_on_login:bool = True):
+        repository = repository or UserRepository()
+        self.repository = as_async_repository(repository)
+        self._inline = UserService(repository, rehash_on_login=False) if runs_inline(repository) else None
+        self.rehash_on_login = rehash_on_login
+        self._background: set[asyncio.Task] = set()
+
+    async def create_user(self, username:str, email:str, password:str) -> User:
+        """Crea un nuevo usuario, retorna el usuario creado"""
+        await self._check_new_user(username, email, password)
+        password_hash = await hash_password_async(password)
+        user = User(username, email, password_hash)
+        if self._inline:
+            self._inline.repository.add(user)
+        else:
+            await self.repository.add(user)
+        return user
+
+    async def _check_new_user(self, username:str, email:str, password:str) -> None:
+        """Validaciones previas al hash para no gastar bcrypt en solicitudes que van a fallar"""
+        if self._inline:
+            return self._inline.check_new_user(username, email, password)
+        UserService.check_password(password)
+        if await self._email_exists(email):
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        if username and await self.repository.find(username):
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
+
+    async def get_user(self, username:str) -> User:
+        """Obtiene un usuario por username"""
+        if self._inline:
+            return self._inline.get_user(username)
+        return await self.repository.get(username)
+
+    async def get_all_users(self) -> list[User]:
+        """Obtiene todos los usuarios registrados"""
+        if self._inline:
+            return self._inline.get_all_users()
+        return await self.repository.get_all()
+
+    async def get_users_page(self, after: str | None = None, limit: int = 100) -> list[User]:
+        """Obtiene una pagina de usuarios ordenada por id, a partir del cursor after (id del ultimo recibido)"""
+        if self._inline:
+            return self._inline.get_users_page(after, limit)
+        return await self.repository.get_page(after, limit)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """Obtiene un usuario por email"""
+        if self._inline:
+            return self._inline.get_user_by_email(email)
+        return await self.repository.find_by_email(email)
+
+    async def update_username(self, current_username: str, new_username: str, expected_version: int | None = None) -> User:
+        """Actualiza el username de un usuario"""
+        if self._inline:
+            return self._inline.update_username(current_username, new_username, expected_version)
+        UserService.check_username_change(await self.get_user(current_username), new_username)
+        if await self.repository.find(new_username):
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
+        return await self.repository.update_username(current_username, new_username, expected_version)
+
+    async def update_email(self, username:str, new_email:str, expected_version: int | None = None) -> dict:
+        """Actualiza el email de un usuario"""
+        if self._inline:
+            return self._inline.update_email(username, new_email, expected_version)
+        user = await self.get_user(username)
+        UserService.check_email_change(user, new_email)
+        owner = await self.repository.find_by_email(new_email)
+        if owner is not None and owner.id != user.id:
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        user_updated = await self.repository.update_email(username, new_email, expected_version)
+        return {"username": user_updated.username, "email": user_updated.email}
+
+    async def update_password(self, username: str, current_password: str, new_password: str,
+                              expected_version: int | None = None) -> User:
+        """Actualiza la contraseña de un usuario verificando y calculando el hash en el pool"""
+        UserService.check_password(new_password)
+        user = await self.get_user(username)
+        if not await verify_password_async(current_password, user.password):
+            raise UserValidationError(messages.WRONG_PASSWORD)
+        new_password_hash = await hash_password_async(new_password)
+        if self._inline:
+            return self._inline.repository.update_password(username, new_password_hash, expected_version)
+        return await self.repository.update_password(username, new_password_hash, expected_version)
+
+    async def delete_user(self, username:str) -> None:
+        """Elimina un usuario registrado"""
+        if self._inline:
+            return self._inline.delete_user(username)
+        await self.repository.delete(username)
+
+    async def _email_exists(self, email: str) -> bool:
+        """Verifica si un email ya está registrado"""
+        return await self.get_user_by_email(email) is not None
+
+    async def _update_status(self, username: str, status: UserStatus, expected_version: int | None = None) -> User:
+        if self._inline:
+            return self._inline.repository.update_status(username, status, expected_version)
+        return await self.repository.update_status(username, status, expected_version)
+
+    async def activate_user(self, username: str, expected_version: int | None = None) -> User:
+        """Activa un usuario"""
+        return await self._update_status(username, UserStatus.ACTIVE, expected_version)
+
+    async def deactivate_user(self, username: str, expected_version: int | None = None) -> User:
+        """Desactiva un usuario"""
+        return await self._update_status(username, UserStatus.INACTIVE, expected_version)
+
+    async def suspend_user(self, username: str, expected_version: int | None = None) -> User:
+        """Suspende un usuario"""
+        return await self._update_status(username, UserStatus.SUSPENDED, expected_version)
+
+    async def block_user(self, username: str, expected_version: int | None = None) -> User:
+        """Bloquea un usuario"""
+        return await self._update_status(username, UserStatus.BLOCKED, expected_version)
+
+    async def verify_user_password(self, username: str, password: str) -> bool:
+        """Verifica la contraseña de un usuario en el pool de contraseñas"""
+        user = await self.get_user(username)
+        valid = await verify_password_async(password, user.password)
+        if valid:
+            self._schedule_rehash(user.username, password, user.password)
+        return valid
+
+    def _schedule_rehash(self, username: str, password: str, current_hash: str) -> asyncio.Task | None:
+        """Si el hash usa un costo desactualizado, lo regenera en una tarea de fondo tras un login correcto"""
+        if not self.rehash_on_login or not needs_rehash(current_hash):
+            return None
+        task = asyncio.get_running_loop().create_task(self._rehash_password(username, password, current_hash))
+        # El loop solo guarda referencias debiles a las tareas
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def _rehash_password(self, username: str, password: str, current_hash: str) -> None:
+        try:
+            new_hash = await hash_password_async(password)
+        except PasswordHashingBusyError:
+            # Con el pool saturado se reintentara en el proximo login
+            return
+        user = self._inline.repository.find(username) if self._inline else await self.repository.find(username)
+        if user is None:
+            return
+        version = user.version
+        # Si la contraseña cambio mientras tanto no se pisa el hash nuevo; expected_version cubre
+        # el cambio que llegue entre esta lectura y la escritura
+        if user.password != current_hash:
+            return
+        try:
+            if self._inline:
+                self._inline.repository.update_password(username, new_hash, expected_version=version)
+            else:
+                await self.repository.update_password(username, new_hash, expected_version=version)
+        except VersionConflictError:
+            return
@@ -0,0 +1,138 @@
+from collections.abc import Iterable
+
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+
+
+def pack_bitmap(values: list[bool]) -> bytes:
+    """Empaqueta una lista de booleanos en bytes, el bit i (LSB primero) corresponde a values[i]"""
+    bitmap = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value:
+            bitmap[index >> 3] |= 1 << (index & 7)
+    return bytes(bitmap)
+
+
+class AuthorizationService:
+    """Resuelve los permisos efectivos de cada usuario uniendo sus roles con los permisos de cada rol.
+
+    Los permisos efectivos se materializan por usuario como un frozenset y se mantienen
+    actualizados de forma incremental a traves de los metodos on_*, que invocan
+    UserRoleService y RolePermissionService al escribir. Solo se materializan los usuarios con
+    roles asignados: los ids sin roles (o inexistentes) se resuelven en cada consulta para que
+    no hagan crecer la cache sin limite.
+    """
+
+    def __init__(self,
+                 user_role_repository: UserRoleRepository | None = None,
+                 role_permission_repository: RolePermissionRepository | None = None):
+        self.user_role_repository = user_role_repository or UserRoleRepository()
+        self.role_permission_repository = role_permission_repository or RolePermissionRepository()
+        self._permissions_by_user: dict[str, frozenset[str]] = {}
+
+    def get_user_permissions(self, user_id: str) -> frozenset[str]:
+        """Obtiene los ids de permisos efectivos de un usuario"""
+        permissions = self._permissions_by_user.get(user_id)
+        if permissions is None:
+            permissions = self._materialize(user_id)
+        return permissions
+
+    def has_permission(self, user_id: str, permission_id: str) -> bool:
+        """Verifica si alguno de los roles del usuario otorga el permiso"""
+        if not user_id or not permission_id:
+            return False
+        permissions = self._permissions_by_user.get(user_id)
+        if permissions is None:
+            permissions = self._materialize(user_id)
+        return permission_id in permissions
+
+    def check_many(self, checks: Iterable[tuple[str, str]]) -> list[bool]:
+        """Evalua varios pares (user_id, permission_id) en una sola pasada, en el orden recibido.
+
+        Los permisos de cada usuario se resuelven una sola vez por lote y los de cada rol se
+        comparten entre los usuarios del lote que no estaban materializados.
+        """
+        checks = list(checks)
+        by_user: dict[str, frozenset[str]] = {}
+        role_cache: dict[str, frozenset[str]] = {}
+        for user_id, _ in checks:
+            if user_id and user_id not in by_user:
+                permissions = self._permissions_by_user.get(user_id)
+                by_user[user_id] = permissions if permissions is not None else self._materialize(user_id, role_cache)
+        return [bool(user_id and permission_id) and permission_id in by_user[user_id]
+                for user_id, permission_id in checks]
+
+    def check_many_bitmap(self, checks: Iterable[tuple[str, str]]) -> bytes:
+        """Como check_many, pero empaqueta las respuestas en un bitmap: el bit i (LSB primero) es el par i"""
+        return pack_bitmap(self.check_many(checks))
+
+    def warm(self) -> int:
+        """Materializa los permisos de todos los usuarios con roles asignados, retorna cuantos"""
+        users = {relation.user_id for relation in self.user_role_repository.get_all()}
+        for user_id in users:
+            self._materialize(user_id)
+        return len(users)
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Descarta los permisos materializados de un usuario, o de todos si no se indica"""
+        if user_id is None:
+            self._permissions_by_user.clear()
+        else:
+            self._permissions_by_user.pop(user_id, None)
+
+    # -------------------- Notificaciones de escritura --------------------
+
+    def on_role_assigned(self, user_id: str, role_id: str) -> None:
+        current = self._permissions_by_user.get(user_id)
+        if current is not None:
+            self._permissions_by_user[user_id] = current | self._role_permissions(role_id)
+
+    def on_role_removed(self, user_id: str, role_id: str) -> None:
+        # Otro rol del usuario puede otorgar los mismos permisos, por eso se recalcula
+        if user_id in self._permissions_by_user:
+            self._materialize(user_id)
+
+    def on_role_replaced(self, user_id: str, old_role_id: str, new_role_id: str) -> None:
+        if user_id in self._permissions_by_user:
+            self._materialize(user_id)
+
+    def on_permission_granted(self, role_id: str, permission_id: str) -> None:
+        for relation in self.user_role_repository.get_users_by_role(role_id):
+            current = self._permissions_by_user.get(relation.user_id)
+            if current is not None and permission_id not in current:
+                self._permissions_by_user[relation.user_id] = current | {permission_id}
+
+    def on_permission_revoked(self, role_id: str, permission_id: str) -> None:
+        for relation in self.user_role_repository.get_users_by_role(role_id):
+            current = self._permissions_by_user.get(relation.user_id)
+            if current is not None and permission_id in current:
+                self._materialize(relation.user_id)
+
+    def on_permission_replaced(self, role_id: str, old_permission_id: str, new_permission_id: str) -> None:
+        for relation in self.user_role_repository.get_users_by_role(role_id):
+            if relation.user_id in self._permissions_by_user:
+                self._materialize(relation.user_id)
+
+    # -------------------- Internos --------------------
+
+    def _role_permissions(self, role_id: str) -> frozenset[str]:
+        return frozenset(relation.permission_id
+                         for relation in self.role_permission_repository.get_permissions_by_role(role_id))
+
+    def _materialize(self, user_id: str, role_cache: dict[str, frozenset[str]] | None = None) -> frozenset[str]:
+        permissions: set[str] = set()
+        relations = self.user_role_repository.get_roles_by_user(user_id)
+        for relation in relations:
+            if role_cache is None:
+                permissions.update(self._role_permissions(relation.role_id))
+                continue
+            role_permissions = role_cache.get(relation.role_id)
+            if role_permissions is None:
+                role_permissions = role_cache[relation.role_id] = self._role_permissions(relation.role_id)
+            permissions.update(role_permissions)
+        result = frozenset(permissions)
+        if relations:
+            self._permissions_by_user[user_id] = result
+        else:
+            self._permissions_by_user.pop(user_id, None)
+        return result
@@ -7,34 +7,43 @@ class PermissionService:
     def __init__(self, repository: PermissionRepository | None = None):
         self.repository = repository or PermissionRepository()
 
-    def create_permission(self, name: str, description: str = "") -> Permission:
-        """Crea un nuevo permiso"""
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Valida el nombre de un permiso y lo retorna normalizado; AsyncPermissionService tambien la usa"""
         if not name or not name.strip():
             raise PermissionValidationError(messages.PERMISSION_INVALID_NAME)
-        permission = Permission(name=name.strip().lower(), description=description)
+        return name.strip().lower()
+
+    @staticmethod
+    def check_description(description: str) -> None:
+        """Valida la descripción de un permiso"""
+        if description is None:
+            raise PermissionValidationError(messages.PERMISSION_INVALID_TYPE)
+
+    def create_permission(self, name: str, description: str = "") -> Permission:
+        """Crea un nuevo permiso"""
+        permission = Permission(name=self.normalize_name(name), description=description)
         return self.repository.add(permission)
 
     def get_permission(self, name: str) -> Permission:
         """Obtiene un permiso por nombre"""
-        if not name:
-            raise PermissionValidationError(messages.PERMISSION_INVALID_NAME)
-        return self.repository.get(name.strip().lower())
+        return self.repository.get(self.normalize_name(name))
 
     def get_all_permissions(self) -> list[Permission]:
         """Obtiene todos los permisos"""
         return self.repository.get_all()
 
-    def update_permission_description(self, name: str, new_description: str) -> Permission:
+    def get_permissions_page(self, after: str | None = None, limit: int = 100) -> list[Permission]:
+        """Obtiene una pagina de permisos ordenada por id, a partir del cursor after"""
+        return self.repository.get_page(after, limit)
+
+    def update_permission_description(self, name: str, new_description: str, expected_version: int | None = None) -> Permission:
         """Actualiza la descripción de un permiso"""
-        if not name:
-            #TODO: crear error y mensaje personalizado (ej: Campos vacios | campos obligatorios)
-            raise PermissionValidationError(messages.PERMISSION_INVALID_NAME)
-        if new_description is None:
-            raise PermissionValidationError(messages.PERMISSION_INVALID_TYPE)
-        return self.repository.update_description(name.strip().lower(), new_description)
+        #TODO: crear error y mensaje personalizado (ej: Campos vacios | campos obligatorios)
+        name = self.normalize_name(name)
+        self.check_description(new_description)
+        return self.repository.update_description(name, new_description, expected_version)
 
     def delete_permission(self, name: str) -> None:
         """Elimina un permiso"""
-        if not name:
-            raise PermissionValidationError(messages.PERMISSION_INVALID_NAME)
-        self.repository.delete(name.strip().lower())
\ No newline at end of file
+        self.repository.delete(self.normalize_name(name))
\ No newline at end of file
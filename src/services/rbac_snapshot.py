@@ -0,0 +1,271 @@
+"""Snapshots inmutables del grafo RBAC publicados por copy-on-write.
+
+Los lectores toman el snapshot vigente con una sola lectura de referencia (atomica en
+CPython, con o sin GIL) y resuelven has_permission sobre el sin locks: un snapshot nunca
+cambia. Los escritores, serializados entre si, construyen una version nueva y la publican
+reemplazando la referencia. La version nueva comparte con la anterior todo lo que no
+cambio: los frozensets de roles por usuario y de permisos por rol, y los shards de los
+mapas que no contienen la clave modificada.
+"""
+import threading
+from collections.abc import Iterable, Iterator
+
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.services.authorization_service import pack_bitmap
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class ShardedMap:
+    """Mapa persistente: set y delete retornan un mapa nuevo copiando solo el shard de la clave.
+
+    Con 256 shards, una escritura sobre un millon de claves copia unas 4000 entradas y la
+    tupla de shards, en lugar del dict completo.
+    """
+
+    __slots__ = ("_shards", "_len")
+
+    def __init__(self, shards:tuple[dict, ...], length:int):
+        self._shards = shards
+        self._len = length
+
+    @classmethod
+    def from_dict(cls, data:dict, shard_count:int = 256) -> "ShardedMap":
+        shards: tuple[dict, ...] = tuple({} for _ in range(shard_count))
+        for key, value in data.items():
+            shards[hash(key) % shard_count][key] = value
+        return cls(shards, len(data))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, key) -> bool:
+        return key in self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key, default=None):
+        return self._shards[hash(key) % len(self._shards)].get(key, default)
+
+    def items(self) -> Iterator[tuple]:
+        for shard in self._shards:
+            yield from shard.items()
+
+    def set(self, key, value) -> "ShardedMap":
+        index = hash(key) % len(self._shards)
+        shard = dict(self._shards[index])
+        added = key not in shard
+        shard[key] = value
+        return ShardedMap(self._shards[:index] + (shard,) + self._shards[index + 1:], self._len + added)
+
+    def delete(self, key) -> "ShardedMap":
+        index = hash(key) % len(self._shards)
+        if key not in self._shards[index]:
+            return self
+        shard = dict(self._shards[index])
+        del shard[key]
+        return ShardedMap(self._shards[:index] + (shard,) + self._shards[index + 1:], self._len - 1)
+
+
+class RbacSnapshot:
+    """Version inmutable del grafo: roles de cada usuario y permisos de cada rol"""
+
+    __slots__ = ("version", "roles_by_user", "permissions_by_role")
+
+    def __init__(self, version:int, roles_by_user:ShardedMap, permissions_by_role:ShardedMap):
+        self.version = version
+        self.roles_by_user = roles_by_user
+        self.permissions_by_role = permissions_by_role
+
+    @classmethod
+    def build(cls, user_roles:Iterable, role_permissions:Iterable, version:int = 0) -> "RbacSnapshot":
+        roles_by_user: dict[str, set[str]] = {}
+        for relation in user_roles:
+            roles_by_user.setdefault(relation.user_id, set()).add(relation.role_id)
+        permissions_by_role: dict[str, set[str]] = {}
+        for relation in role_permissions:
+            permissions_by_role.setdefault(relation.role_id, set()).add(relation.permission_id)
+        return cls(version,
+                   ShardedMap.from_dict({key: frozenset(value) for key, value in roles_by_user.items()}),
+                   ShardedMap.from_dict({key: frozenset(value) for key, value in permissions_by_role.items()}))
+
+    # -------------------- Lecturas --------------------
+
+    def get_user_permissions(self, user_id:str) -> frozenset[str]:
+        roles = self.roles_by_user.get(user_id, _EMPTY)
+        if len(roles) == 1:
+            return self.permissions_by_role.get(next(iter(roles)), _EMPTY)
+        return _EMPTY.union(*[self.permissions_by_role.get(role_id, _EMPTY) for role_id in roles])
+
+    def has_permission(self, user_id:str, permission_id:str) -> bool:
+        if not user_id or not permission_id:
+            return False
+        permissions_by_role = self.permissions_by_role
+        return any(permission_id in permissions_by_role.get(role_id, _EMPTY)
+                   for role_id in self.roles_by_user.get(user_id, _EMPTY))
+
+    def check_many(self, checks:Iterable[tuple[str, str]]) -> list[bool]:
+        by_user: dict[str, frozenset[str]] = {}
+        results = []
+        for user_id, permission_id in checks:
+            if not user_id or not permission_id:
+                results.append(False)
+                continue
+            permissions = by_user.get(user_id)
+            if permissions is None:
+                permissions = by_user[user_id] = self.get_user_permissions(user_id)
+            results.append(permission_id in permissions)
+        return results
+
+    # -------------------- Versiones nuevas --------------------
+
+    def with_role_assigned(self, user_id:str, role_id:str) -> "RbacSnapshot":
+        roles = self.roles_by_user.get(user_id, _EMPTY)
+        if role_id in roles:
+            return self
+        return RbacSnapshot(self.version + 1, self.roles_by_user.set(user_id, roles | {role_id}),
+                            self.permissions_by_role)
+
+    def with_role_removed(self, user_id:str, role_id:str) -> "RbacSnapshot":
+        roles = self.roles_by_user.get(user_id, _EMPTY)
+        if role_id not in roles:
+            return self
+        remaining = roles - {role_id}
+        roles_by_user = (self.roles_by_user.set(user_id, remaining) if remaining
+                         else self.roles_by_user.delete(user_id))
+        return RbacSnapshot(self.version + 1, roles_by_user, self.permissions_by_role)
+
+    def with_role_replaced(self, user_id:str, old_role_id:str, new_role_id:str) -> "RbacSnapshot":
+        roles = self.roles_by_user.get(user_id, _EMPTY)
+        replaced = (roles - {old_role_id}) | {new_role_id}
+        if replaced == roles:
+            return self
+        return RbacSnapshot(self.version + 1, self.roles_by_user.set(user_id, replaced), self.permissions_by_role)
+
+    def with_user_roles(self, user_id:str, roles:frozenset[str]) -> "RbacSnapshot":
+        if self.roles_by_user.get(user_id, _EMPTY) == roles:
+            return self
+        roles_by_user = self.roles_by_user.set(user_id, roles) if roles else self.roles_by_user.delete(user_id)
+        return RbacSnapshot(self.version + 1, roles_by_user, self.permissions_by_role)
+
+    def with_role_permissions(self, role_id:str, permissions:frozenset[str]) -> "RbacSnapshot":
+        if self.permissions_by_role.get(role_id, _EMPTY) == permissions:
+            return self
+        permissions_by_role = (self.permissions_by_role.set(role_id, permissions) if permissions
+                               else self.permissions_by_role.delete(role_id))
+        return RbacSnapshot(self.version + 1, self.roles_by_user, permissions_by_role)
+
+    def with_permission_granted(self, role_id:str, permission_id:str) -> "RbacSnapshot":
+        permissions = self.permissions_by_role.get(role_id, _EMPTY)
+        if permission_id in permissions:
+            return self
+        return RbacSnapshot(self.version + 1, self.roles_by_user,
+                            self.permissions_by_role.set(role_id, permissions | {permission_id}))
+
+    def with_permission_revoked(self, role_id:str, permission_id:str) -> "RbacSnapshot":
+        permissions = self.permissions_by_role.get(role_id, _EMPTY)
+        if permission_id not in permissions:
+            return self
+        remaining = permissions - {permission_id}
+        permissions_by_role = (self.permissions_by_role.set(role_id, remaining) if remaining
+                               else self.permissions_by_role.delete(role_id))
+        return RbacSnapshot(self.version + 1, self.roles_by_user, permissions_by_role)
+
+    def with_permission_replaced(self, role_id:str, old_permission_id:str, new_permission_id:str) -> "RbacSnapshot":
+        permissions = self.permissions_by_role.get(role_id, _EMPTY)
+        replaced = (permissions - {old_permission_id}) | {new_permission_id}
+        if replaced == permissions:
+            return self
+        return RbacSnapshot(self.version + 1, self.roles_by_user, self.permissions_by_role.set(role_id, replaced))
+
+
+class SnapshotAuthorizationService:
+    """Alternativa a AuthorizationService para cargas con muchas mas lecturas que escrituras.
+
+    Expone la misma interfaz (consultas, warm, invalidate y los metodos on_* que invocan
+    UserRoleService y RolePermissionService), pero las consultas se resuelven sobre el
+    snapshot publicado y nunca esperan a una escritura.
+
+    Los on_* no aplican el cambio notificado sino que vuelven a leer, bajo _write_lock, los
+    roles del usuario o los permisos del rol afectado: con repositorios concurrentes dos
+    escrituras sobre el mismo par pueden notificar en un orden distinto al que se confirmaron,
+    y un delta a ciegas dejaria el snapshot desalineado hasta un invalidate completo.
+    """
+
+    def __init__(self,
+                 user_role_repository: UserRoleRepository | None = None,
+                 role_permission_repository: RolePermissionRepository | None = None):
+        self.user_role_repository = user_role_repository or UserRoleRepository()
+        self.role_permission_repository = role_permission_repository or RolePermissionRepository()
+        self._write_lock = threading.Lock()
+        self._snapshot = RbacSnapshot.build(self.user_role_repository.get_all(),
+                                            self.role_permission_repository.get_all())
+
+    @property
+    def snapshot(self) -> RbacSnapshot:
+        """Snapshot vigente; quien necesite varias lecturas consistentes entre si debe retenerlo"""
+        return self._snapshot
+
+    def get_user_permissions(self, user_id: str) -> frozenset[str]:
+        return self._snapshot.get_user_permissions(user_id)
+
+    def has_permission(self, user_id: str, permission_id: str) -> bool:
+        return self._snapshot.has_permission(user_id, permission_id)
+
+    def check_many(self, checks: Iterable[tuple[str, str]]) -> list[bool]:
+        return self._snapshot.check_many(checks)
+
+    def check_many_bitmap(self, checks: Iterable[tuple[str, str]]) -> bytes:
+        return pack_bitmap(self._snapshot.check_many(checks))
+
+    def warm(self) -> int:
+        """El snapshot se construye al crear el servicio; retorna cuantos usuarios tienen roles"""
+        return len(self._snapshot.roles_by_user)
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Vuelve a leer de los repositorios los roles de un usuario, o el grafo completo si no se indica"""
+        with self._write_lock:
+            if user_id is None:
+                self._snapshot = RbacSnapshot.build(self.user_role_repository.get_all(),
+                                                    self.role_permission_repository.get_all(),
+                                                    self._snapshot.version + 1)
+            else:
+                self._refresh_user(user_id)
+
+    # -------------------- Notificaciones de escritura --------------------
+
+    def on_role_assigned(self, user_id: str, role_id: str) -> None:
+        with self._write_lock:
+            self._refresh_user(user_id)
+
+    def on_role_removed(self, user_id: str, role_id: str) -> None:
+        with self._write_lock:
+            self._refresh_user(user_id)
+
+    def on_role_replaced(self, user_id: str, old_role_id: str, new_role_id: str) -> None:
+        # Una sola version: ningun lector ve al usuario sin ninguno de los dos roles
+        with self._write_lock:
+            self._refresh_user(user_id)
+
+    def on_permission_granted(self, role_id: str, permission_id: str) -> None:
+        with self._write_lock:
+            self._refresh_role(role_id)
+
+    def on_permission_revoked(self, role_id: str, permission_id: str) -> None:
+        with self._write_lock:
+            self._refresh_role(role_id)
+
+    def on_permission_replaced(self, role_id: str, old_permission_id: str, new_permission_id: str) -> None:
+        # Una sola version: ningun lector ve al rol sin ninguno de los dos permisos
+        with self._write_lock:
+            self._refresh_role(role_id)
+
+    # -------------------- Internos --------------------
+
+    def _refresh_user(self, user_id: str) -> None:
+        roles = frozenset(relation.role_id for relation in self.user_role_repository.get_roles_by_user(user_id))
+        self._snapshot = self._snapshot.with_user_roles(user_id, roles)
+
+    def _refresh_role(self, role_id: str) -> None:
+        permissions = frozenset(relation.permission_id
+                                for relation in self.role_permission_repository.get_permissions_by_role(role_id))
+        self._snapshot = self._snapshot.with_role_permissions(role_id, permissions)
@@ -1,22 +1,29 @@
 from src.models.role_permission import RolePermission
 from src.repositories.role_permission_repository import RolePermissionRepository
+from src.services.authorization_service import AuthorizationService
+from src.exceptions.relation_exceptions import require_ids
 
 
 class RolePermissionService:
-    def __init__(self, repository: RolePermissionRepository | None = None) :
+    def __init__(self, repository: RolePermissionRepository | None = None, authorization: AuthorizationService | None = None) :
         self.repository = repository or RolePermissionRepository()
+        self.authorization = authorization
 
     def add_permission_to_role(self, role_id: str, permission_id: str) -> RolePermission:
-        if not role_id or not permission_id:
-            raise ValueError("role_id y permission_id son requeridos")
+        require_ids(role_id=role_id, permission_id=permission_id)
 
         relation = RolePermission(role_id=role_id, permission_id=permission_id)
         self.repository.add(relation)
+        if self.authorization:
+            self.authorization.on_permission_granted(role_id, permission_id)
         return relation
 
     def get_all_relations(self) -> list[RolePermission]:
         return self.repository.get_all()
 
+    def get_relations_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[RolePermission]:
+        return self.repository.get_page(after, limit)
+
     def get_permissions_by_role(self, role_id: str) -> list[RolePermission]:
         return self.repository.get_permissions_by_role(role_id)
 
@@ -24,7 +31,12 @@ class RolePermissionService:
         return self.repository.get_roles_by_permission(permission_id)
 
     def update_permission_relation(self, role_id: str, permission_id: str, new_permission_id: str) -> RolePermission:
-        return self.repository.update_permission_relation(role_id, permission_id, new_permission_id)
+        relation = self.repository.update_permission_relation(role_id, permission_id, new_permission_id)
+        if self.authorization:
+            self.authorization.on_permission_replaced(role_id, permission_id, new_permission_id)
+        return relation
 
     def remove_permission_from_role(self, role_id: str, permission_id: str) -> None:
         self.repository.delete(role_id, permission_id)
+        if self.authorization:
+            self.authorization.on_permission_revoked(role_id, permission_id)
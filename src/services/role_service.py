@@ -7,28 +7,35 @@ class RoleService:
     def __init__(self, repository: RoleRepository | None = None):
         self.repository = repository or RoleRepository()
 
-    def create_role(self, name: str, description: str = "") -> Role:
-        if not name:
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Valida el nombre de un rol y lo retorna normalizado; AsyncRoleService tambien la usa"""
+        if not name or not name.strip():
             raise RoleValidationError(messages.ROLE_INVALID_NAME)
-        role = Role(name=name.strip().lower(), description=description)
+        return name.strip().lower()
+
+    @staticmethod
+    def check_description(description: str) -> None:
+        if description is None:
+            raise RoleValidationError(messages.ROLE_INVALID_TYPE)
+
+    def create_role(self, name: str, description: str = "") -> Role:
+        role = Role(name=self.normalize_name(name), description=description)
         return self.repository.add(role)
 
     def get_role(self, name: str) -> Role:
-        if not name:
-            raise RoleValidationError(messages.ROLE_INVALID_NAME)
-        return self.repository.get(name.strip().lower())
+        return self.repository.get(self.normalize_name(name))
 
     def get_all_roles(self) -> list[Role]:
         return self.repository.get_all()
 
-    def update_role_description(self, name: str, new_description: str) -> Role:
-        if not name:
-            raise RoleValidationError(messages.ROLE_INVALID_NAME)
-        if new_description is None:
-            raise RoleValidationError(messages.ROLE_INVALID_TYPE)
-        return self.repository.update_description(name.strip().lower(), new_description)
+    def get_roles_page(self, after: str | None = None, limit: int = 100) -> list[Role]:
+        return self.repository.get_page(after, limit)
+
+    def update_role_description(self, name: str, new_description: str, expected_version: int | None = None) -> Role:
+        name = self.normalize_name(name)
+        self.check_description(new_description)
+        return self.repository.update_description(name, new_description, expected_version)
 
     def delete_role(self, name: str) -> None:
-        if not name:
-            raise RoleValidationError(messages.ROLE_INVALID_NAME)
-        self.repository.delete(name.strip().lower())
+        self.repository.delete(self.normalize_name(name))
@@ -0,0 +1,299 @@
+"""Importacion y exportacion en streaming de usuarios, roles, permisos y relaciones.
+
+El formato se elige por la extension del archivo: .csv o .jsonl, con un .gz opcional al
+final para comprimir con gzip. La exportacion recorre los repositorios pagina a pagina con
+get_page y escribe por bloques; la importacion lee fila a fila e inserta por bloques, por lo que la memoria
+usada depende de chunk_size y no de la cantidad de filas.
+"""
+import csv
+import gzip
+import json
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import IO
+
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.exceptions.user_exceptions import UserError
+from src.exceptions.role_exceptions import RoleError
+from src.exceptions.permission_exceptions import PermissionError as PermissionDomainError
+from src.repositories.user_repository import UserRepository
+from src.repositories.role_repository import RoleRepository
+from src.repositories.permission_repository import PermissionRepository
+from src.repositories.user_role_repository import UserRoleRepository
+from src.repositories.role_permission_repository import RolePermissionRepository
+from src.security.hashers import identify_hasher
+
+USER_FIELDS = ("id", "username", "email", "status", "created_at", "updated_at", "version")
+NAMED_FIELDS = ("id", "name", "description", "created_at", "updated_at", "version")
+USER_ROLE_FIELDS = ("user_id", "role_id")
+ROLE_PERMISSION_FIELDS = ("role_id", "permission_id")
+
+_IMPORT_ERRORS = (UserError, RoleError, PermissionDomainError, ValueError)
+
+
+def _format(path:str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    for extension, format in ((".csv", "csv"), (".jsonl", "jsonl"), (".ndjson", "jsonl")):
+        if name.endswith(extension):
+            return format
+    raise ValueError(f"Formato de archivo no soportado: {path}")
+
+def _open(path:str, mode:str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+def write_rows(path:str, fields:tuple[str, ...], rows:Iterable[dict], chunk_size:int = 1000) -> int:
+    """Escribe las filas por bloques de chunk_size, retorna la cantidad escrita"""
+    format = _format(path)
+    iterator = iter(rows)
+    count = 0
+    with _open(path, "w") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        if format == "csv":
+            writer.writeheader()
+        while chunk := list(islice(iterator, chunk_size)):
+            if format == "csv":
+                writer.writerows(chunk)
+            else:
+                file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+class MalformedRow(dict):
+    """Linea JSONL que no es un objeto JSON; read_rows la emite vacia para que se reporte como fila fallida"""
+
+    def __init__(self, error:str):
+        super().__init__()
+        self.error = error
+
+
+def read_rows(path:str) -> Iterator[dict]:
+    """Itera las filas del archivo como dicts, sin cargarlo completo.
+
+    Una linea JSONL invalida no corta la lectura: se emite como MalformedRow y el resto del
+    archivo se sigue leyendo.
+    """
+    format = _format(path)
+    with _open(path, "r") as file:
+        if format == "csv":
+            yield from csv.DictReader(file)
+        else:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield row if isinstance(row, dict) else MalformedRow(f"Linea {number}: no es un objeto JSON valido")
+
+
+def _field(row:dict, name:str) -> str:
+    # Todas las conversiones leen campos con _field, asi que aqui se reportan las lineas invalidas
+    if isinstance(row, MalformedRow):
+        raise ValueError(row.error)
+    value = row.get(name)
+    if value is None or value == "":
+        raise ValueError(f"Falta el campo {name}")
+    return value
+
+def _version(row:dict) -> int:
+    # Los archivos exportados antes de versionar las entidades no traen la columna
+    return int(row.get("version") or 1)
+
+def _user_to_row(user:User, include_password_hash:bool) -> dict:
+    row = {"id": user.id, "username": user.username, "email": user.email, "status": UserStatus(user.status).value,
+           "created_at": user.created_at.isoformat(), "updated_at": user.updated_at.isoformat(),
+           "version": user.version}
+    if include_password_hash:
+        row["password"] = user.password
+    return row
+
+def _password_hash(row:dict) -> str:
+    # Sin el hash el usuario no podria iniciar sesion, y uno con formato desconocido haria fallar el login
+    if not isinstance(row, MalformedRow) and not row.get("password"):
+        raise ValueError("Falta el campo password: importe una exportacion hecha con include_password_hashes=True")
+    password = _field(row, "password")
+    if identify_hasher(password) is None:
+        raise ValueError("El campo password no es un hash de un algoritmo registrado")
+    return password
+
+def _user_from_row(row:dict) -> User:
+    user = User.restore(_field(row, "id"), _field(row, "username"), _field(row, "email"), _password_hash(row),
+                        UserStatus(_field(row, "status")), datetime.fromisoformat(_field(row, "created_at")),
+                        datetime.fromisoformat(_field(row, "updated_at")), _version(row))
+    user.validate()
+    return user
+
+def _named_to_row(entity:Role | Permission) -> dict:
+    return {"id": entity.id, "name": entity.name, "description": entity.description,
+            "created_at": entity.created_at.isoformat(), "updated_at": entity.updated_at.isoformat(),
+            "version": entity.version}
+
+def _named_from_row(cls, row:dict):
+    entity = cls.restore(_field(row, "id"), _field(row, "name").strip().lower(), (row.get("description") or "").strip(),
+                         datetime.fromisoformat(_field(row, "created_at")),
+                         datetime.fromisoformat(_field(row, "updated_at")), _version(row))
+    entity.validate()
+    return entity
+
+def _entity_key(entity) -> str:
+    return entity.id
+
+def _user_role_key(relation:UserRole) -> tuple[str, str]:
+    return (relation.user_id, relation.role_id)
+
+def _role_permission_key(relation:RolePermission) -> tuple[str, str]:
+    return (relation.role_id, relation.permission_id)
+
+def _iter_pages(repository, key:Callable, page_size:int) -> Iterator:
+    """Recorre el repositorio con get_page: iter_all recorre el dict vivo y falla si otro hilo escribe.
+
+    Los repositorios sin paginacion (solo lectura, como los del snapshot mmap) se recorren con iter_all.
+    """
+    if not hasattr(repository, "get_page"):
+        yield from repository.iter_all()
+        return
+    after = None
+    while page := repository.get_page(after, page_size):
+        yield from page
+        after = key(page[-1])
+
+
+class TransferService():
+
+    def __init__(self, user_repository:UserRepository | None = None, role_repository:RoleRepository | None = None,
+                 permission_repository:PermissionRepository | None = None,
+                 user_role_repository:UserRoleRepository | None = None,
+                 role_permission_repository:RolePermissionRepository | None = None, chunk_size:int = 1000):
+        self.user_repository = user_repository or UserRepository()
+        self.role_repository = role_repository or RoleRepository()
+        self.permission_repository = permission_repository or PermissionRepository()
+        self.user_role_repository = user_role_repository or UserRoleRepository()
+        self.role_permission_repository = role_permission_repository or RolePermissionRepository()
+        self.chunk_size = chunk_size
+
+    # -------------------- Exportacion --------------------
+
+    def export_users(self, path:str, include_password_hashes:bool = False) -> int:
+        """Exporta los usuarios; los hashes de contraseña solo se incluyen si se pide explicitamente.
+
+        Sin include_password_hashes el archivo sirve para consulta pero no para import_users, que
+        rechaza cada fila sin hash porque el usuario no podria iniciar sesion.
+        """
+        fields = USER_FIELDS + ("password",) if include_password_hashes else USER_FIELDS
+        rows = (_user_to_row(user, include_password_hashes)
+                for user in _iter_pages(self.user_repository, _entity_key, self.chunk_size))
+        return write_rows(path, fields, rows, self.chunk_size)
+
+    def export_roles(self, path:str) -> int:
+        rows = (_named_to_row(role) for role in _iter_pages(self.role_repository, _entity_key, self.chunk_size))
+        return write_rows(path, NAMED_FIELDS, rows, self.chunk_size)
+
+    def export_permissions(self, path:str) -> int:
+        rows = (_named_to_row(permission)
+                for permission in _iter_pages(self.permission_repository, _entity_key, self.chunk_size))
+        return write_rows(path, NAMED_FIELDS, rows, self.chunk_size)
+
+    def export_user_roles(self, path:str) -> int:
+        rows = ({"user_id": relation.user_id, "role_id": relation.role_id}
+                for relation in _iter_pages(self.user_role_repository, _user_role_key, self.chunk_size))
+        return write_rows(path, USER_ROLE_FIELDS, rows, self.chunk_size)
+
+    def export_role_permissions(self, path:str) -> int:
+        rows = ({"role_id": relation.role_id, "permission_id": relation.permission_id}
+                for relation in _iter_pages(self.role_permission_repository, _role_permission_key, self.chunk_size))
+        return write_rows(path, ROLE_PERMISSION_FIELDS, rows, self.chunk_size)
+
+    # -------------------- Importacion --------------------
+
+    def iter_import_users(self, path:str) -> Iterator[dict]:
+        """Importa usuarios exportados con sus hashes (include_password_hashes=True), emitiendo un reporte por fila.
+
+        Las filas sin hash o con un hash que ningun algoritmo registrado reconoce se reportan como fallidas.
+
+        Cada bloque se inserta con add_many; si el bloque choca con datos existentes se
+        reintenta fila a fila para informar cuales fallaron.
+        """
+        rows = enumerate(read_rows(path))
+        while chunk := list(islice(rows, self.chunk_size)):
+            reports, users = [], []
+            for index, row in chunk:
+                report = {"row": index, "key": row.get("username"), "success": False, "error": None}
+                reports.append(report)
+                try:
+                    users.append((report, _user_from_row(row)))
+                except _IMPORT_ERRORS as error:
+                    report["error"] = getattr(error, "message", str(error))
+            try:
+                self.user_repository.add_many([user for _, user in users])
+                for report, _ in users:
+                    report["success"] = True
+            except UserError:
+                for report, user in users:
+                    self._add_reporting(report, self.user_repository.add, user)
+            yield from reports
+
+    def iter_import_roles(self, path:str) -> Iterator[dict]:
+        return self._iter_import(path, "name", lambda row: _named_from_row(Role, row), self.role_repository.add)
+
+    def iter_import_permissions(self, path:str) -> Iterator[dict]:
+        return self._iter_import(path, "name", lambda row: _named_from_row(Permission, row),
+                                 self.permission_repository.add)
+
+    def iter_import_user_roles(self, path:str) -> Iterator[dict]:
+        return self._iter_import(path, "user_id", lambda row: UserRole(_field(row, "user_id"), _field(row, "role_id")),
+                                 self.user_role_repository.add)
+
+    def iter_import_role_permissions(self, path:str) -> Iterator[dict]:
+        return self._iter_import(path, "role_id",
+                                 lambda row: RolePermission(_field(row, "role_id"), _field(row, "permission_id")),
+                                 self.role_permission_repository.add)
+
+    def import_users(self, path:str) -> dict:
+        """Importa usuarios, retorna la cantidad de filas importadas y fallidas"""
+        return self._summary(self.iter_import_users(path))
+
+    def import_roles(self, path:str) -> dict:
+        return self._summary(self.iter_import_roles(path))
+
+    def import_permissions(self, path:str) -> dict:
+        return self._summary(self.iter_import_permissions(path))
+
+    def import_user_roles(self, path:str) -> dict:
+        return self._summary(self.iter_import_user_roles(path))
+
+    def import_role_permissions(self, path:str) -> dict:
+        return self._summary(self.iter_import_role_permissions(path))
+
+    def _iter_import(self, path:str, key:str, build:Callable[[dict], object], add:Callable) -> Iterator[dict]:
+        for index, row in enumerate(read_rows(path)):
+            report = {"row": index, "key": row.get(key), "success": False, "error": None}
+            try:
+                entity = build(row)
+            except _IMPORT_ERRORS as error:
+                report["error"] = getattr(error, "message", str(error))
+            else:
+                self._add_reporting(report, add, entity)
+            yield report
+
+    @staticmethod
+    def _add_reporting(report:dict, add:Callable, entity) -> None:
+        try:
+            add(entity)
+            report["success"] = True
+        except _IMPORT_ERRORS as error:
+            report["error"] = getattr(error, "message", str(error))
+
+    @staticmethod
+    def _summary(reports:Iterator[dict]) -> dict:
+        counts = Counter(report["success"] for report in reports)
+        return {"imported": counts[True], "failed": counts[False]}
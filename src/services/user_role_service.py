@@ -1,40 +1,48 @@
 from src.models.user_role import UserRole
 from src.repositories.user_role_repository import UserRoleRepository
+from src.services.authorization_service import AuthorizationService
+from src.exceptions.relation_exceptions import require_ids
 
 
 class UserRoleService:
-    def __init__(self, repository: UserRoleRepository | None = None):
+    def __init__(self, repository: UserRoleRepository | None = None, authorization: AuthorizationService | None = None):
         self.repository = repository or UserRoleRepository()
+        self.authorization = authorization
 
     def assign_role(self, user_id: str, role_id: str) -> UserRole:
         """Asigna un rol a un usuario"""
-        if not user_id or not role_id:
-            raise ValueError("user_id y role_id son requeridos")
+        require_ids(user_id=user_id, role_id=role_id)
         relation = UserRole(user_id, role_id)
         self.repository.add(relation)
+        if self.authorization:
+            self.authorization.on_role_assigned(user_id, role_id)
         return relation
 
     def get_user_roles(self, user_id: str) -> list[UserRole]:
         """Obtiene todos los roles de un usuario"""
-        if not user_id:
-            raise ValueError("user_id es requerido")
+        require_ids(user_id=user_id)
         return self.repository.get_roles_by_user(user_id)
 
     def get_users_by_role(self, role_id: str) -> list[UserRole]:
         """Obtiene todos los usuarios que tienen un rol específico"""
-        if not role_id:
-            raise ValueError("role_id es requerido")      
+        require_ids(role_id=role_id)
         return self.repository.get_users_by_role(role_id)
 
     def get_all_relations(self) -> list[UserRole]:
         """Obtiene todas las relaciones usuario-rol"""
         return self.repository.get_all()
 
+    def get_relations_page(self, after: tuple[str, str] | None = None, limit: int = 100) -> list[UserRole]:
+        """Obtiene una pagina de relaciones ordenada por (user_id, role_id), a partir del cursor after"""
+        return self.repository.get_page(after, limit)
+
     def update_user_role(self, user_id: str, old_role_id: str, new_role_id: str) -> UserRole:
         """Actualiza el rol de un usuario"""
-        if not user_id or not old_role_id or not new_role_id:
-            raise ValueError("user_id, old_role_id y new_role_id son requeridos")
-        return self.repository.update_role_relation(user_id, old_role_id, new_role_id)
+        require_ids(user_id=user_id, old_role_id=old_role_id, new_role_id=new_role_id)
+        relation = self.repository.update_role_relation(user_id, old_role_id, new_role_id)
+        if self.authorization:
+            self.authorization.on_role_replaced(user_id, old_role_id, new_role_id)
+        return relation
 
     def user_has_role(self, user_id: str, role_id: str) -> bool:
         """Verifica si un usuario tiene un rol específico"""
@@ -45,6 +53,7 @@ class UserRoleService:
     
     def remove_role(self, user_id: str, role_id: str) -> None:
         """Remueve un rol de un usuario"""
-        if not user_id or not role_id:
-            raise ValueError("user_id y role_id son requeridos")      
-        self.repository.delete(user_id, role_id)
\ No newline at end of file
+        require_ids(user_id=user_id, role_id=role_id)
+        self.repository.delete(user_id, role_id)
+        if self.authorization:
+            self.authorization.on_role_removed(user_id, role_id)
\ No newline at end of file
@@ -1,26 +1,142 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import islice
 from src.models.user import User
 from src.exceptions.user_exceptions import UserValidationError, SameEmailError
 from src.constants import messages
 from src.repositories.user_repository import UserRepository
-from src.security.password_utils import verify_password, hash_password
+from src.security.password_utils import verify_password, hash_password, get_password_pool, needs_rehash
+from src.exceptions.security_exceptions import PasswordHashingBusyError
+from src.exceptions.concurrency_exceptions import VersionConflictError
 from src.models.user_status import UserStatus
 
 
 class UserService():
     
-    def __init__(self, repository:UserRepository | None = None):
+    def __init__(self, repository:UserRepository | None = None, rehash_on_login:bool = True):
         self.repository = repository or UserRepository()
+        self.rehash_on_login = rehash_on_login
 
     def create_user(self, username:str, email:str, password:str) -> User:
         """Crea un nuevo usuario, retorna el usuario creado"""
-        if not password or len(password) < 6:
-            raise UserValidationError(messages.USER_INVALID_PASSWORD)
-        if self._email_exists(email):
-            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        self.check_new_user(username, email, password)
         password_hash = hash_password(password)
         user = User(username, email, password_hash)
         self.repository.add(user)
         return user
+
+    def create_users_bulk(self, rows:Iterable, chunk_size:int = 500, executor:Executor | None = None) -> list[dict]:
+        """Crea usuarios en lote, retorna un reporte por fila (ver iter_create_users_bulk)"""
+        return list(self.iter_create_users_bulk(rows, chunk_size, executor))
+
+    def iter_create_users_bulk(self, rows:Iterable, chunk_size:int = 500, executor:Executor | None = None) -> Iterator[dict]:
+        """Crea usuarios en lote consumiendo rows por bloques y emitiendo el reporte de cada fila.
+
+        Cada fila es un dict con username, email y password o una tupla en ese orden. Las filas
+        se validan y deduplican contra los indices del repositorio, los hashes de cada bloque se
+        calculan en paralelo y los usuarios validos se insertan en lote. Solo se mantiene en
+        memoria un bloque a la vez.
+
+        Sin executor se usa uno propio del lote con tantos hilos como el pool de contraseñas: un
+        bloque entero no cabe en la cola acotada del pool compartido y la llenaria para los logins.
+        """
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=get_password_pool().max_workers,
+                                    thread_name_prefix="password-bulk") as bulk_executor:
+                yield from self._iter_create_chunks(rows, chunk_size, bulk_executor)
+        else:
+            yield from self._iter_create_chunks(rows, chunk_size, executor)
+
+    def _iter_create_chunks(self, rows:Iterable, chunk_size:int, executor:Executor) -> Iterator[dict]:
+        iterator = iter(rows)
+        index = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self._create_users_chunk(chunk, index, executor)
+            index += len(chunk)
+
+    @staticmethod
+    def _unpack_row(row) -> tuple[str, str, str]:
+        try:
+            username, email, password = ((row["username"], row["email"], row["password"])
+                                         if isinstance(row, dict) else row)
+        except (KeyError, TypeError, ValueError) as error:
+            raise UserValidationError(messages.INVALID_BULK_ROW) from error
+        if not all(isinstance(value, str) for value in (username, email, password)):
+            raise UserValidationError(messages.INVALID_BULK_ROW)
+        return username, email, password
+
+    def _create_users_chunk(self, chunk:list, start:int, executor:Executor) -> list[dict]:
+        reports: list[dict] = []
+        pending: list[tuple[dict, User, str]] = []
+        usernames: set[str] = set()
+        email_keys: set[str] = set()
+        for offset, row in enumerate(chunk):
+            report = {"row": start + offset, "username": None, "success": False, "error": None}
+            reports.append(report)
+            try:
+                username, email, password = self._unpack_row(row)
+                report["username"] = username
+                self.check_new_user(username, email, password)
+                user = User(username, email, password)
+                email_key = email.strip().lower()
+                if username in usernames:
+                    raise UserValidationError(messages.USER_ALREADY_EXISTS)
+                if email_key in email_keys:
+                    raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+            except UserValidationError as error:
+                report["error"] = error.message
+                continue
+            usernames.add(username)
+            email_keys.add(email_key)
+            pending.append((report, user, password))
+
+        hashes = executor.map(hash_password, [password for _, _, password in pending])
+        users = []
+        for (_, user, _), password_hash in zip(pending, hashes):
+            user.password = password_hash
+            users.append(user)
+        try:
+            self.repository.add_many(users)
+            for report, _, _ in pending:
+                report["success"] = True
+        except UserValidationError:
+            # add_many es atomico: si otra escritura tomo un username o email no se inserto ninguno,
+            # asi que se reintenta fila por fila para que solo fallen las que chocan
+            for (report, _, _), user in zip(pending, users):
+                try:
+                    self.repository.add(user)
+                    report["success"] = True
+                except UserValidationError as error:
+                    report["error"] = error.message
+        return reports
+
+    @staticmethod
+    def check_password(password:str) -> None:
+        """Valida una contraseña nueva antes de calcular su hash; AsyncUserService tambien la usa"""
+        if not password or len(password) < 6:
+            raise UserValidationError(messages.USER_INVALID_PASSWORD)
+
+    @staticmethod
+    def check_username_change(user:User, new_username:str) -> None:
+        if user.username == new_username:
+            raise UserValidationError(messages.SAME_USERNAME)
+
+    @staticmethod
+    def check_email_change(user:User, new_email:str) -> None:
+        if user.email == new_email:
+            raise SameEmailError(messages.SAME_EMAIL)
+
+    def check_new_user(self, username:str, email:str, password:str) -> None:
+        """Validaciones previas al hash para no gastar bcrypt en solicitudes que van a fallar; AsyncUserService
+        tambien la usa con repositorios en memoria"""
+        self.check_password(password)
+        if self._email_exists(email):
+            raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
+        if username and self.repository.find(username):
+            raise UserValidationError(messages.USER_ALREADY_EXISTS)
     
     def get_user(self, username:str) -> User:
         """Obtiene un usuario por username"""
@@ -30,42 +146,45 @@ class UserService():
         """Obtiene todos los usuarios registrados"""
         return self.repository.get_all()
        
+    def get_users_page(self, after: str | None = None, limit: int = 100) -> list[User]:
+        """Obtiene una pagina de usuarios ordenada por id, a partir del cursor after (id del ultimo recibido)"""
+        return self.repository.get_page(after, limit)
+
     def get_user_by_email(self, email: str) -> User | None:
         """Obtiene un usuario por email"""
         return self.repository.find_by_email(email)
     
-    def update_username(self, current_username: str, new_username: str) -> User:
+    def update_username(self, current_username: str, new_username: str, expected_version: int | None = None) -> User:
         """Actualiza el username de un usuario"""
-        user = self.get_user(current_username)       
-        if user.username == new_username:
-            raise UserValidationError(messages.SAME_USERNAME)      
+        self.check_username_change(self.get_user(current_username), new_username)
         # Verificar que el nuevo username no exista
         if self.repository.find(new_username):
             raise UserValidationError(messages.USER_ALREADY_EXISTS)       
-        return self.repository.update_username(current_username, new_username)
+        return self.repository.update_username(current_username, new_username, expected_version)
     
-    def update_email(self, username:str, new_email:str) -> dict:
+    def update_email(self, username:str, new_email:str, expected_version: int | None = None) -> dict:
         """Actualiza el email de un usuario"""
         user = self.get_user(username)
-        if user.email == new_email:
-            raise SameEmailError(messages.SAME_EMAIL)
-        # Validar que el nuevo email no esté registrado
-        if self._email_exists(new_email):
+        self.check_email_change(user, new_email)
+        # Validar que el nuevo email no esté registrado por otro usuario (la busqueda ignora
+        # mayusculas, asi que cambiar solo las del propio email encuentra al mismo usuario)
+        owner = self.repository.find_by_email(new_email)
+        if owner is not None and owner.id != user.id:
             raise UserValidationError(messages.EMAIL_ALREADY_REGISTERED)
-        user_updated = self.repository.update_email(username, new_email)
+        user_updated = self.repository.update_email(username, new_email, expected_version)
         # Mas adelante se modificara con un objeto especifico para respuestas
         return {"username": user_updated.username, "email": user_updated.email}
 
-    def update_password(self, username: str, current_password: str, new_password: str) -> User:
+    def update_password(self, username: str, current_password: str, new_password: str,
+                              expected_version: int | None = None) -> User:
         """Actualiza la contraseña de un usuario"""
-        if not new_password or len(new_password) < 6:
-            raise UserValidationError(messages.USER_INVALID_PASSWORD)
+        self.check_password(new_password)
         user = self.get_user(username)
         # Verificar que la contraseña actual sea correcta
         if not verify_password(current_password, user.password):
             raise UserValidationError(messages.WRONG_PASSWORD)
         new_password_hash = hash_password(new_password)
-        return self.repository.update_password(username, new_password_hash)
+        return self.repository.update_password(username, new_password_hash, expected_version)
     
     def delete_user(self, username:str) -> None:
         """Elimina un usuario registrado"""
@@ -76,23 +195,51 @@ class UserService():
         existing_user = self.repository.find_by_email(email)
         return existing_user is not None
     
-    def activate_user(self, username: str) -> User:
+    def activate_user(self, username: str, expected_version: int | None = None) -> User:
         """Activa un usuario"""
-        return self.repository.update_status(username, UserStatus.ACTIVE)
+        return self.repository.update_status(username, UserStatus.ACTIVE, expected_version)
     
-    def deactivate_user(self, username: str) -> User:
+    def deactivate_user(self, username: str, expected_version: int | None = None) -> User:
         """Desactiva un usuario"""
-        return self.repository.update_status(username, UserStatus.INACTIVE)
+        return self.repository.update_status(username, UserStatus.INACTIVE, expected_version)
     
-    def suspend_user(self, username: str) -> User:
+    def suspend_user(self, username: str, expected_version: int | None = None) -> User:
         """Suspende un usuario"""
-        return self.repository.update_status(username, UserStatus.SUSPENDED)
+        return self.repository.update_status(username, UserStatus.SUSPENDED, expected_version)
     
-    def block_user(self, username: str) -> User:
+    def block_user(self, username: str, expected_version: int | None = None) -> User:
         """Bloquea un usuario"""
-        return self.repository.update_status(username, UserStatus.BLOCKED)
+        return self.repository.update_status(username, UserStatus.BLOCKED, expected_version)
     
     def verify_user_password(self, username: str, password: str) -> bool:
         """Verifica la contraseña de un usuario"""
         user = self.get_user(username)
-        return verify_password(password, user.password)
\ No newline at end of file
+        valid = verify_password(password, user.password)
+        if valid:
+            self._schedule_rehash(user.username, password, user.password)
+        return valid
+
+    def _schedule_rehash(self, username: str, password: str, current_hash: str) -> Future | None:
+        """Si el hash usa un costo desactualizado, lo regenera en segundo plano tras un login correcto"""
+        if not self.rehash_on_login or not needs_rehash(current_hash):
+            return None
+        try:
+            return get_password_pool().submit(self._rehash_password, username, password, current_hash)
+        except PasswordHashingBusyError:
+            # Con el pool saturado se reintentara en el proximo login
+            return None
+
+    def _rehash_password(self, username: str, password: str, current_hash: str) -> None:
+        new_hash = hash_password(password)
+        user = self.repository.find(username)
+        if user is None:
+            return
+        version = user.version
+        # Si la contraseña cambio mientras tanto no se pisa el hash nuevo; expected_version cubre
+        # el cambio que llegue entre esta lectura y la escritura
+        if user.password != current_hash:
+            return
+        try:
+            self.repository.update_password(username, new_hash, expected_version=version)
+        except VersionConflictError:
+            return
\ No newline at end of file
@@ -10,6 +10,8 @@ from src.services.role_permission_service import RolePermissionService
 from src.services.role_service import RoleService
 from src.services.permission_service import PermissionService
 from src.services.user_role_service import UserRoleService
+from src.services.authorization_service import AuthorizationService
+from src.security import password_utils
 
 
 @pytest.fixture
@@ -52,6 +54,22 @@ def permission_service():
 def user_role_service():
     return UserRoleService()
 
+@pytest.fixture
+def authorization_service():
+    return AuthorizationService()
+
+@pytest.fixture
+def rbac_services(authorization_service):
+    user_role_service = UserRoleService(authorization_service.user_role_repository, authorization_service)
+    role_permission_service = RolePermissionService(authorization_service.role_permission_repository, authorization_service)
+    return user_role_service, role_permission_service
+
+@pytest.fixture
+def bcrypt_rounds():
+    original = password_utils.get_bcrypt_rounds()
+    yield password_utils
+    password_utils.set_bcrypt_rounds(original)
+
 @pytest.fixture
 def sample_user_1():
     return User(username="Tomas", email="tomas01@correo.com", password="secret01")
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import pytest
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
+from src.exceptions.role_exceptions import RoleNotFoundError, RoleValidationError
+from src.exceptions.permission_exceptions import PermissionValidationError
+from src.models.user_status import UserStatus
+from src.repositories.role_repository import RoleRepository
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.sqlite_role_repository import SQLiteRoleRepository
+from src.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.repositories.sqlite_user_role_repository import SQLiteUserRoleRepository
+from src.repositories.async_repository import AsyncRoleRepository, ThreadedRepository, as_async_repository, runs_inline
+from src.services.async_user_service import AsyncUserService
+from src.services.async_role_service import AsyncRoleService
+from src.services.async_permission_service import AsyncPermissionService
+from src.services.async_user_role_service import AsyncUserRoleService
+from src.services.async_role_permission_service import AsyncRolePermissionService
+from src.services.authorization_service import AuthorizationService
+
+
+class RecordingRoleRepository(RoleRepository):
+    """Registra en que hilo se ejecuta cada llamada"""
+    def __init__(self, blocking_io=False):
+        super().__init__()
+        self.blocking_io = blocking_io
+        self.threads = []
+
+    def add(self, role):
+        self.threads.append(threading.get_ident())
+        return super().add(role)
+
+
+class RecordingAuthorization(AuthorizationService):
+    """Registra en que hilo se ejecuta cada hook"""
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def on_role_assigned(self, user_id, role_id):
+        self.threads.append(threading.get_ident())
+        super().on_role_assigned(user_id, role_id)
+
+
+class NativeAsyncRoleRepository:
+    """Implementacion async minima que cumple AsyncRoleRepository"""
+    def __init__(self):
+        self.repository = RoleRepository()
+    async def add(self, role): return self.repository.add(role)
+    async def find(self, name): return self.repository.find(name)
+    async def get(self, name): return self.repository.get(name)
+    async def get_all(self): return self.repository.get_all()
+    async def get_page(self, after=None, limit=100): return self.repository.get_page(after, limit)
+    async def update_description(self, name, new_description, expected_version=None):
+        return self.repository.update_description(name, new_description, expected_version)
+    async def delete(self, name): return self.repository.delete(name)
+
+
+#---------------------REPOSITORIES---------------------
+
+def test_repositories_are_normalized_once():
+    repository = RoleRepository()
+    assert as_async_repository(repository) is repository and runs_inline(repository)
+    blocking = RecordingRoleRepository(blocking_io=True)
+    adapted = as_async_repository(blocking)
+    assert isinstance(adapted, ThreadedRepository) and adapted.repository is blocking
+    assert as_async_repository(adapted) is adapted and not runs_inline(adapted)
+    native = NativeAsyncRoleRepository()
+    assert as_async_repository(native) is native and not runs_inline(native)
+
+def test_in_memory_services_use_the_sync_fast_path():
+    repository = RoleRepository()
+    service = AsyncRoleService(repository)
+    assert service.repository is repository and service._inline.repository is repository
+    assert AsyncRoleService(NativeAsyncRoleRepository())._inline is None
+
+def test_blocking_repositories_run_off_loop():
+    repository = RecordingRoleRepository(blocking_io=True)
+    service = AsyncRoleService(repository)
+    assert isinstance(service.repository, ThreadedRepository)
+    async def scenario():
+        await service.create_role("admin")
+        return threading.get_ident()
+    loop_thread = asyncio.run(scenario())
+    assert repository.threads and repository.threads[0] != loop_thread
+
+def test_in_memory_repositories_run_on_loop():
+    repository = RecordingRoleRepository()
+    async def scenario():
+        await AsyncRoleService(repository).create_role("admin")
+        return threading.get_ident()
+    assert repository.threads == [asyncio.run(scenario())]
+
+def test_native_async_repository_satisfies_protocol():
+    repository = NativeAsyncRoleRepository()
+    assert isinstance(repository, AsyncRoleRepository)
+    service = AsyncRoleService(repository)
+    async def scenario():
+        await service.create_role(" Admin ", "Todo")
+        await service.update_role_description("admin", "Acceso total")
+        return await service.get_role("admin")
+    assert asyncio.run(scenario()).description == "Acceso total"
+
+def test_authorization_hooks_run_with_the_repository_executor():
+    async def scenario(repository, authorization):
+        await AsyncUserRoleService(repository, authorization).assign_role("u1", "r1")
+        return threading.get_ident()
+    in_memory = RecordingAuthorization()
+    assert in_memory.threads == [asyncio.run(scenario(in_memory.user_role_repository, in_memory))]
+    blocking = RecordingAuthorization()
+    repository = SQLiteUserRoleRepository(SQLitePool())
+    loop_thread = asyncio.run(scenario(repository, blocking))
+    assert blocking.threads and blocking.threads[0] != loop_thread
+
+#---------------------SERVICES---------------------
+
+def test_role_service_over_sqlite():
+    service = AsyncRoleService(SQLiteRoleRepository(SQLitePool()))
+    async def scenario():
+        await service.create_role("admin")
+        await service.create_role("editor")
+        roles = [role.name for role in await service.get_all_roles()]
+        await service.delete_role("admin")
+        with pytest.raises(RoleNotFoundError):
+            await service.get_role("admin")
+        with pytest.raises(RoleValidationError):
+            await service.get_role("")
+        return roles
+    assert asyncio.run(scenario()) == ["admin", "editor"]
+
+def test_permission_service():
+    service = AsyncPermissionService()
+    async def scenario():
+        await service.create_permission("Read", "Leer")
+        permission = await service.update_permission_description("read", "Lectura")
+        with pytest.raises(PermissionValidationError):
+            await service.create_permission(" ")
+        await service.delete_permission("read")
+        return permission, await service.get_all_permissions()
+    permission, remaining = asyncio.run(scenario())
+    assert permission.description == "Lectura"
+    assert remaining == []
+
+def test_relation_services_notify_authorization():
+    authorization = AuthorizationService()
+    user_roles = AsyncUserRoleService(authorization.user_role_repository, authorization)
+    role_permissions = AsyncRolePermissionService(authorization.role_permission_repository, authorization)
+    async def scenario():
+        await role_permissions.add_permission_to_role("r1", "p1")
+        await user_roles.assign_role("u1", "r1")
+        assert authorization.has_permission("u1", "p1")
+        await role_permissions.update_permission_relation("r1", "p1", "p2")
+        assert authorization.get_user_permissions("u1") == frozenset({"p2"})
+        await user_roles.update_user_role("u1", "r1", "r2")
+        assert await user_roles.user_has_role("u1", "r2")
+        assert [r.user_id for r in await user_roles.get_users_by_role("r2")] == ["u1"]
+        await user_roles.remove_role("u1", "r2")
+        await role_permissions.remove_permission_from_role("r1", "p2")
+        return await user_roles.get_all_relations(), await role_permissions.get_all_relations()
+    assert asyncio.run(scenario()) == ([], [])
+
+def test_user_service_over_sqlite(sample_user_data_1, bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    service = AsyncUserService(SQLiteUserRepository(SQLitePool()))
+    async def scenario():
+        await service.create_user(**sample_user_data_1)
+        with pytest.raises(UserValidationError) as error:
+            await service.create_user("otro", sample_user_data_1["email"], "pass123")
+        assert error.value.message == messages.EMAIL_ALREADY_REGISTERED
+        assert await service.verify_user_password("xion", "passxion") is True
+        assert await service.verify_user_password("xion", "wrong") is False
+        await service.update_password("xion", "passxion", "nueva123")
+        await service.update_username("xion", "xion2")
+        assert await service.update_email("xion2", "nuevo@correo.com") == {"username": "xion2", "email": "nuevo@correo.com"}
+        user = await service.activate_user("xion2")
+        assert user.status == UserStatus.ACTIVE
+        assert await service.verify_user_password("xion2", "nueva123") is True
+        await service.delete_user("xion2")
+        with pytest.raises(UserNotFoundError):
+            await service.get_user("xion2")
+    asyncio.run(scenario())
+
+def test_user_service_rehashes_in_background(bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    service = AsyncUserService()
+    async def scenario():
+        user = await service.create_user("rehash", "rehash@correo.com", "pass123")
+        old_hash = user.password
+        bcrypt_rounds.set_bcrypt_rounds(5)
+        assert await service.verify_user_password("rehash", "pass123") is True
+        await asyncio.gather(*service._background)
+        return old_hash, (await service.get_user("rehash")).password
+    old_hash, new_hash = asyncio.run(scenario())
+    assert old_hash.startswith("$2b$04$")
+    assert new_hash.startswith("$2b$05$")
@@ -0,0 +1,131 @@
+import pytest
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.services.authorization_service import pack_bitmap
+
+
+# -------------------- HAS PERMISSION --------------------
+
+def test_has_permission_through_role(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    role_permission_service.add_permission_to_role("r1", "p1")
+    assert authorization_service.has_permission("u1", "p1") is True
+    assert authorization_service.has_permission("u1", "p2") is False
+
+def test_has_permission_without_roles(authorization_service):
+    assert authorization_service.has_permission("u1", "p1") is False
+
+def test_unknown_users_are_not_cached(authorization_service, rbac_services):
+    user_role_service, _ = rbac_services
+    assert authorization_service.check_many([(f"ghost{i}", "p1") for i in range(100)]) == [False] * 100
+    assert authorization_service.get_user_permissions("ghost") == frozenset()
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.remove_role("u1", "r1")
+    assert authorization_service.has_permission("u1", "p1") is False
+    assert authorization_service._permissions_by_user == {}
+
+@pytest.mark.parametrize("user_id, permission_id", [("", "p1"), ("u1", ""), (None, "p1")])
+def test_has_permission_with_empty_values(authorization_service, user_id, permission_id):
+    assert authorization_service.has_permission(user_id, permission_id) is False
+
+def test_get_user_permissions_merges_roles(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    role_permission_service.add_permission_to_role("r1", "p1")
+    role_permission_service.add_permission_to_role("r2", "p2")
+    role_permission_service.add_permission_to_role("r2", "p1")
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.assign_role("u1", "r2")
+    assert authorization_service.get_user_permissions("u1") == frozenset({"p1", "p2"})
+
+
+# -------------------- INCREMENTAL UPDATES --------------------
+
+def test_assign_role_updates_cached_permissions(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    role_permission_service.add_permission_to_role("r1", "p1")
+    assert authorization_service.has_permission("u1", "p1") is False
+    user_role_service.assign_role("u1", "r1")
+    assert authorization_service.has_permission("u1", "p1") is True
+
+def test_remove_role_keeps_permissions_granted_by_other_role(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    role_permission_service.add_permission_to_role("r1", "p1")
+    role_permission_service.add_permission_to_role("r2", "p1")
+    role_permission_service.add_permission_to_role("r2", "p2")
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.assign_role("u1", "r2")
+    assert authorization_service.get_user_permissions("u1") == frozenset({"p1", "p2"})
+    user_role_service.remove_role("u1", "r2")
+    assert authorization_service.get_user_permissions("u1") == frozenset({"p1"})
+
+def test_update_user_role_updates_cached_permissions(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    role_permission_service.add_permission_to_role("r1", "p1")
+    role_permission_service.add_permission_to_role("r2", "p2")
+    user_role_service.assign_role("u1", "r1")
+    assert authorization_service.has_permission("u1", "p1") is True
+    user_role_service.update_user_role("u1", "r1", "r2")
+    assert authorization_service.has_permission("u1", "p1") is False
+    assert authorization_service.has_permission("u1", "p2") is True
+
+def test_grant_and_revoke_permission_updates_role_members(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.assign_role("u2", "r1")
+    assert authorization_service.has_permission("u1", "p1") is False
+    assert authorization_service.has_permission("u2", "p1") is False
+    role_permission_service.add_permission_to_role("r1", "p1")
+    assert authorization_service.has_permission("u1", "p1") is True
+    assert authorization_service.has_permission("u2", "p1") is True
+    role_permission_service.remove_permission_from_role("r1", "p1")
+    assert authorization_service.has_permission("u1", "p1") is False
+    assert authorization_service.has_permission("u2", "p1") is False
+
+def test_update_permission_relation_updates_role_members(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    role_permission_service.add_permission_to_role("r1", "p1")
+    assert authorization_service.has_permission("u1", "p1") is True
+    role_permission_service.update_permission_relation("r1", "p1", "p2")
+    assert authorization_service.get_user_permissions("u1") == frozenset({"p2"})
+
+def test_invalidate_rebuilds_from_repositories(authorization_service):
+    authorization_service.user_role_repository.add(UserRole("u1", "r0"))
+    assert authorization_service.has_permission("u1", "p1") is False
+    authorization_service.user_role_repository.add(UserRole("u1", "r1"))
+    authorization_service.role_permission_repository.add(RolePermission("r1", "p1"))
+    assert authorization_service.has_permission("u1", "p1") is False
+    authorization_service.invalidate("u1")
+    assert authorization_service.has_permission("u1", "p1") is True
+
+# -------------------- CHECK MANY --------------------
+
+def test_check_many_preserves_order(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.assign_role("u2", "r1")
+    role_permission_service.add_permission_to_role("r1", "p1")
+    checks = [("u1", "p1"), ("u2", "p2"), ("u3", "p1"), ("u1", "p2"), ("u2", "p1"), ("", "p1")]
+    assert authorization_service.check_many(checks) == [True, False, False, False, True, False]
+    assert authorization_service.check_many([]) == []
+
+def test_check_many_resolves_each_user_once(authorization_service, rbac_services, monkeypatch):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    user_role_service.assign_role("u2", "r1")
+    role_permission_service.add_permission_to_role("r1", "p1")
+    authorization_service.invalidate()
+    calls = []
+    original = authorization_service._role_permissions
+    monkeypatch.setattr(authorization_service, "_role_permissions", lambda role_id: calls.append(role_id) or original(role_id))
+    authorization_service.check_many([("u1", "p1"), ("u2", "p1"), ("u1", "p2"), ("u2", "p3")])
+    assert calls == ["r1"]
+
+def test_check_many_bitmap(authorization_service, rbac_services):
+    user_role_service, role_permission_service = rbac_services
+    user_role_service.assign_role("u1", "r1")
+    role_permission_service.add_permission_to_role("r1", "p1")
+    checks = [("u1", "p1")] + [("u1", "p2")] * 8 + [("u1", "p1")]
+    assert authorization_service.check_many_bitmap(checks) == bytes([0b00000001, 0b00000010])
+    assert pack_bitmap([]) == b""
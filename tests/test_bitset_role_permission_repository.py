@@ -0,0 +1,76 @@
+import pytest
+from src.models.role_permission import RolePermission
+from src.repositories.bitset_role_permission_repository import BitsetRolePermissionRepository
+
+
+@pytest.fixture
+def bitset_repo():
+    return BitsetRolePermissionRepository()
+
+
+#---------------------ADD/FIND---------------------
+
+def test_add_and_find_relation(bitset_repo, sample_role1_perm1_data):
+    bitset_repo.add(RolePermission(**sample_role1_perm1_data))
+    relation = bitset_repo.find("r1", "p1")
+    assert isinstance(relation, RolePermission)
+    assert relation.role_id == "r1"
+    assert relation.permission_id == "p1"
+    assert bitset_repo.find("r1", "p2") is None
+
+def test_add_existing_relation(bitset_repo, sample_role1_perm1_data):
+    bitset_repo.add(RolePermission(**sample_role1_perm1_data))
+    with pytest.raises(ValueError):
+        bitset_repo.add(RolePermission(**sample_role1_perm1_data))
+
+def test_get_permissions_and_roles(bitset_repo, sample_role1_perm1_data, sample_role1_perm2_data, sample_role2_perm1_data):
+    bitset_repo.add(RolePermission(**sample_role1_perm1_data))
+    bitset_repo.add(RolePermission(**sample_role2_perm1_data))
+    bitset_repo.add(RolePermission(**sample_role1_perm2_data))
+    assert [relation.permission_id for relation in bitset_repo.get_permissions_by_role("r1")] == ["p1", "p2"]
+    assert [relation.role_id for relation in bitset_repo.get_roles_by_permission("p1")] == ["r1", "r2"]
+    assert len(bitset_repo.get_all()) == 3
+    assert bitset_repo.get_roles_by_permission("p9") == []
+
+#---------------------UPDATE/DELETE---------------------
+
+def test_update_permission_relation(bitset_repo):
+    bitset_repo.add(RolePermission("r3", "p3"))
+    relation = bitset_repo.update_permission_relation("r3", "p3", "p5")
+    assert relation.permission_id == "p5"
+    assert bitset_repo.role_has_permission("r3", "p3") is False
+    assert bitset_repo.role_has_permission("r3", "p5") is True
+
+def test_update_nonexistent_relation(bitset_repo):
+    with pytest.raises(ValueError):
+        bitset_repo.update_permission_relation("r1", "p1", "p2")
+
+def test_delete_relation(bitset_repo, sample_role1_perm1_data):
+    bitset_repo.add(RolePermission(**sample_role1_perm1_data))
+    bitset_repo.delete("r1", "p1")
+    assert bitset_repo.find("r1", "p1") is None
+    assert bitset_repo.get_all() == []
+    with pytest.raises(ValueError):
+        bitset_repo.delete("r1", "p1")
+
+#---------------------BATCH---------------------
+
+def test_roles_mask_is_union(bitset_repo):
+    bitset_repo.add(RolePermission("r1", "p1"))
+    bitset_repo.add(RolePermission("r2", "p2"))
+    mask = bitset_repo.get_roles_mask(["r1", "r2", "unknown"])
+    assert mask == bitset_repo.get_role_mask("r1") | bitset_repo.get_role_mask("r2")
+    assert bitset_repo.get_granted_permissions(["r1", "r2"]) == {"p1", "p2"}
+
+def test_check_permissions(bitset_repo):
+    bitset_repo.add(RolePermission("r1", "p1"))
+    bitset_repo.add(RolePermission("r2", "p3"))
+    result = bitset_repo.check_permissions(["r1", "r2"], ["p1", "p2", "p3", "unknown"])
+    assert result == [True, False, True, False]
+
+def test_roles_grant_all(bitset_repo):
+    bitset_repo.add(RolePermission("r1", "p1"))
+    bitset_repo.add(RolePermission("r2", "p2"))
+    assert bitset_repo.roles_grant_all(["r1", "r2"], ["p1", "p2"]) is True
+    assert bitset_repo.roles_grant_all(["r1"], ["p1", "p2"]) is False
+    assert bitset_repo.roles_grant_all(["r1", "r2"], ["p1", "unknown"]) is False
@@ -0,0 +1,115 @@
+import pytest
+from src.models.user import User
+from src.repositories.bloom_filter import BloomFilter, BloomFilteredUserRepository
+
+
+class CountingRepository:
+    def __init__(self, repository):
+        self.repository = repository
+        self.reads = 0
+
+    def __getattr__(self, name):
+        if name in ("find", "find_by_email"):
+            self.reads += 1
+        return getattr(self.repository, name)
+
+
+@pytest.fixture
+def backend(user_repo):
+    return CountingRepository(user_repo)
+
+@pytest.fixture
+def filtered(backend):
+    return BloomFilteredUserRepository(backend, capacity=1000)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"user{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"otro{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    assert bloom.false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_bloom_filter_invalid_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
+
+def test_misses_skip_the_repository(filtered, backend, sample_user_1):
+    filtered.add(sample_user_1)
+    assert filtered.find("libre") is None
+    assert filtered.find_by_email("libre@correo.com") is None
+    assert backend.reads == 0
+    assert filtered.find(sample_user_1.username) is sample_user_1
+    assert filtered.find_by_email(sample_user_1.email.upper()) is sample_user_1
+    assert backend.reads == 2
+    assert filtered.stats()["negatives"] == 2
+    assert filtered.stats()["true_positives"] == 2
+
+def test_loads_existing_users(user_repo, sample_user_1):
+    user_repo.add(sample_user_1)
+    filtered = BloomFilteredUserRepository(user_repo, capacity=100)
+    assert filtered.might_exist(username=sample_user_1.username)
+    assert not filtered.might_exist(username="libre", email="libre@correo.com")
+
+def test_updates_add_new_keys(filtered, sample_user_1):
+    filtered.add(sample_user_1)
+    filtered.update_username(sample_user_1.username, "renombrado")
+    filtered.update_email("renombrado", "nuevo@correo.com")
+    assert filtered.find("renombrado") is sample_user_1
+    assert filtered.find_by_email("nuevo@correo.com") is sample_user_1
+    assert filtered.stats()["stale_keys"] == 2
+
+def test_deletes_are_false_positives_until_rebuild(filtered, backend, sample_user_1):
+    filtered.add(sample_user_1)
+    filtered.delete(sample_user_1.username)
+    assert filtered.find(sample_user_1.username) is None
+    assert filtered.stats()["false_positives"] == 1
+    filtered.rebuild()
+    reads = backend.reads
+    assert filtered.find(sample_user_1.username) is None
+    assert backend.reads == reads
+    assert filtered.stats()["stale_keys"] == 0
+
+def test_rebuilds_after_changes(user_repo, sample_user_1, sample_user_2):
+    filtered = BloomFilteredUserRepository(user_repo, capacity=100, rebuild_after_changes=4)
+    filtered.add_many([sample_user_1, sample_user_2])
+    filtered.delete(sample_user_1.username)
+    assert filtered.might_exist(username=sample_user_1.username)
+    filtered.delete(sample_user_2.username)
+    assert not filtered.might_exist(username=sample_user_1.username, email=sample_user_2.email)
+
+def test_grows_past_capacity(user_repo):
+    filtered = BloomFilteredUserRepository(user_repo, capacity=4)
+    users = [User(f"user{i}", f"user{i}@correo.com", "hash") for i in range(10)]
+    for user in users:
+        filtered.add(user)
+    assert filtered._bloom.capacity >= 20
+    assert all(filtered.might_exist(username=user.username) for user in users)
+
+def test_growth_rebuilds_are_amortized(user_repo):
+    filtered = BloomFilteredUserRepository(user_repo, capacity=10)
+    rebuilds = []
+    iter_all = user_repo.iter_all
+    user_repo.iter_all = lambda: rebuilds.append(1) or iter_all()
+    for i in range(50):
+        filtered.add(User(f"user{i}", f"user{i}@correo.com", "hash"))
+    assert len(rebuilds) <= 4
+
+def test_rebuild_interval_picks_up_external_writes(user_repo, sample_user_1):
+    now = [0.0]
+    filtered = BloomFilteredUserRepository(user_repo, capacity=100, rebuild_interval=30, clock=lambda: now[0])
+    user_repo.add(sample_user_1)
+    assert filtered.find(sample_user_1.username) is None
+    now[0] = 30.0
+    assert filtered.find(sample_user_1.username) is sample_user_1
+
+def test_observed_false_positive_rate(filtered, sample_user_1):
+    filtered.add(sample_user_1)
+    filtered.delete(sample_user_1.username)
+    filtered.find(sample_user_1.username)
+    filtered.find("libre")
+    assert filtered.stats()["observed_false_positive_rate"] == 0.5
@@ -0,0 +1,112 @@
+import pytest
+from src.exceptions.user_exceptions import UserNotFoundError
+from src.models.user_status import UserStatus
+from src.repositories.cached_user_repository import CachedUserRepository
+
+
+class CountingRepository:
+    """Cuenta las lecturas que llegan al repositorio decorado"""
+
+    blocking_io = True
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.reads = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.repository, name)
+        if name in ("find", "get", "find_by_email"):
+            self.reads += 1
+        return attribute
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def backend(user_repo):
+    return CountingRepository(user_repo)
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cached(backend, clock):
+    return CachedUserRepository(backend, max_size=2, ttl=10, clock=clock)
+
+
+def test_read_through_and_counters(cached, backend, sample_user_1):
+    cached.add(sample_user_1)
+    assert cached.get(sample_user_1.username) is sample_user_1
+    assert cached.find(sample_user_1.username) is sample_user_1
+    assert cached.find_by_email(sample_user_1.email.upper()) is sample_user_1
+    assert backend.reads == 1
+    assert cached.stats() == {"size": 1, "hits": 2, "misses": 1, "evictions": 0, "expirations": 0}
+
+def test_missing_users_are_not_cached(cached, backend):
+    assert cached.find("nadie") is None
+    assert cached.find("nadie") is None
+    with pytest.raises(UserNotFoundError):
+        cached.get("nadie")
+    assert backend.reads == 3
+
+def test_lru_eviction(cached, backend, sample_user_1, sample_user_2, sample_user_3):
+    for user in (sample_user_1, sample_user_2, sample_user_3):
+        cached.add(user)
+    cached.get(sample_user_1.username)
+    cached.get(sample_user_2.username)
+    cached.get(sample_user_1.username)
+    cached.get(sample_user_3.username)
+    assert cached.stats()["evictions"] == 1
+    reads = backend.reads
+    cached.get(sample_user_1.username)
+    cached.get(sample_user_2.username)
+    assert backend.reads == reads + 1
+
+def test_ttl_expiration(cached, backend, clock, sample_user_1):
+    cached.add(sample_user_1)
+    cached.get(sample_user_1.username)
+    clock.now = 10
+    cached.get(sample_user_1.username)
+    assert backend.reads == 2
+    assert cached.stats()["expirations"] == 1
+
+def test_writes_invalidate_entries(cached, sample_user_1):
+    cached.add(sample_user_1)
+    old_email = sample_user_1.email
+    cached.find_by_email(old_email)
+    cached.update_email(sample_user_1.username, "nuevo@correo.com")
+    cached.get(sample_user_1.username)
+    assert cached.find_by_email(old_email) is None
+    old_username = sample_user_1.username
+    cached.update_username(old_username, "renombrado")
+    assert cached.find(old_username) is None
+    assert cached.get("renombrado").email == "nuevo@correo.com"
+    cached.update_status("renombrado", UserStatus.ACTIVE)
+    assert cached.get("renombrado").status == UserStatus.ACTIVE
+    cached.delete("renombrado")
+    assert cached.find("renombrado") is None
+    assert cached.stats()["size"] == 0
+
+def test_stale_read_is_not_stored_after_concurrent_write(cached, user_repo, sample_user_1):
+    cached.add(sample_user_1)
+    generation = cached._generation
+    stale = user_repo.get(sample_user_1.username)
+    cached.invalidate(sample_user_1.username)
+    cached._store(stale, generation)
+    assert cached.stats()["size"] == 0
+
+def test_delegates_uncached_members(cached, backend, sample_user_1):
+    cached.add(sample_user_1)
+    assert cached.blocking_io is True
+    assert cached.get_all() == [sample_user_1]
+
+def test_invalid_size(user_repo):
+    with pytest.raises(ValueError):
+        CachedUserRepository(user_repo, max_size=0)
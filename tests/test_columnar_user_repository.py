@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
+from src.models.user import User
+from src.exceptions.concurrency_exceptions import VersionConflictError
+from src.models.user_status import UserStatus
+from src.repositories.columnar_user_repository import ColumnarUserRepository
+
+
+@pytest.fixture
+def columnar_repo():
+    return ColumnarUserRepository()
+
+
+#---------------------ADD/GET---------------------
+
+def test_add_and_get_user(columnar_repo, sample_user_1):
+    columnar_repo.add(sample_user_1)
+    user = columnar_repo.get(sample_user_1.username)
+    assert isinstance(user, User)
+    assert user.id == sample_user_1.id
+    assert user.username == sample_user_1.username
+    assert user.email == sample_user_1.email
+    assert user.password == sample_user_1.password
+    assert user.status == sample_user_1.status
+    assert user.created_at == sample_user_1.created_at
+
+def test_add_existing_user(columnar_repo, sample_user_2):
+    columnar_repo.add(sample_user_2)
+    with pytest.raises(UserValidationError, match=messages.USER_ALREADY_EXISTS):
+        columnar_repo.add(sample_user_2)
+
+def test_add_duplicate_email(columnar_repo, sample_user_2):
+    columnar_repo.add(sample_user_2)
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        columnar_repo.add(User("otro", sample_user_2.email, "passotro"))
+
+def test_get_nonexistent_user(columnar_repo):
+    with pytest.raises(UserNotFoundError, match=messages.USER_NOT_FOUND):
+        columnar_repo.get("Unknown")
+    assert columnar_repo.find("Unknown") is None
+
+def test_find_by_email(columnar_repo, sample_user_2):
+    columnar_repo.add(sample_user_2)
+    assert columnar_repo.find_by_email("JUAN@correo.com").username == sample_user_2.username
+    assert columnar_repo.find_by_email("nadie@correo.com") is None
+
+#--------------------UPDATE---------------------
+
+def test_update_username(columnar_repo, sample_user_1):
+    columnar_repo.add(sample_user_1)
+    user = columnar_repo.update_username(sample_user_1.username, "tutancamon")
+    assert user.username == "tutancamon"
+    assert columnar_repo.find(sample_user_1.username) is None
+    assert columnar_repo.find_by_email(sample_user_1.email).username == "tutancamon"
+
+def test_update_email(columnar_repo, sample_user_3):
+    columnar_repo.add(sample_user_3)
+    columnar_repo.update_email(sample_user_3.username, "newaxel@correo.com")
+    assert columnar_repo.get(sample_user_3.username).email == "newaxel@correo.com"
+    assert columnar_repo.find_by_email(sample_user_3.email) is None
+
+def test_update_email_invalid(columnar_repo, sample_user_3):
+    columnar_repo.add(sample_user_3)
+    with pytest.raises(UserValidationError, match=messages.USER_INVALID_EMAIL):
+        columnar_repo.update_email(sample_user_3.username, "invalid-email")
+
+def test_update_password_and_status(columnar_repo, sample_user_3):
+    columnar_repo.add(sample_user_3)
+    columnar_repo.update_password(sample_user_3.username, "newpass456")
+    user = columnar_repo.update_status(sample_user_3.username, UserStatus.BLOCKED)
+    assert user.password == "newpass456"
+    assert user.status == UserStatus.BLOCKED
+    assert user.updated_at >= sample_user_3.updated_at
+
+def test_update_invalid_status(columnar_repo, sample_user_3):
+    columnar_repo.add(sample_user_3)
+    with pytest.raises(ValueError):
+        columnar_repo.update_status(sample_user_3.username, "unknown")
+
+#--------------------DELETE-------------------
+
+def test_delete_keeps_other_rows_reachable(columnar_repo, sample_user_1, sample_user_2, sample_user_3):
+    for user in (sample_user_1, sample_user_2, sample_user_3):
+        columnar_repo.add(user)
+    columnar_repo.delete(sample_user_1.username)
+    assert len(columnar_repo) == 2
+    assert columnar_repo.find(sample_user_1.username) is None
+    assert columnar_repo.find_by_email(sample_user_1.email) is None
+    assert columnar_repo.get(sample_user_3.username).id == sample_user_3.id
+    assert columnar_repo.find_by_email(sample_user_3.email).username == sample_user_3.username
+
+def test_delete_nonexistent_user(columnar_repo):
+    with pytest.raises(UserNotFoundError, match=messages.USER_NOT_FOUND):
+        columnar_repo.delete("nonexistent")
+
+#--------------------COLUMN OPERATIONS-------------------
+
+def test_count_and_filter_by_status(columnar_repo, sample_user_1, sample_user_2, sample_user_3):
+    for user in (sample_user_1, sample_user_2, sample_user_3):
+        columnar_repo.add(user)
+    columnar_repo.update_status(sample_user_2.username, UserStatus.SUSPENDED)
+    assert columnar_repo.count(status=UserStatus.SUSPENDED) == 1
+    assert columnar_repo.count(status=UserStatus.INACTIVE) == 2
+    assert [user.username for user in columnar_repo.filter(status=UserStatus.SUSPENDED)] == ["Juan"]
+
+def test_filter_by_created_range(columnar_repo, sample_user_1, sample_user_2):
+    now = datetime.now()
+    sample_user_1.created_at = now - timedelta(days=40)
+    sample_user_2.created_at = now - timedelta(days=5)
+    columnar_repo.add(sample_user_1)
+    columnar_repo.add(sample_user_2)
+    recent = list(columnar_repo.filter(created_from=now - timedelta(days=30), created_to=now))
+    assert [user.username for user in recent] == [sample_user_2.username]
+    assert columnar_repo.count(status=UserStatus.INACTIVE, created_to=now - timedelta(days=30)) == 1
+
+def test_export_selected_columns(columnar_repo, sample_user_1, sample_user_2):
+    columnar_repo.add(sample_user_1)
+    columnar_repo.add(sample_user_2)
+    rows = list(columnar_repo.export(fields=("id", "username", "status")))
+    assert rows == [
+        (sample_user_1.id, sample_user_1.username, UserStatus.INACTIVE),
+        (sample_user_2.id, sample_user_2.username, UserStatus.INACTIVE),
+    ]
+
+def test_export_unknown_field(columnar_repo):
+    with pytest.raises(ValueError):
+        list(columnar_repo.export(fields=("salary",)))
+
+def test_versions_follow_updates_and_deletes(columnar_repo, sample_user_1, sample_user_2):
+    columnar_repo.add(sample_user_1)
+    columnar_repo.add(sample_user_2)
+    columnar_repo.update_password(sample_user_2.username, "otrohash", expected_version=1)
+    with pytest.raises(VersionConflictError):
+        columnar_repo.update_status(sample_user_2.username, UserStatus.ACTIVE, expected_version=1)
+    columnar_repo.delete(sample_user_1.username)
+    assert columnar_repo.get(sample_user_2.username).version == 2
+    assert list(columnar_repo.export(fields=("username", "version"))) == [(sample_user_2.username, 2)]
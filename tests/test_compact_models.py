@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime
+from uuid6 import uuid7
+from src.models.compact import CompactUuid, CompactTimestamp
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+
+
+class CompactEntity:
+    __slots__ = ("_id", "_created_at")
+    id = CompactUuid("_id")
+    created_at = CompactTimestamp("_created_at")
+
+
+def test_compact_uuid_roundtrip():
+    entity = CompactEntity()
+    value = str(uuid7())
+    entity.id = value
+    assert entity.id == value
+    assert isinstance(entity._id, bytes)
+    assert len(entity._id) == 16
+
+def test_compact_uuid_accepts_uuid_objects():
+    entity = CompactEntity()
+    value = uuid7()
+    entity.id = value
+    assert entity.id == str(value)
+
+def test_compact_timestamp_roundtrip():
+    entity = CompactEntity()
+    now = datetime.now()
+    entity.created_at = now
+    assert entity.created_at == now
+    assert isinstance(entity._created_at, int)
+
+@pytest.mark.parametrize("entity", [
+    User("tomas", "tomas@correo.com", "secret01"),
+    Role("admin"),
+    Permission("read"),
+    UserRole("u1", "r1"),
+    RolePermission("r1", "p1"),
+], ids=lambda entity: type(entity).__name__)
+def test_models_have_no_instance_dict(entity):
+    assert not hasattr(entity, "__dict__")
+    with pytest.raises(AttributeError):
+        entity.unknown_attribute = "value"
@@ -0,0 +1,116 @@
+import threading
+import pytest
+from src.exceptions.user_exceptions import UserValidationError
+from src.exceptions.role_exceptions import RoleAlreadyExistsError
+from src.exceptions.concurrency_exceptions import VersionConflictError
+from src.models.user import User
+from src.models.role import Role
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.repositories.concurrent_repositories import (StripedLock, ConcurrentUserRepository,
+                                                      ConcurrentRoleRepository, ConcurrentUserRoleRepository,
+                                                      ConcurrentRolePermissionRepository)
+from src.services.user_service import UserService
+
+
+def run_threads(target, count:int = 8) -> list:
+    """Ejecuta target(worker) en count hilos que arrancan a la vez, retorna las excepciones"""
+    barrier = threading.Barrier(count)
+    errors = []
+    def run(worker):
+        barrier.wait()
+        try:
+            target(worker)
+        except Exception as error:
+            errors.append(error)
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_striped_lock_orders_and_deduplicates():
+    stripes = StripedLock(4)
+    assert stripes.lock("a") is stripes.lock("a")
+    held = stripes.locks("a", "a", "b")
+    with held:
+        assert all(lock.locked() for lock in held._locks)
+    assert not any(lock.locked() for lock in held._locks)
+    with pytest.raises(ValueError):
+        StripedLock(0)
+
+def test_concurrent_adds_of_same_user_insert_once():
+    repository = ConcurrentUserRepository()
+    errors = run_threads(lambda worker: repository.add(User("xion", f"xion{worker}@correo.com", "hash")))
+    assert len(errors) == 7 and all(isinstance(error, UserValidationError) for error in errors)
+    assert len(repository.get_all()) == 1
+    errors = run_threads(lambda worker: repository.add(User(f"user{worker}", "mismo@correo.com", "hash")))
+    assert len(errors) == 7
+    assert len(repository.get_all()) == 2
+
+def test_create_user_race_through_service(bcrypt_rounds):
+    service = UserService(ConcurrentUserRepository())
+    errors = run_threads(lambda worker: service.create_user("xion", f"xion{worker}@correo.com", "Password123!"), 4)
+    assert len(errors) == 3
+    assert [user.username for user in service.get_all_users()] == ["xion"]
+
+def test_expected_version_lets_one_concurrent_writer_win():
+    repository = ConcurrentUserRepository()
+    repository.add(User("xion", "xion@correo.com", "hash"))
+    errors = run_threads(lambda worker: repository.update_password("xion", f"hash{worker}", expected_version=1))
+    assert len(errors) == 7 and all(isinstance(error, VersionConflictError) for error in errors)
+    assert repository.get("xion").version == 2
+
+def test_rename_publishes_new_username_before_removing_old():
+    repository = ConcurrentUserRepository()
+    repository.add(User("xion", "xion@correo.com", "hash"))
+    visible_after_delete = []
+    class WatchedDict(dict):
+        def __delitem__(self, key):
+            super().__delitem__(key)
+            visible_after_delete.append(set(self))
+    repository._data = WatchedDict(repository._data)
+    repository.update_username("xion", "xion2")
+    assert visible_after_delete == [{"xion2"}]
+    assert repository.get("xion2").email == "xion@correo.com"
+
+def test_stress_keeps_indexes_consistent():
+    repository = ConcurrentUserRepository(stripes=8)
+    def work(worker):
+        for i in range(200):
+            user = repository.add(User(f"user{worker}_{i}", f"user{worker}_{i}@correo.com", "hash"))
+            repository.update_username(user.username, f"renamed{worker}_{i}")
+            repository.update_email(user.username, f"renamed{worker}_{i}@correo.com")
+            if i % 2:
+                repository.delete(user.username)
+    assert run_threads(work) == []
+    users = repository.get_all()
+    assert len(users) == 8 * 100
+    assert list(repository._ids) == sorted(user.id for user in users)
+    assert len(repository._email_index) == len(users)
+    assert len(list(repository.iter_all())) == len(users)
+
+def test_named_repository_rejects_concurrent_duplicates():
+    repository = ConcurrentRoleRepository()
+    errors = run_threads(lambda worker: repository.add(Role("admin", f"rol {worker}")))
+    assert len(errors) == 7 and all(isinstance(error, RoleAlreadyExistsError) for error in errors)
+    assert len(repository.get_page()) == 1
+
+@pytest.mark.parametrize("repository_cls, relation_cls", [(ConcurrentUserRoleRepository, UserRole),
+                                                          (ConcurrentRolePermissionRepository, RolePermission)])
+def test_relation_stress(repository_cls, relation_cls):
+    repository = repository_cls(stripes=4)
+    def work(worker):
+        for i in range(300):
+            relation = relation_cls(f"a{i % 10}", f"b{worker}_{i}")
+            repository.add(relation)
+            if i % 3 == 0:
+                repository.delete(*[getattr(relation, name) for name in relation_cls.__slots__])
+    errors = run_threads(work)
+    assert errors == []
+    relations = repository.get_all()
+    assert len(relations) == 8 * 200
+    assert len(list(repository.iter_all())) == len(relations)
+    assert len(repository._keys) == len(relations)
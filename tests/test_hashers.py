@@ -0,0 +1,69 @@
+import pytest
+from src.security import hashers
+from src.security.hashers import BcryptHasher, ScryptHasher, PBKDF2Hasher
+from src.security.password_utils import hash_password, verify_password, needs_rehash
+
+
+@pytest.fixture
+def registry():
+    original_hashers = dict(hashers._hashers)
+    original_default = hashers._default_algorithm
+    hashers.register_hasher(BcryptHasher(rounds=4))
+    hashers.register_hasher(ScryptHasher(n=2 ** 10))
+    hashers.register_hasher(PBKDF2Hasher(iterations=1000))
+    hashers.register_hasher(PBKDF2Hasher(iterations=1000, digest="sha512"))
+    yield hashers
+    hashers._hashers.clear()
+    hashers._hashers.update(original_hashers)
+    hashers._default_algorithm = original_default
+
+
+@pytest.mark.parametrize("hasher", [BcryptHasher(rounds=4), ScryptHasher(n=2 ** 10), PBKDF2Hasher(iterations=1000),
+                                    PBKDF2Hasher(iterations=1000, digest="sha512")],
+                         ids=lambda hasher: hasher.algorithm)
+def test_hash_and_verify(hasher):
+    password_hashed = hasher.hash("testpassword")
+    assert hasher.identify(password_hashed)
+    assert hasher.verify("testpassword", password_hashed) is True
+    assert hasher.verify("otherpass", password_hashed) is False
+    assert hasher.needs_rehash(password_hashed) is False
+
+def test_hashes_are_salted():
+    hasher = ScryptHasher(n=2 ** 10)
+    assert hasher.hash("testpassword") != hasher.hash("testpassword")
+
+def test_needs_rehash_on_parameter_change():
+    assert ScryptHasher(n=2 ** 11).needs_rehash(ScryptHasher(n=2 ** 10).hash("testpassword")) is True
+    assert PBKDF2Hasher(iterations=2000).needs_rehash(PBKDF2Hasher(iterations=1000).hash("testpassword")) is True
+
+def test_identify_hasher_by_prefix(registry):
+    for algorithm in ("bcrypt", "scrypt", "pbkdf2-sha256", "pbkdf2-sha512"):
+        password_hashed = registry.get_hasher(algorithm).hash("testpassword")
+        assert registry.identify_hasher(password_hashed).algorithm == algorithm
+    assert registry.identify_hasher("plaintext") is None
+
+def test_verify_accepts_mixed_hashes(registry):
+    stored = [registry.get_hasher(algorithm).hash("testpassword") for algorithm in ("bcrypt", "scrypt", "pbkdf2-sha256")]
+    registry.set_default_hasher("scrypt")
+    assert all(verify_password("testpassword", password_hashed) for password_hashed in stored)
+
+def test_default_hasher_drives_hash_and_rehash(registry):
+    bcrypt_hash = hash_password("testpassword")
+    assert registry.identify_hasher(bcrypt_hash).algorithm == "bcrypt"
+    registry.set_default_hasher("pbkdf2-sha256")
+    assert needs_rehash(bcrypt_hash) is True
+    pbkdf2_hash = hash_password("testpassword")
+    assert pbkdf2_hash.startswith("$pbkdf2-sha256$")
+    assert needs_rehash(pbkdf2_hash) is False
+
+def test_hasher_interface_is_abstract():
+    with pytest.raises(TypeError):
+        hashers.PasswordHasher()
+    with pytest.raises(ValueError):
+        PBKDF2Hasher(digest="md5")
+
+def test_unknown_algorithm(registry):
+    with pytest.raises(ValueError):
+        registry.set_default_hasher("md5")
+    with pytest.raises(ValueError):
+        verify_password("testpassword", "plaintext")
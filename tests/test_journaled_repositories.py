@@ -0,0 +1,148 @@
+import errno
+import os
+import threading
+import pytest
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.repositories.journal import Journal
+from src.repositories.journaled_repositories import JournaledStore
+from src.exceptions.user_exceptions import UserValidationError
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return str(tmp_path / "data")
+
+
+def populate(store):
+    store.users.add(User("tomas", "tomas@correo.com", "hash1"))
+    store.users.add(User("juan", "juan@correo.com", "hash2"))
+    store.users.update_username("tomas", "tomax")
+    store.users.update_email("tomax", "tomax@correo.com")
+    store.users.update_status("juan", UserStatus.ACTIVE)
+    store.users.update_password("juan", "hash3")
+    store.roles.add(Role("admin", "Acceso total"))
+    store.roles.update_description("admin", "Todo")
+    store.permissions.add(Permission("read"))
+    store.permissions.add(Permission("write"))
+    store.permissions.delete("write")
+    store.user_roles.add(UserRole("u1", "r1"))
+    store.user_roles.add(UserRole("u2", "r1"))
+    store.user_roles.update_role_relation("u2", "r1", "r2")
+    store.role_permissions.add(RolePermission("r1", "p1"))
+    store.role_permissions.add(RolePermission("r1", "p2"))
+    store.role_permissions.delete("r1", "p2")
+
+
+def assert_populated(store):
+    assert store.users.find("tomas") is None
+    assert store.users.get("tomax").email == "tomax@correo.com"
+    assert (store.users.get("tomax").version, store.users.get("juan").version) == (3, 3)
+    assert store.users.find_by_email("tomax@correo.com").username == "tomax"
+    juan = store.users.get("juan")
+    assert (juan.status, juan.password) == (UserStatus.ACTIVE, "hash3")
+    assert store.roles.get("admin").description == "Todo"
+    assert store.roles.get("admin").version == 2
+    assert [permission.name for permission in store.permissions.get_all()] == ["read"]
+    assert [(r.user_id, r.role_id) for r in store.user_roles.get_all()] == [("u1", "r1"), ("u2", "r2")]
+    assert [(r.role_id, r.permission_id) for r in store.role_permissions.get_all()] == [("r1", "p1")]
+
+
+def test_recover_from_journal(store_dir):
+    store = JournaledStore(store_dir)
+    populate(store)
+    user_id = store.users.get("tomax").id
+    store.close()
+    recovered = JournaledStore(store_dir)
+    assert_populated(recovered)
+    assert recovered.users.get("tomax").id == user_id
+    recovered.close()
+
+def test_recover_from_snapshot_and_tail(store_dir):
+    store = JournaledStore(store_dir)
+    populate(store)
+    store.snapshot()
+    store.users.delete("juan")
+    store.close()
+    recovered = JournaledStore(store_dir)
+    assert recovered.users.find("juan") is None
+    assert recovered.users.get("tomax").email == "tomax@correo.com"
+    assert recovered.stats()["since_snapshot"] == 1
+    recovered.close()
+
+def test_periodic_snapshot_removes_old_files(store_dir):
+    store = JournaledStore(store_dir, snapshot_every=5)
+    for i in range(12):
+        store.user_roles.add(UserRole(f"u{i}", "r1"))
+    store.close()
+    files = sorted(os.listdir(store_dir))
+    assert files == ["journal-000000000010.log", "snapshot-000000000010.bin"]
+    recovered = JournaledStore(store_dir, snapshot_every=5)
+    assert len(recovered.user_roles.get_all()) == 12
+    recovered.close()
+
+def test_failed_mutation_is_not_logged(store_dir):
+    store = JournaledStore(store_dir)
+    store.users.add(User("tomas", "tomas@correo.com", "hash1"))
+    with pytest.raises(UserValidationError):
+        store.users.add(User("tomas", "otro@correo.com", "hash1"))
+    assert store.stats()["sequence"] == 1
+    store.close()
+
+def test_truncated_tail_is_discarded(store_dir):
+    store = JournaledStore(store_dir)
+    store.user_roles.add(UserRole("u1", "r1"))
+    store.user_roles.add(UserRole("u2", "r1"))
+    store.close()
+    path = os.path.join(store_dir, "journal-000000000000.log")
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)
+    recovered = JournaledStore(store_dir)
+    assert [r.user_id for r in recovered.user_roles.get_all()] == ["u1"]
+    recovered.user_roles.add(UserRole("u3", "r1"))
+    recovered.close()
+    again = JournaledStore(store_dir)
+    assert [r.user_id for r in again.user_roles.get_all()] == ["u1", "u3"]
+    again.close()
+
+def test_group_commit_shares_fsyncs(tmp_path):
+    journal = Journal(str(tmp_path / "group.log"), flush_interval=0.01)
+    def writer(worker):
+        for i in range(20):
+            journal.append(("record", worker, i))
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = journal.stats()
+    journal.close()
+    assert stats["records"] == stats["synced"] == 160
+    assert stats["fsyncs"] < 160
+    assert len(list(Journal.read(str(tmp_path / "group.log")))) == 160
+
+def test_fsync_failure_is_raised_to_writers(tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path / "journal.log"), flush_interval=0)
+    def fail(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(os, "fsync", fail)
+    waiters = []
+    def writer():
+        try:
+            journal.append(("op",))
+        except OSError as error:
+            waiters.append(error.errno)
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert waiters == [errno.ENOSPC] * 4
+    with pytest.raises(OSError):
+        journal.append(("otro",), wait=False)
+    with pytest.raises(OSError):
+        journal.close()
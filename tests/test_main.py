@@ -0,0 +1,190 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.api.pagination import encode_cursor
+from src.api import schemas
+
+
+@pytest.fixture
+def client(bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    with TestClient(app) as client:
+        yield client
+
+
+#---------------------USERS---------------------
+
+def test_create_and_get_user(client, sample_user_data_1):
+    response = client.post("/users", json=sample_user_data_1)
+    assert response.status_code == 201
+    body = response.json()
+    assert body["username"] == "xion"
+    assert body["status"] == "inactive"
+    assert "password" not in body
+    assert client.get("/users/xion").json() == body
+    assert [user["username"] for user in client.get("/users").json()["items"]] == ["xion"]
+
+def test_user_errors(client, sample_user_data_1):
+    client.post("/users", json=sample_user_data_1)
+    assert client.post("/users", json=sample_user_data_1).status_code == 409
+    assert client.post("/users", json={**sample_user_data_1, "username": "otro", "password": "123"}).status_code == 400
+    assert client.get("/users/nadie").status_code == 404
+    assert client.post("/users", json={"username": "x"}).status_code == 422
+
+def test_update_user(client, sample_user_data_1):
+    client.post("/users", json=sample_user_data_1)
+    assert client.put("/users/xion/username", json={"username": "xion2"}).json()["username"] == "xion2"
+    assert client.put("/users/xion2/email", json={"email": "nuevo@correo.com"}).json() == \
+           {"username": "xion2", "email": "nuevo@correo.com"}
+    assert client.put("/users/xion2/email", json={"email": "Nuevo@Correo.com"}).json() == \
+           {"username": "xion2", "email": "Nuevo@Correo.com"}
+    assert client.put("/users/xion2/status", json={"status": "blocked"}).json()["status"] == "blocked"
+    assert client.put("/users/xion2/status", json={"status": "otro"}).status_code == 422
+
+def test_expected_version_conflict(client, sample_user_data_1):
+    assert client.post("/users", json=sample_user_data_1).json()["version"] == 1
+    assert client.put("/users/xion/status", json={"status": "active", "expected_version": 1}).json()["version"] == 2
+    response = client.put("/users/xion/status", json={"status": "blocked", "expected_version": 1})
+    assert response.status_code == 409
+    assert client.get("/users/xion").json()["status"] == "active"
+    client.post("/roles", json={"name": "admin"})
+    assert client.put("/roles/admin/description", json={"description": "x", "expected_version": 5}).status_code == 409
+
+def test_password_endpoints(client, sample_user_data_1):
+    client.post("/users", json=sample_user_data_1)
+    assert client.post("/users/xion/verify-password", json={"password": "passxion"}).json() == {"valid": True}
+    response = client.put("/users/xion/password", json={"current_password": "mala", "new_password": "nueva123"})
+    assert response.status_code == 400
+    response = client.put("/users/xion/password", json={"current_password": "passxion", "new_password": "nueva123"})
+    assert response.status_code == 204
+    assert client.post("/users/xion/verify-password", json={"password": "nueva123"}).json() == {"valid": True}
+
+def test_delete_user(client, sample_user_data_1):
+    client.post("/users", json=sample_user_data_1)
+    assert client.delete("/users/xion").status_code == 204
+    assert client.delete("/users/xion").status_code == 404
+
+#---------------------ROLES & PERMISSIONS---------------------
+
+@pytest.mark.parametrize("resource", ["roles", "permissions"])
+def test_named_resources(client, resource):
+    response = client.post(f"/{resource}", json={"name": "Admin", "description": "Todo"})
+    assert response.status_code == 201
+    assert response.json()["name"] == "admin"
+    assert client.post(f"/{resource}", json={"name": "admin"}).status_code == 409
+    assert client.put(f"/{resource}/admin/description", json={"description": "Nada"}).json()["description"] == "Nada"
+    assert [item["name"] for item in client.get(f"/{resource}").json()["items"]] == ["admin"]
+    assert client.delete(f"/{resource}/admin").status_code == 204
+    assert client.get(f"/{resource}/admin").status_code == 404
+
+#---------------------ASSIGNMENTS---------------------
+
+def test_unexpected_value_error_is_a_server_error(bcrypt_rounds, monkeypatch):
+    with TestClient(app, raise_server_exceptions=False) as client:
+        async def broken(name):
+            raise ValueError("detalle interno")
+        monkeypatch.setattr(app.state.services.roles, "get_role", broken)
+        response = client.get("/roles/admin")
+    assert response.status_code == 500
+    assert "detalle interno" not in response.text
+
+def test_assignments_and_effective_permissions(client):
+    assert client.post("/roles/r1/permissions", json={"permission_id": "p1"}).status_code == 201
+    assert client.post("/users/u1/roles", json={"role_id": "r1"}).status_code == 201
+    assert client.post("/users/u1/roles", json={"role_id": "r1"}).status_code == 400
+    assert client.get("/users/u1/roles").json() == [{"user_id": "u1", "role_id": "r1"}]
+    assert client.get("/roles/r1/users").json() == [{"user_id": "u1", "role_id": "r1"}]
+    assert client.get("/roles/r1/permissions").json() == [{"role_id": "r1", "permission_id": "p1"}]
+    assert client.get("/users/u1/permissions").json() == ["p1"]
+    assert client.get("/users/u1/permissions/p1").json() == {"allowed": True}
+    assert client.delete("/roles/r1/permissions/p1").status_code == 204
+    assert client.get("/users/u1/permissions/p1").json() == {"allowed": False}
+    assert client.delete("/users/u1/roles/r1").status_code == 204
+    assert client.get("/users/u1/roles").json() == []
+
+def test_blank_names_are_bad_requests(client):
+    assert client.post("/roles", json={"name": "   "}).status_code == 400
+    assert client.post("/permissions", json={"name": "   "}).status_code == 400
+
+def test_services_are_created_once_per_lifespan(client):
+    first = client.app.state.services
+    client.post("/roles", json={"name": "admin"})
+    assert client.app.state.services is first
+
+def test_data_dir_persists_between_restarts(bcrypt_rounds, tmp_path, monkeypatch):
+    monkeypatch.setenv("USER_MANAGER_DATA_DIR", str(tmp_path))
+    with TestClient(app) as client:
+        client.post("/roles", json={"name": "admin"})
+        client.post("/users/u1/roles", json={"role_id": "admin"})
+    with TestClient(app) as client:
+        assert client.get("/roles/admin").status_code == 200
+        assert client.get("/users/u1/roles").json() == [{"user_id": "u1", "role_id": "admin"}]
+
+#---------------------PAGINATION---------------------
+
+def test_bcrypt_calibration_flag(bcrypt_rounds, monkeypatch):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    monkeypatch.setenv("USER_MANAGER_CALIBRATE_BCRYPT", "1")
+    monkeypatch.setenv("USER_MANAGER_BCRYPT_TARGET_MS", "0")
+    with TestClient(app):
+        assert bcrypt_rounds.get_bcrypt_rounds() == 10
+
+def test_cursor_pagination_follows_id_order(client):
+    names = [f"role{i:02d}" for i in range(25)]
+    for name in names:
+        client.post("/roles", json={"name": name})
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10} if cursor is None else {"limit": 10, "cursor": cursor}
+        page = client.get("/roles", params=params).json()
+        seen.extend(item["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == names
+
+def test_relation_pagination(client):
+    for user_id in ("u3", "u1", "u2"):
+        client.post(f"/users/{user_id}/roles", json={"role_id": "r1"})
+    first = client.get("/user-roles", params={"limit": 2}).json()
+    assert [item["user_id"] for item in first["items"]] == ["u1", "u2"]
+    rest = client.get("/user-roles", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert rest == {"items": [{"user_id": "u3", "role_id": "r1"}], "next_cursor": None}
+
+def test_ndjson_streaming(client, monkeypatch):
+    monkeypatch.setattr("src.api.pagination.STREAM_PAGE_SIZE", 3)
+    for i in range(7):
+        client.post("/roles/r1/permissions", json={"permission_id": f"p{i}"})
+    response = client.get("/role-permissions", headers={"Accept": "application/x-ndjson"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["permission_id"] for line in lines] == [f"p{i}" for i in range(7)]
+
+def test_invalid_cursor_and_limit(client):
+    assert client.get("/roles", params={"cursor": "%%%"}).status_code == 400
+    for path, key in [("/roles", 5), ("/roles", ["a", "b"]), ("/user-roles", "u1"), ("/user-roles", ["u1"]),
+                      ("/role-permissions", ["r1", 2]), ("/users", {"id": "x"}), ("/permissions", None)]:
+        response = client.get(path, params={"cursor": encode_cursor(key)})
+        assert response.status_code == 400, (path, key)
+    assert client.get("/roles", params={"limit": 0}).status_code == 422
+
+#---------------------AUTHORIZATION---------------------
+
+def test_batch_authorization_check(client):
+    client.post("/users/u1/roles", json={"role_id": "r1"})
+    client.post("/roles/r1/permissions", json={"permission_id": "p1"})
+    checks = [{"user_id": "u1", "permission_id": "p1"}, {"user_id": "u1", "permission_id": "p2"},
+              {"user_id": "u2", "permission_id": "p1"}]
+    response = client.post("/authorization/check", json={"checks": checks})
+    assert response.json() == {"allowed": [True, False, False]}
+    response = client.post("/authorization/check", params={"format": "bitmap"}, json={"checks": checks})
+    assert response.json() == {"count": 3, "bitmap": "AQ=="}
+
+def test_batch_authorization_check_rejects_oversized_batches(client):
+    check = {"user_id": "u1", "permission_id": "p1"}
+    response = client.post("/authorization/check", json={"checks": [check] * schemas.MAX_AUTHORIZATION_CHECKS})
+    assert response.status_code == 200
+    response = client.post("/authorization/check", json={"checks": [check] * (schemas.MAX_AUTHORIZATION_CHECKS + 1)})
+    assert response.status_code == 422
+    assert client.post("/authorization/check", params={"format": "csv"}, json={"checks": [check]}).status_code == 422
@@ -0,0 +1,95 @@
+import os
+import pytest
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.repositories.mmap_snapshot import MappedSnapshot, write_snapshot
+from src.exceptions.user_exceptions import UserNotFoundError
+from src.exceptions.role_exceptions import RoleNotFoundError
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    users = [User(f"user{i}", f"User{i}@Correo.com", f"hash{i}") for i in range(50)]
+    users[3].activate()
+    path = write_snapshot(
+        str(tmp_path / "data.snap"),
+        users=users,
+        roles=[Role("admin", "Acceso total"), Role("editor", "Edición")],
+        permissions=[Permission("read", "Leer"), Permission("write")],
+        user_roles=[UserRole("u1", "admin"), UserRole("u1", "editor"), UserRole("u2", "editor"), UserRole("u10", "admin")],
+        role_permissions=[RolePermission("admin", "read"), RolePermission("admin", "write"), RolePermission("editor", "read")],
+    )
+    snapshot = MappedSnapshot(path)
+    yield snapshot, users
+    snapshot.close()
+
+
+def test_find_user_by_username_and_email(snapshot):
+    mapped, users = snapshot
+    user = mapped.users.find(" user3 ")
+    assert (user.id, user.email, user.password) == (users[3].id, users[3].email, "hash3")
+    assert (user.status, user.version) == (UserStatus.ACTIVE, 2)
+    assert user.created_at == users[3].created_at
+    assert mapped.users.find_by_email("user7@correo.com").username == "user7"
+    assert mapped.users.find("nadie") is None
+    assert mapped.users.find_by_email("") is None
+    with pytest.raises(UserNotFoundError):
+        mapped.users.get("nadie")
+
+def test_get_all_users_keeps_write_order(snapshot):
+    mapped, users = snapshot
+    assert len(mapped.users) == 50
+    assert [user.username for user in mapped.users.get_all()] == [user.username for user in users]
+
+def test_roles_and_permissions(snapshot):
+    mapped, _ = snapshot
+    assert mapped.roles.get("Admin").description == "Acceso total"
+    assert mapped.roles.get("editor").description == "Edición"
+    assert mapped.permissions.find("write").description == ""
+    assert [permission.name for permission in mapped.permissions.get_all()] == ["read", "write"]
+    with pytest.raises(RoleNotFoundError):
+        mapped.roles.get("guest")
+
+def test_relations_in_both_directions(snapshot):
+    mapped, _ = snapshot
+    assert [r.role_id for r in mapped.user_roles.get_roles_by_user("u1")] == ["admin", "editor"]
+    assert [r.user_id for r in mapped.user_roles.get_users_by_role("admin")] == ["u1", "u10"]
+    assert mapped.user_roles.find("u2", "editor") is not None
+    assert mapped.user_roles.find("u2", "admin") is None
+    assert mapped.user_roles.get_roles_by_user("u") == []
+    assert len(mapped.user_roles) == 4
+    assert mapped.role_permissions.role_has_permission("editor", "read")
+    assert not mapped.role_permissions.role_has_permission("editor", "write")
+    assert [r.role_id for r in mapped.role_permissions.get_roles_by_permission("read")] == ["admin", "editor"]
+    assert [r.permission_id for r in mapped.role_permissions.get_permissions_by_role("admin")] == ["read", "write"]
+
+def test_empty_snapshot(tmp_path):
+    with MappedSnapshot(write_snapshot(str(tmp_path / "empty.snap"))) as mapped:
+        assert mapped.users.get_all() == []
+        assert mapped.users.find("user") is None
+        assert mapped.user_roles.get_roles_by_user("u1") == []
+
+def test_rejects_other_format_or_version(tmp_path):
+    path = str(tmp_path / "data.snap")
+    write_snapshot(path)
+    with open(path, "r+b") as file:
+        file.seek(8)
+        file.write((99).to_bytes(4, "little"))
+    with pytest.raises(ValueError):
+        MappedSnapshot(path)
+    other = tmp_path / "other.snap"
+    other.write_bytes(b"no es un snapshot valido")
+    with pytest.raises(ValueError):
+        MappedSnapshot(str(other))
+
+def test_rewrite_is_atomic(tmp_path):
+    path = str(tmp_path / "data.snap")
+    write_snapshot(path, users=[User("tomas", "tomas@correo.com", "hash")])
+    write_snapshot(path, users=[User("juan", "juan@correo.com", "hash")])
+    assert os.listdir(tmp_path) == ["data.snap"]
+    with MappedSnapshot(path) as mapped:
+        assert [user.username for user in mapped.users.get_all()] == ["juan"]
@@ -1,4 +1,8 @@
-from src.security.password_utils import hash_password, verify_password
+import asyncio
+import threading
+import pytest
+from src.security.password_utils import hash_password, verify_password, PasswordHashingPool, hash_password_async, verify_password_async
+from src.exceptions.security_exceptions import PasswordHashingBusyError
 
 def test_hash_password_create_valid_hash():
     password = "testpassword"
@@ -8,4 +12,102 @@ def test_hash_password_create_valid_hash():
 def test_verify_fail_with_wrong_password():
     password = "testpassword"
     password_hashed = hash_password(password)
-    assert verify_password("newtest1",password_hashed) == False
\ No newline at end of file
+    assert verify_password("newtest1",password_hashed) == False
+
+# -------------------- ASYNC / POOL --------------------
+
+def test_async_hash_and_verify():
+    async def scenario():
+        password_hashed = await hash_password_async("testpassword")
+        return (await verify_password_async("testpassword", password_hashed),
+                await verify_password_async("otherpass", password_hashed))
+    assert asyncio.run(scenario()) == (True, False)
+
+def test_pool_runs_tasks_and_reports_metrics():
+    pool = PasswordHashingPool(max_workers=2, max_queue=10)
+    async def scenario():
+        return await asyncio.gather(*(pool.run(pow, 2, n) for n in range(5)))
+    assert asyncio.run(scenario()) == [1, 2, 4, 8, 16]
+    metrics = pool.metrics()
+    assert metrics["completed"] == 5
+    assert metrics["queue_depth"] == 0
+    assert metrics["running"] == 0
+    pool.shutdown()
+
+def test_pool_rejects_when_queue_is_full():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+    def blocker():
+        started.set()
+        release.wait()
+    running = pool.submit(blocker)
+    started.wait()
+    queued = pool.submit(pow, 2, 2)
+    with pytest.raises(PasswordHashingBusyError):
+        pool.submit(pow, 2, 3)
+    assert pool.metrics()["rejected"] == 1
+    assert pool.metrics()["queue_depth"] == 1
+    release.set()
+    running.result()
+    assert queued.result() == 4
+    pool.shutdown()
+
+def test_cancelled_tasks_release_their_queue_slot():
+    pool = PasswordHashingPool(max_workers=1, max_queue=3)
+    release = threading.Event()
+    started = threading.Event()
+    def blocker():
+        started.set()
+        release.wait()
+    running = pool.submit(blocker)
+    started.wait()
+    queued = [pool.submit(pow, 2, n) for n in range(3)]
+    assert all(future.cancel() for future in queued)
+    assert pool.metrics()["queue_depth"] == 0
+    async def cancelled_awaiter():
+        task = asyncio.ensure_future(pool.run(pow, 2, 2))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(cancelled_awaiter())
+    assert pool.metrics()["queue_depth"] == 0
+    release.set()
+    running.result()
+    assert pool.submit(pow, 2, 3).result() == 8
+    pool.shutdown()
+
+def test_failed_submit_releases_queue_slot():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit(pow, 2, 2)
+    assert pool.metrics()["queue_depth"] == 0
+
+
+# -------------------- BCRYPT COST --------------------
+
+def test_hash_uses_configured_rounds(bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(5)
+    password_hashed = hash_password("testpassword")
+    assert bcrypt_rounds.get_hash_rounds(password_hashed) == 5
+    assert bcrypt_rounds.needs_rehash(password_hashed) is False
+    bcrypt_rounds.set_bcrypt_rounds(6)
+    assert bcrypt_rounds.needs_rehash(password_hashed) is True
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    assert bcrypt_rounds.needs_rehash(password_hashed) is False
+
+@pytest.mark.parametrize("rounds", [3, 32])
+def test_set_invalid_rounds(bcrypt_rounds, rounds):
+    with pytest.raises(ValueError):
+        bcrypt_rounds.set_bcrypt_rounds(rounds)
+
+def test_get_hash_rounds_of_unknown_format(bcrypt_rounds):
+    assert bcrypt_rounds.get_hash_rounds("plaintext") is None
+    assert bcrypt_rounds.needs_rehash("plaintext") is True
+
+def test_calibrate_respects_bounds(bcrypt_rounds):
+    assert bcrypt_rounds.calibrate_bcrypt_rounds(target_ms=0, min_rounds=5, max_rounds=8) == 5
+    assert bcrypt_rounds.calibrate_bcrypt_rounds(target_ms=10_000, min_rounds=5, max_rounds=8) == 8
+    assert bcrypt_rounds.get_bcrypt_rounds() == 8
@@ -18,4 +18,11 @@ def test_create_permission_with_empty_name():
 def test_update_permission_description():
     perm = Permission(name="update_user", description="Modificar datos")
     perm.update_description("Puede modificar correo y nombre")
-    assert perm.description == "Puede modificar correo y nombre"
\ No newline at end of file
+    assert perm.description == "Puede modificar correo y nombre"
+
+def test_update_description_increments_version():
+    permission = Permission("read")
+    old_updated_at = permission.updated_at
+    permission.update_description("Leer")
+    assert permission.version == 2
+    assert permission.updated_at >= old_updated_at
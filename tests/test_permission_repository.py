@@ -1,6 +1,7 @@
 import pytest
 from src.models.permission import Permission
 from src.constants import messages
+from src.exceptions.concurrency_exceptions import VersionConflictError
 from src.exceptions.permission_exceptions import PermissionAlreadyExistsError, PermissionNotFoundError
 
 #---------------------ADD/GET---------------------
@@ -67,4 +68,11 @@ def test_get_all_permissions(permission_repo):
 def test_get_all_without_permissions(permission_repo):
     all_permissions = permission_repo.get_all()
     assert len(all_permissions) == 0
-    assert all_permissions == []
\ No newline at end of file
+    assert all_permissions == []
+
+def test_update_description_with_expected_version(permission_repo):
+    permission_repo.add(Permission(name="read"))
+    assert permission_repo.update_description("read", "Leer", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError):
+        permission_repo.update_description("read", "Nada", expected_version=1)
+    assert permission_repo.get("read").description == "Leer"
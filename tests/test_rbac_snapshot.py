@@ -0,0 +1,130 @@
+import threading
+import pytest
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.services.rbac_snapshot import ShardedMap, RbacSnapshot, SnapshotAuthorizationService
+from src.services.user_role_service import UserRoleService
+from src.services.role_permission_service import RolePermissionService
+
+
+@pytest.fixture
+def snapshot_service(user_role_repo, role_permission_repo):
+    return SnapshotAuthorizationService(user_role_repo, role_permission_repo)
+
+@pytest.fixture
+def snapshot_rbac(snapshot_service, user_role_repo, role_permission_repo):
+    return (UserRoleService(user_role_repo, snapshot_service),
+            RolePermissionService(role_permission_repo, snapshot_service))
+
+
+def test_sharded_map_is_persistent():
+    first = ShardedMap.from_dict({"a": 1, "b": 2}, shard_count=4)
+    second = first.set("c", 3)
+    third = second.delete("a")
+    assert (len(first), len(second), len(third)) == (2, 3, 2)
+    assert "c" not in first and second.get("c") == 3
+    assert first.get("a") == 1 and "a" not in third
+    assert third.delete("zz") is third
+    assert dict(third.items()) == {"b": 2, "c": 3}
+
+def test_new_versions_share_unchanged_structure():
+    snapshot = RbacSnapshot.build([UserRole("u1", "r1")], [RolePermission("r1", "p1")])
+    assigned = snapshot.with_role_assigned("u2", "r1")
+    assert assigned.version == snapshot.version + 1
+    assert assigned.permissions_by_role is snapshot.permissions_by_role
+    assert assigned.roles_by_user.get("u1") is snapshot.roles_by_user.get("u1")
+    granted = assigned.with_permission_granted("r2", "p2")
+    assert granted.roles_by_user is assigned.roles_by_user
+    assert granted.permissions_by_role.get("r1") is assigned.permissions_by_role.get("r1")
+    assert assigned.with_role_assigned("u2", "r1") is assigned
+    assert snapshot.has_permission("u2", "p1") is False
+
+def test_loads_existing_relations(user_role_repo, role_permission_repo):
+    user_role_repo.add(UserRole("u1", "r1"))
+    role_permission_repo.add(RolePermission("r1", "p1"))
+    service = SnapshotAuthorizationService(user_role_repo, role_permission_repo)
+    assert service.has_permission("u1", "p1") is True
+    assert service.warm() == 1
+
+def test_writes_through_services_publish_new_snapshots(snapshot_service, snapshot_rbac):
+    user_role_service, role_permission_service = snapshot_rbac
+    role_permission_service.add_permission_to_role("r1", "p1")
+    role_permission_service.add_permission_to_role("r2", "p1")
+    role_permission_service.add_permission_to_role("r2", "p2")
+    user_role_service.assign_role("u1", "r1")
+    before = snapshot_service.snapshot
+    user_role_service.assign_role("u1", "r2")
+    assert snapshot_service.get_user_permissions("u1") == frozenset({"p1", "p2"})
+    assert before.get_user_permissions("u1") == frozenset({"p1"})
+    user_role_service.remove_role("u1", "r2")
+    assert snapshot_service.has_permission("u1", "p2") is False
+    assert snapshot_service.has_permission("u1", "p1") is True
+    role_permission_service.remove_permission_from_role("r1", "p1")
+    assert snapshot_service.check_many([("u1", "p1"), ("u1", ""), ("u2", "p1")]) == [False, False, False]
+
+def test_update_user_role_publishes_one_snapshot(snapshot_service, snapshot_rbac):
+    user_role_service, role_permission_service = snapshot_rbac
+    role_permission_service.add_permission_to_role("r1", "p1")
+    role_permission_service.add_permission_to_role("r2", "p2")
+    user_role_service.assign_role("u1", "r1")
+    before = snapshot_service.snapshot
+    user_role_service.update_user_role("u1", "r1", "r2")
+    assert snapshot_service.snapshot.version == before.version + 1
+    assert snapshot_service.get_user_permissions("u1") == frozenset({"p2"})
+    assert before.with_role_replaced("u1", "r1", "r1") is before
+
+def test_update_permission_relation_publishes_one_snapshot(snapshot_service, snapshot_rbac):
+    user_role_service, role_permission_service = snapshot_rbac
+    role_permission_service.add_permission_to_role("r1", "p1")
+    user_role_service.assign_role("u1", "r1")
+    before = snapshot_service.snapshot
+    role_permission_service.update_permission_relation("r1", "p1", "p2")
+    assert snapshot_service.snapshot.version == before.version + 1
+    assert snapshot_service.get_user_permissions("u1") == frozenset({"p2"})
+
+def test_invalidate_reloads_from_repositories(snapshot_service, user_role_repo, role_permission_repo):
+    user_role_repo.add(UserRole("u1", "r1"))
+    role_permission_repo.add(RolePermission("r1", "p1"))
+    assert snapshot_service.has_permission("u1", "p1") is False
+    snapshot_service.invalidate("u1")
+    assert snapshot_service.get_user_permissions("u1") == frozenset()
+    snapshot_service.invalidate()
+    assert snapshot_service.has_permission("u1", "p1") is True
+    user_role_repo.delete("u1", "r1")
+    snapshot_service.invalidate("u1")
+    assert "u1" not in snapshot_service.snapshot.roles_by_user
+
+def test_notifications_follow_the_repository_not_the_delivery_order(snapshot_service, user_role_repo,
+                                                                    role_permission_repo):
+    user_role_repo.add(UserRole("u1", "r1"))
+    role_permission_repo.add(RolePermission("r1", "p1"))
+    user_role_repo.delete("u1", "r1")
+    role_permission_repo.delete("r1", "p1")
+    # Las notificaciones llegan en el orden inverso al de las escrituras confirmadas
+    snapshot_service.on_role_removed("u1", "r1")
+    snapshot_service.on_role_assigned("u1", "r1")
+    snapshot_service.on_permission_revoked("r1", "p1")
+    snapshot_service.on_permission_granted("r1", "p1")
+    assert "u1" not in snapshot_service.snapshot.roles_by_user
+    assert "r1" not in snapshot_service.snapshot.permissions_by_role
+
+def test_readers_never_see_partial_writes(snapshot_service):
+    user_roles = snapshot_service.user_role_repository
+    snapshot_service.role_permission_repository.add(RolePermission("r1", "p1"))
+    snapshot_service.on_permission_granted("r1", "p1")
+    stop = threading.Event()
+    seen = []
+    def reader():
+        while not stop.is_set():
+            snapshot = snapshot_service.snapshot
+            seen.append(snapshot.has_permission("u1", "p1") == ("r1" in snapshot.roles_by_user.get("u1", ())))
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for _ in range(2000):
+        user_roles.add(UserRole("u1", "r1"))
+        snapshot_service.on_role_assigned("u1", "r1")
+        user_roles.delete("u1", "r1")
+        snapshot_service.on_role_removed("u1", "r1")
+    stop.set()
+    thread.join()
+    assert seen and all(seen)
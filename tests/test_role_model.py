@@ -18,4 +18,9 @@ def test_create_role_with_empty_name():
 def test_update_role_description():
     role = Role(name="editor", description="Puede editar contenidos")
     role.update_description("Edita articulos y productos")
-    assert role.description == "Edita articulos y productos"
\ No newline at end of file
+    assert role.description == "Edita articulos y productos"
+
+def test_update_description_increments_version():
+    role = Role("admin")
+    role.update_description("Acceso total")
+    assert role.version == 2
@@ -85,4 +85,34 @@ def test_delete(role_permission_repo, sample_role1_perm1_data, sample_role2_perm
     list_relations = role_permission_repo.get_all()
     assert len(list_relations) == 2
     role_permission_repo.delete("r1", "p1")
-    assert len(list_relations) == 1
+    assert len(role_permission_repo.get_all()) == 1
+    assert role_permission_repo.find("r1", "p1") is None
+
+def test_delete_nonexistent_relation(role_permission_repo):
+    with pytest.raises(ValueError):
+        role_permission_repo.delete("r1", "p1")
+
+#---------------------HAS PERMISSION---------------------
+
+def test_role_has_permission(role_permission_repo, sample_role1_perm1_data):
+    role_permission_repo.add(RolePermission(**sample_role1_perm1_data))
+    assert role_permission_repo.role_has_permission("r1", "p1") is True
+    assert role_permission_repo.role_has_permission("r1", "p2") is False
+    assert role_permission_repo.role_has_permission("r2", "p1") is False
+
+def test_role_has_permission_after_update_and_delete(role_permission_repo, sample_role1_perm1_data):
+    role_permission_repo.add(RolePermission(**sample_role1_perm1_data))
+    role_permission_repo.update_permission_relation("r1", "p1", "p2")
+    assert role_permission_repo.role_has_permission("r1", "p1") is False
+    assert role_permission_repo.role_has_permission("r1", "p2") is True
+    assert role_permission_repo.get_roles_by_permission("p1") == []
+    role_permission_repo.delete("r1", "p2")
+    assert role_permission_repo.role_has_permission("r1", "p2") is False
+    assert role_permission_repo.get_permissions_by_role("r1") == []
+
+def test_update_to_existing_relation(role_permission_repo, sample_role1_perm1_data, sample_role1_perm2_data):
+    role_permission_repo.add(RolePermission(**sample_role1_perm1_data))
+    role_permission_repo.add(RolePermission(**sample_role1_perm2_data))
+    with pytest.raises(ValueError):
+        role_permission_repo.update_permission_relation("r1", "p1", "p2")
+    assert len(role_permission_repo.get_permissions_by_role("r1")) == 2
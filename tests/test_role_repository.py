@@ -2,6 +2,7 @@ import pytest
 from src.models.role import Role
 from src.exceptions.role_exceptions import RoleNotFoundError, RoleAlreadyExistsError
 from src.constants import messages
+from src.exceptions.concurrency_exceptions import VersionConflictError
 
 #---------------------ADD/GET---------------------
 
@@ -68,3 +69,10 @@ def test_get_all_without_roles(role_repo):
     all_roles = role_repo.get_all()
     assert len(all_roles) == 0
     assert all_roles == []
+
+def test_update_description_with_expected_version(role_repo):
+    role_repo.add(Role(name="admin"))
+    assert role_repo.update_description("admin", "Todo", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError):
+        role_repo.update_description("admin", "Nada", expected_version=1)
+    assert role_repo.get("admin").description == "Todo"
@@ -0,0 +1,130 @@
+import multiprocessing
+import sys
+import pytest
+from multiprocessing import resource_tracker, shared_memory
+from src.exceptions.concurrency_exceptions import StalledWriterError
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.repositories.shared_permission_matrix import SharedPermissionMatrix
+from src.services.user_role_service import UserRoleService
+from src.services.role_permission_service import RolePermissionService
+
+
+@pytest.fixture
+def matrix():
+    matrix = SharedPermissionMatrix.create(max_users=16, max_roles=10, max_permissions=20)
+    yield matrix
+    matrix.close()
+
+@pytest.fixture
+def reader(matrix):
+    reader = SharedPermissionMatrix.attach(matrix.name)
+    yield reader
+    reader.close()
+
+
+def test_reader_sees_writer_changes(matrix, reader):
+    matrix.on_permission_granted("r1", "p1")
+    matrix.on_permission_granted("r2", "p2")
+    matrix.on_role_assigned("u1", "r1")
+    assert reader.has_permission("u1", "p1") is True
+    assert reader.has_permission("u1", "p2") is False
+    matrix.on_role_assigned("u1", "r2")
+    assert reader.get_user_permissions("u1") == frozenset({"p1", "p2"})
+    matrix.on_role_removed("u1", "r1")
+    matrix.on_permission_revoked("r2", "p2")
+    assert reader.check_many([("u1", "p1"), ("u1", "p2"), ("u9", "p1"), ("", "p1")]) == [False] * 4
+
+def test_generation_advances_by_two_per_write(matrix):
+    start = matrix.generation
+    matrix.on_role_assigned("u1", "r1")
+    assert matrix.generation == start + 2
+    matrix.on_role_removed("u9", "r9")
+    assert matrix.generation % 2 == 0
+
+def test_role_replacement_is_one_write(matrix, reader):
+    matrix.on_permission_granted("r1", "p1")
+    matrix.on_permission_granted("r2", "p2")
+    matrix.on_role_assigned("u1", "r1")
+    start = matrix.generation
+    matrix.on_role_replaced("u1", "r1", "r2")
+    assert matrix.generation == start + 2
+    assert reader.get_user_permissions("u1") == frozenset({"p2"})
+
+def test_permission_replacement_is_one_write(matrix, reader):
+    matrix.on_permission_granted("r1", "p1")
+    matrix.on_role_assigned("u1", "r1")
+    start = matrix.generation
+    matrix.on_permission_replaced("r1", "p1", "p2")
+    assert matrix.generation == start + 2
+    assert reader.get_user_permissions("u1") == frozenset({"p2"})
+
+def test_drives_services_and_loads_repositories(matrix, reader, user_role_repo, role_permission_repo):
+    user_role_repo.add(UserRole("u1", "r1"))
+    role_permission_repo.add(RolePermission("r1", "p1"))
+    matrix.load(user_role_repo.get_all(), role_permission_repo.get_all())
+    UserRoleService(user_role_repo, matrix).assign_role("u2", "r2")
+    RolePermissionService(role_permission_repo, matrix).add_permission_to_role("r2", "p2")
+    assert reader.check_many_bitmap([("u1", "p1"), ("u2", "p1"), ("u2", "p2")]) == bytes([0b101])
+    assert reader.warm() == 2
+
+def test_readers_cannot_write(reader):
+    with pytest.raises(RuntimeError):
+        reader.on_role_assigned("u1", "r1")
+
+def test_capacity_and_id_limits(matrix):
+    for i in range(10):
+        matrix.on_role_assigned("u1", f"r{i}")
+    with pytest.raises(ValueError):
+        matrix.on_role_assigned("u1", "r10")
+    with pytest.raises(ValueError):
+        matrix.on_role_assigned("x" * 65, "r1")
+    assert matrix.generation % 2 == 0
+
+def test_reader_gives_up_on_stalled_writer(matrix, reader):
+    matrix.on_permission_granted("r1", "p1")
+    matrix._begin()
+    reader.read_timeout = 0.05
+    with pytest.raises(StalledWriterError):
+        reader.has_permission("u1", "p1")
+    matrix._end()
+    assert reader.has_permission("u1", "p1") is False
+
+@pytest.mark.skipif(sys.version_info >= (3, 13), reason="track=False no reemplaza resource_tracker.register")
+def test_attach_only_skips_registering_its_segment(matrix, monkeypatch):
+    registered = []
+    monkeypatch.setattr(resource_tracker, "register", lambda name, rtype: registered.append(name))
+    segment_class = shared_memory.SharedMemory
+    class RegisteringElsewhere(segment_class):
+        def __init__(self, name):
+            # Registro de otro hilo mientras el attach tiene reemplazado register
+            resource_tracker.register("/otro-segmento", "shared_memory")
+            super().__init__(name=name)
+    monkeypatch.setattr(shared_memory, "SharedMemory", RegisteringElsewhere)
+    SharedPermissionMatrix.attach(matrix.name).close()
+    assert registered == ["/otro-segmento"]
+
+def test_rejects_foreign_segments():
+    segment = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        with pytest.raises(ValueError):
+            SharedPermissionMatrix.attach(segment.name)
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def _check_in_child(name, queue):
+    with SharedPermissionMatrix.attach(name) as matrix:
+        queue.put((matrix.has_permission("u1", "p1"), matrix.has_permission("u1", "p2")))
+
+def test_other_process_reads_without_copy(matrix):
+    matrix.on_permission_granted("r1", "p1")
+    matrix.on_role_assigned("u1", "r1")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_check_in_child, args=(matrix.name, queue))
+    process.start()
+    assert queue.get(timeout=10) == (True, False)
+    process.join(timeout=10)
+    assert process.exitcode == 0
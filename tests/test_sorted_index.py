@@ -0,0 +1,31 @@
+import random
+from src.repositories.sorted_index import SortedKeyIndex
+
+
+def test_keeps_keys_sorted_across_bucket_splits():
+    keys = list(range(200))
+    random.Random(7).shuffle(keys)
+    index = SortedKeyIndex(load=4)
+    for key in keys:
+        index.add(key)
+    assert list(index) == list(range(200))
+    assert len(index) == 200
+
+def test_discard_ignores_missing_keys():
+    index = SortedKeyIndex(range(10), load=2)
+    index.discard(5)
+    index.discard(5)
+    index.discard(42)
+    assert list(index) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+    assert len(index) == 9
+
+def test_after_pages_through_buckets():
+    index = SortedKeyIndex(range(0, 20, 2), load=3)
+    assert index.after(limit=4) == [0, 2, 4, 6]
+    assert index.after(6, 4) == [8, 10, 12, 14]
+    assert index.after(7, 2) == [8, 10]
+    assert index.after(18) == []
+
+def test_tuple_keys():
+    index = SortedKeyIndex([("u2", "r1"), ("u1", "r2"), ("u1", "r1")])
+    assert index.after(("u1", "r1")) == [("u1", "r2"), ("u2", "r1")]
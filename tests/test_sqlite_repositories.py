@@ -0,0 +1,257 @@
+import sqlite3
+import threading
+import pytest
+from src.constants import messages
+from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError
+from src.exceptions.role_exceptions import RoleAlreadyExistsError, RoleNotFoundError
+from src.exceptions.permission_exceptions import PermissionAlreadyExistsError, PermissionNotFoundError
+from src.exceptions.concurrency_exceptions import VersionConflictError
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.models.user_status import UserStatus
+from src.repositories.sqlite_pool import SQLitePool
+from src.repositories.sqlite_user_repository import SQLiteUserRepository
+from src.repositories.sqlite_role_repository import SQLiteRoleRepository
+from src.repositories.sqlite_permission_repository import SQLitePermissionRepository
+from src.repositories.sqlite_user_role_repository import SQLiteUserRoleRepository
+from src.repositories.sqlite_role_permission_repository import SQLiteRolePermissionRepository
+from src.services.user_service import UserService
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "users.db"), size=2)
+    yield pool
+    pool.close()
+
+
+#---------------------POOL---------------------
+
+def test_file_database_uses_wal(pool):
+    with pool.connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_memory_pool_uses_a_single_connection():
+    pool = SQLitePool(size=2)
+    repository = SQLiteRoleRepository(pool)
+    repository.add(Role("admin"))
+    assert pool.size == 1
+    with pool.connection() as connection:
+        assert connection.execute("SELECT count(*) FROM roles").fetchone()[0] == 1
+    pool.close()
+
+def test_memory_pool_concurrent_writers():
+    pool = SQLitePool()
+    repository = SQLiteUserRepository(pool)
+    errors = []
+    def writer(worker):
+        try:
+            for i in range(100):
+                repository.add(User(f"user{worker}_{i}", f"user{worker}_{i}@correo.com", "hash"))
+                repository.update_password(f"user{worker}_{i}", "otrohash")
+        except Exception as error:
+            errors.append(error)
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(repository.get_all()) == 400
+    pool.close()
+
+def test_data_survives_reopening(tmp_path, sample_user_1):
+    path = str(tmp_path / "users.db")
+    first = SQLitePool(path)
+    SQLiteUserRepository(first).add(sample_user_1)
+    first.close()
+    second = SQLitePool(path)
+    user = SQLiteUserRepository(second).get(sample_user_1.username)
+    assert user.id == sample_user_1.id
+    assert user.created_at == sample_user_1.created_at
+    second.close()
+
+#---------------------USERS---------------------
+
+def test_user_crud(pool, sample_user_1, sample_user_2):
+    repository = SQLiteUserRepository(pool)
+    repository.add(sample_user_1)
+    repository.add(sample_user_2)
+    assert [user.username for user in repository.get_all()] == [sample_user_1.username, sample_user_2.username]
+    assert repository.find_by_email("TOMAS01@correo.com").username == sample_user_1.username
+    repository.update_username(sample_user_1.username, "tutancamon")
+    repository.update_email("tutancamon", "tut@correo.com")
+    repository.update_password("tutancamon", "newhash")
+    repository.update_status("tutancamon", UserStatus.ACTIVE)
+    user = repository.get("tutancamon")
+    assert (user.email, user.password, user.status) == ("tut@correo.com", "newhash", UserStatus.ACTIVE)
+    assert repository.find(sample_user_1.username) is None
+    assert repository.find_by_email(sample_user_1.email) is None
+    repository.delete("tutancamon")
+    assert repository.find("tutancamon") is None
+
+def test_user_conflicts(pool, sample_user_1, sample_user_2):
+    repository = SQLiteUserRepository(pool)
+    repository.add(sample_user_1)
+    repository.add(sample_user_2)
+    with pytest.raises(UserValidationError, match=messages.USER_ALREADY_EXISTS):
+        repository.add(sample_user_1)
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        repository.add(User("otro", sample_user_1.email, "pass"))
+    with pytest.raises(UserValidationError, match=messages.USER_ALREADY_EXISTS):
+        repository.update_username(sample_user_1.username, sample_user_2.username)
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        repository.update_email(sample_user_1.username, sample_user_2.email)
+
+def test_user_not_found(pool):
+    repository = SQLiteUserRepository(pool)
+    with pytest.raises(UserNotFoundError, match=messages.USER_NOT_FOUND):
+        repository.get("nobody")
+    with pytest.raises(UserNotFoundError, match=messages.USER_NOT_FOUND):
+        repository.delete("nobody")
+
+def test_user_service_over_sqlite(pool, sample_user_data_1):
+    service = UserService(SQLiteUserRepository(pool))
+    service.create_user(**sample_user_data_1)
+    assert service.verify_user_password(sample_user_data_1["username"], sample_user_data_1["password"]) is True
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        service.create_user("otro", sample_user_data_1["email"], "pass123")
+
+#---------------------ROLES/PERMISSIONS---------------------
+
+@pytest.mark.parametrize("repository_cls, model, already_exists, not_found", [
+    (SQLiteRoleRepository, Role, RoleAlreadyExistsError, RoleNotFoundError),
+    (SQLitePermissionRepository, Permission, PermissionAlreadyExistsError, PermissionNotFoundError),
+], ids=["roles", "permissions"])
+def test_named_entity_crud(pool, repository_cls, model, already_exists, not_found):
+    repository = repository_cls(pool)
+    entity = repository.add(model("Admin", "Acceso total"))
+    with pytest.raises(already_exists):
+        repository.add(model("admin"))
+    assert repository.get(" ADMIN ").id == entity.id
+    assert repository.update_description("admin", "Nueva").description == "Nueva"
+    assert [item.description for item in repository.get_all()] == ["Nueva"]
+    repository.delete("admin")
+    assert repository.find("admin") is None
+    with pytest.raises(not_found):
+        repository.get("admin")
+
+#---------------------RELATIONS---------------------
+
+def test_user_role_relations(pool):
+    repository = SQLiteUserRoleRepository(pool)
+    repository.add(UserRole("u1", "r1"))
+    repository.add(UserRole("u2", "r1"))
+    repository.add(UserRole("u1", "r2"))
+    with pytest.raises(ValueError):
+        repository.add(UserRole("u1", "r1"))
+    assert [relation.role_id for relation in repository.get_roles_by_user("u1")] == ["r1", "r2"]
+    assert [relation.user_id for relation in repository.get_users_by_role("r1")] == ["u1", "u2"]
+    assert repository.update_role_relation("u2", "r1", "r3").role_id == "r3"
+    with pytest.raises(ValueError):
+        repository.update_role_relation("u1", "r1", "r2")
+    with pytest.raises(ValueError):
+        repository.update_role_relation("u9", "r1", "r2")
+    repository.delete("u1", "r1")
+    assert repository.find("u1", "r1") is None
+    assert len(repository.get_all()) == 2
+    with pytest.raises(ValueError):
+        repository.delete("u1", "r1")
+
+def test_role_permission_relations(pool):
+    repository = SQLiteRolePermissionRepository(pool)
+    repository.add(RolePermission("r1", "p1"))
+    repository.add(RolePermission("r2", "p1"))
+    with pytest.raises(ValueError):
+        repository.add(RolePermission("r1", "p1"))
+    assert repository.role_has_permission("r1", "p1") is True
+    assert [relation.role_id for relation in repository.get_roles_by_permission("p1")] == ["r1", "r2"]
+    repository.update_permission_relation("r1", "p1", "p2")
+    assert repository.role_has_permission("r1", "p1") is False
+    assert [relation.permission_id for relation in repository.get_permissions_by_role("r1")] == ["p2"]
+    repository.delete("r1", "p2")
+    assert repository.find("r1", "p2") is None
+
+def test_iter_all_pages_by_rowid(pool):
+    users = SQLiteUserRepository(pool)
+    relations = SQLiteUserRoleRepository(pool)
+    for i in range(7):
+        users.add(User(f"user{i}", f"user{i}@correo.com", "hash"))
+        relations.add(UserRole(f"u{i}", "r1"))
+    users.delete("user3")
+    assert [user.username for user in users.iter_all(chunk_size=2)] == [f"user{i}" for i in (0, 1, 2, 4, 5, 6)]
+    assert [relation.user_id for relation in relations.iter_all(chunk_size=3)] == [f"u{i}" for i in range(7)]
+
+def test_get_page_follows_id_and_key_order(pool):
+    users = SQLiteUserRepository(pool)
+    relations = SQLiteRolePermissionRepository(pool)
+    created = [users.add(User(f"user{i}", f"user{i}@correo.com", "hash")) for i in range(5)]
+    for permission_id in ("p3", "p1", "p2"):
+        relations.add(RolePermission("r1", permission_id))
+    first = users.get_page(limit=2)
+    assert [user.username for user in first] == ["user0", "user1"]
+    assert [user.id for user in users.get_page(first[-1].id, 10)] == [user.id for user in created[2:]]
+    assert [relation.permission_id for relation in relations.get_page(("r1", "p1"), 10)] == ["p2", "p3"]
+
+#---------------------CONCURRENCY---------------------
+
+def test_concurrent_writers_share_pool(pool):
+    repository = SQLiteUserRoleRepository(pool)
+    def writer(worker):
+        for i in range(50):
+            repository.add(UserRole(f"u{worker}", f"r{i}"))
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(repository.get_all()) == 200
+
+#---------------------VERSIONS---------------------
+
+def test_updates_check_and_persist_version(pool):
+    users = SQLiteUserRepository(pool)
+    roles = SQLiteRoleRepository(pool)
+    users.add(User("xion", "xion@correo.com", "hash"))
+    roles.add(Role("admin"))
+    assert users.update_email("xion", "nuevo@correo.com", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError):
+        users.update_status("xion", UserStatus.BLOCKED, expected_version=1)
+    assert users.update_status("xion", UserStatus.ACTIVE).version == 3
+    assert roles.update_description("admin", "Todo", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError):
+        roles.update_description("admin", "Nada", expected_version=1)
+    assert (users.get("xion").version, roles.get("admin").description) == (3, "Todo")
+
+def test_stale_read_is_not_written(pool):
+    first, second = SQLiteUserRepository(pool), SQLiteUserRepository(pool)
+    first.add(User("xion", "xion@correo.com", "hash"))
+    stale = first.get
+    # Simula otra escritura entre la lectura y el UPDATE de first
+    def get_then_race(username):
+        user = stale(username)
+        if user.version == 1:
+            second.update_password("xion", "hash2")
+        return user
+    first.get = get_then_race
+    with pytest.raises(VersionConflictError):
+        first.update_email("xion", "nuevo@correo.com", expected_version=1)
+    assert first.update_email("xion", "nuevo@correo.com").version == 3
+    assert (second.get("xion").password, second.get("xion").email) == ("hash2", "nuevo@correo.com")
+
+def test_pool_adds_version_column_to_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE roles (id TEXT PRIMARY KEY, name TEXT NOT NULL UNIQUE, description TEXT NOT NULL,"
+                       " created_at INTEGER NOT NULL, updated_at INTEGER NOT NULL)")
+    connection.execute("INSERT INTO roles VALUES ('0190a6e2-7c1b-7000-8000-000000000001', 'admin', '', 0, 0)")
+    connection.commit()
+    connection.close()
+    pool = SQLitePool(path, size=1)
+    try:
+        assert SQLiteRoleRepository(pool).get("admin").version == 1
+    finally:
+        pool.close()
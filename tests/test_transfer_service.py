@@ -0,0 +1,138 @@
+import gzip
+import json
+import pytest
+from src.models.user import User
+from src.models.role import Role
+from src.models.permission import Permission
+from src.models.user_role import UserRole
+from src.models.role_permission import RolePermission
+from src.services import transfer_service
+from src.services.transfer_service import TransferService, read_rows
+
+
+@pytest.fixture
+def source():
+    service = TransferService(chunk_size=2)
+    for i in range(5):
+        service.user_repository.add(User(f"user{i}", f"user{i}@correo.com", f"$2b$12$hash{i}"))
+    service.user_repository.get("user1").activate()
+    service.role_repository.add(Role("admin", "Acceso total"))
+    service.role_repository.add(Role("editor", "Edición, con acentos"))
+    service.permission_repository.add(Permission("read"))
+    service.user_role_repository.add(UserRole("u1", "admin"))
+    service.user_role_repository.add(UserRole("u2", "editor"))
+    service.role_permission_repository.add(RolePermission("admin", "read"))
+    return service
+
+
+def test_export_users_without_password_hashes_by_default(source, tmp_path):
+    path = str(tmp_path / "users.csv")
+    assert source.export_users(path) == 5
+    rows = list(read_rows(path))
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(5)]
+    assert "password" not in rows[0]
+    assert rows[1]["status"] == "active"
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl", "csv.gz", "jsonl.gz"])
+def test_round_trip_between_environments(source, tmp_path, extension):
+    target = TransferService(chunk_size=2)
+    paths = {name: str(tmp_path / f"{name}.{extension}") for name in
+             ("users", "roles", "permissions", "user_roles", "role_permissions")}
+    source.export_users(paths["users"], include_password_hashes=True)
+    source.export_roles(paths["roles"])
+    source.export_permissions(paths["permissions"])
+    source.export_user_roles(paths["user_roles"])
+    source.export_role_permissions(paths["role_permissions"])
+
+    assert target.import_users(paths["users"]) == {"imported": 5, "failed": 0}
+    assert target.import_roles(paths["roles"]) == {"imported": 2, "failed": 0}
+    assert target.import_permissions(paths["permissions"]) == {"imported": 1, "failed": 0}
+    assert target.import_user_roles(paths["user_roles"]) == {"imported": 2, "failed": 0}
+    assert target.import_role_permissions(paths["role_permissions"]) == {"imported": 1, "failed": 0}
+
+    original, copied = source.user_repository.get("user1"), target.user_repository.get("user1")
+    assert (copied.id, copied.email, copied.password, copied.status, copied.created_at, copied.version) == \
+           (original.id, original.email, original.password, original.status, original.created_at, original.version)
+    assert target.role_repository.get("editor").description == "Edición, con acentos"
+    assert [r.role_id for r in target.user_role_repository.get_roles_by_user("u2")] == ["editor"]
+    assert target.role_permission_repository.role_has_permission("admin", "read")
+
+def test_gzip_output_is_compressed(source, tmp_path):
+    path = str(tmp_path / "users.jsonl.gz")
+    source.export_users(path)
+    with gzip.open(path, "rt") as file:
+        assert json.loads(file.readline())["username"] == "user0"
+
+def test_import_reports_conflicting_and_invalid_rows(source, tmp_path):
+    path = str(tmp_path / "users.jsonl")
+    source.export_users(path, include_password_hashes=True)
+    with open(path, "a") as file:
+        file.write(json.dumps({"username": "sinhash", "email": "x@correo.com"}) + "\n")
+    target = TransferService(chunk_size=2)
+    target.user_repository.add(User("user3", "otro@correo.com", "hash"))
+    reports = list(target.iter_import_users(path))
+    failed = {report["key"]: report["error"] for report in reports if not report["success"]}
+    assert set(failed) == {"user3", "sinhash"}
+    assert failed["sinhash"] == "Falta el campo id"
+    assert target.user_repository.find("user2") is not None
+    assert target.user_repository.find("user4") is not None
+
+def test_export_tolerates_concurrent_writes(source, tmp_path, monkeypatch):
+    to_row = transfer_service._user_to_row
+    def write_while_exporting(user, include_password_hash):
+        if user.username.startswith("user"):
+            source.user_repository.add(User(f"nuevo{user.username}", f"nuevo{user.username}@correo.com", "hash"))
+        return to_row(user, include_password_hash)
+    monkeypatch.setattr(transfer_service, "_user_to_row", write_while_exporting)
+    assert source.export_users(str(tmp_path / "users.csv")) == 10
+
+def test_import_validates_restored_rows(source, tmp_path):
+    users, roles = str(tmp_path / "users.jsonl"), str(tmp_path / "roles.jsonl")
+    source.export_users(users, include_password_hashes=True)
+    source.export_roles(roles)
+    rows = list(read_rows(users))
+    rows[0]["email"], rows[1]["username"] = "sin-arroba", " "
+    transfer_service.write_rows(users, tuple(rows[0]), rows)
+    role_rows = list(read_rows(roles))
+    role_rows[0]["name"] = "  "
+    transfer_service.write_rows(roles, tuple(role_rows[0]), role_rows)
+
+    target = TransferService()
+    assert target.import_users(users) == {"imported": 3, "failed": 2}
+    assert target.import_roles(roles) == {"imported": 1, "failed": 1}
+    assert target.user_repository.find("user0") is None
+
+def test_import_reports_malformed_lines(source, tmp_path):
+    path = str(tmp_path / "users.jsonl")
+    source.export_users(path, include_password_hashes=True)
+    lines = open(path).read().splitlines()
+    lines[1:1] = ['{"username": "roto"', "[1, 2]"]
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+    target = TransferService(chunk_size=3)
+    reports = list(target.iter_import_users(path))
+    failed = [report for report in reports if not report["success"]]
+    assert [report["row"] for report in failed] == [1, 2]
+    assert failed[0]["error"] == "Linea 2: no es un objeto JSON valido"
+    assert sum(report["success"] for report in reports) == 5
+
+def test_import_without_hashes_fails_rows(source, tmp_path):
+    path = str(tmp_path / "users.csv")
+    source.export_users(path)
+    reports = list(TransferService().iter_import_users(path))
+    assert not any(report["success"] for report in reports) and len(reports) == 5
+    assert "include_password_hashes=True" in reports[0]["error"]
+
+def test_import_rejects_unknown_hash_formats(source, tmp_path):
+    path = str(tmp_path / "users.jsonl")
+    source.export_users(path, include_password_hashes=True)
+    rows = list(read_rows(path))
+    rows[0]["password"] = "texto-plano"
+    transfer_service.write_rows(path, tuple(rows[0]), rows)
+    target = TransferService()
+    assert target.import_users(path) == {"imported": 4, "failed": 1}
+    assert target.user_repository.find("user0") is None
+
+def test_unsupported_extension(source, tmp_path):
+    with pytest.raises(ValueError):
+        source.export_roles(str(tmp_path / "roles.xml"))
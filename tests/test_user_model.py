@@ -120,3 +120,16 @@ def test_user_has_roles_list(sample_user_3):
     assert hasattr(sample_user_3, 'roles')
     assert isinstance(sample_user_3.roles, list)
     assert len(sample_user_3.roles) == 0
+
+# -------------------- VERSION --------------------
+
+def test_every_change_increments_version(sample_user_2):
+    assert sample_user_2.version == 1
+    sample_user_2.update_email("otro@correo.com")
+    sample_user_2.activate()
+    assert sample_user_2.version == 3
+
+def test_restore_keeps_version(sample_user_1):
+    restored = User.restore(sample_user_1.id, sample_user_1.username, sample_user_1.email, sample_user_1.password,
+                            sample_user_1.status, sample_user_1.created_at, sample_user_1.updated_at, 7)
+    assert restored.version == 7
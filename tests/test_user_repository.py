@@ -3,6 +3,7 @@ from src.exceptions.user_exceptions import UserValidationError, UserNotFoundErro
 from src.constants import messages
 from src.models.user_status import UserStatus
 from src.models.user import User
+from src.exceptions.concurrency_exceptions import VersionConflictError
 
 
 #---------------------ADD/GET---------------------
@@ -161,3 +162,73 @@ def test_update_status_multiple_changes(user_repo, sample_user_3):
     
     user_repo.update_status(sample_user_3.username, UserStatus.BLOCKED)
     assert user_repo.get(sample_user_3.username).status == UserStatus.BLOCKED
+
+
+# -------------------- EMAIL INDEX --------------------
+
+def test_find_by_email_is_case_insensitive(user_repo, sample_user_2):
+    user_repo.add(sample_user_2)
+    assert user_repo.find_by_email("  JUAN@correo.com ") is sample_user_2
+
+def test_add_user_with_duplicate_email(user_repo, sample_user_2):
+    user_repo.add(sample_user_2)
+    duplicated = User(username="otro", email="Juan@correo.com", password="passotro")
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        user_repo.add(duplicated)
+    assert user_repo.find("otro") is None
+
+def test_email_index_follows_update_email(user_repo, sample_user_3):
+    user_repo.add(sample_user_3)
+    user_repo.update_email(sample_user_3.username, "newaxel@correo.com")
+    assert user_repo.find_by_email("axel@correo.com") is None
+    assert user_repo.find_by_email("newaxel@correo.com") is sample_user_3
+
+def test_update_email_to_registered_email(user_repo, sample_user_2, sample_user_3):
+    user_repo.add(sample_user_2)
+    user_repo.add(sample_user_3)
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        user_repo.update_email(sample_user_3.username, sample_user_2.email)
+    assert user_repo.get(sample_user_3.username).email == "axel@correo.com"
+
+def test_email_index_follows_update_username(user_repo, sample_user_1):
+    user_repo.add(sample_user_1)
+    user_repo.update_username(sample_user_1.username, "tutancamon")
+    assert user_repo.find_by_email(sample_user_1.email).username == "tutancamon"
+
+def test_email_index_follows_delete(user_repo, sample_user_3):
+    user_repo.add(sample_user_3)
+    user_repo.delete(sample_user_3.username)
+    assert user_repo.find_by_email(sample_user_3.email) is None
+
+def test_add_many_is_atomic(user_repo, sample_user_1, sample_user_2):
+    user_repo.add(sample_user_2)
+    duplicated = User(username="otro", email=sample_user_2.email, password="passotro")
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        user_repo.add_many([sample_user_1, duplicated])
+    assert user_repo.find(sample_user_1.username) is None
+    user_repo.add_many([sample_user_1])
+    assert user_repo.find_by_email(sample_user_1.email) is sample_user_1
+
+def test_iter_all(user_repo, sample_user_1, sample_user_2):
+    user_repo.add(sample_user_1)
+    user_repo.add(sample_user_2)
+    iterator = user_repo.iter_all()
+    assert next(iterator) is sample_user_1
+    assert list(iterator) == [sample_user_2]
+
+def test_get_page(user_repo, sample_user_1, sample_user_2):
+    user_repo.add(sample_user_1)
+    user_repo.add(sample_user_2)
+    assert user_repo.get_page(limit=1) == [sample_user_1]
+    assert user_repo.get_page(sample_user_1.id) == [sample_user_2]
+    user_repo.delete(sample_user_2.username)
+    assert user_repo.get_page(sample_user_1.id) == []
+
+def test_updates_with_expected_version(user_repo, sample_user_1):
+    user_repo.add(sample_user_1)
+    assert user_repo.update_email(sample_user_1.username, "nuevo@correo.com", expected_version=1).version == 2
+    with pytest.raises(VersionConflictError, match=messages.VERSION_CONFLICT) as error:
+        user_repo.update_status(sample_user_1.username, UserStatus.BLOCKED, expected_version=1)
+    assert (error.value.expected_version, error.value.current_version) == (1, 2)
+    assert user_repo.get(sample_user_1.username).status != UserStatus.BLOCKED
+    assert user_repo.update_password(sample_user_1.username, "otrohash").version == 3
@@ -85,6 +85,30 @@ def test_delete(user_role_repo, sample_user1_role1_data,sample_user2_role2_data)
     list_users = user_role_repo.get_all()
     assert len(list_users) == 2
     user_role_repo.delete("u1","r1")
-    assert len(list_users) == 1
+    assert len(user_role_repo.get_all()) == 1
+    assert user_role_repo.find("u1","r1") is None
 
+def test_delete_nonexistent_relation(user_role_repo):
+    with pytest.raises(ValueError):
+        user_role_repo.delete("u1","r1")
+
+#---------------------Indexes---------------------
 
+def test_indexes_follow_update(user_role_repo, sample_user1_role1_data):
+    user_role_repo.add(UserRole(**sample_user1_role1_data))
+    user_role_repo.update_role_relation("u1","r1","r2")
+    assert user_role_repo.get_users_by_role("r1") == []
+    assert [relation.user_id for relation in user_role_repo.get_users_by_role("r2")] == ["u1"]
+    assert [relation.role_id for relation in user_role_repo.get_roles_by_user("u1")] == ["r2"]
+
+def test_update_to_existing_relation(user_role_repo, sample_user1_role1_data, sample_user1_role2_data):
+    user_role_repo.add(UserRole(**sample_user1_role1_data))
+    user_role_repo.add(UserRole(**sample_user1_role2_data))
+    with pytest.raises(ValueError):
+        user_role_repo.update_role_relation("u1","r1","r2")
+    assert len(user_role_repo.get_roles_by_user("u1")) == 2
+
+def test_get_all_returns_copy(user_role_repo, sample_user1_role1_data):
+    user_role_repo.add(UserRole(**sample_user1_role1_data))
+    user_role_repo.get_all().clear()
+    assert user_role_repo.find("u1","r1") is not None
@@ -1,8 +1,14 @@
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from src.exceptions.user_exceptions import UserValidationError, UserNotFoundError, SameEmailError
 from src.constants import messages
+from src.security import password_utils
 from src.security.password_utils import verify_password
+from src.models.user import User
 from src.models.user_status import UserStatus
+from src.services.user_service import UserService
 
 
 def test_create_user_service(user_service, sample_user_data_2):
@@ -71,6 +77,14 @@ def test_update_email_same_as_current(user_service, sample_user_data_1):
     with pytest.raises(SameEmailError, match=messages.SAME_EMAIL):
         user_service.update_email(sample_user_data_1["username"], "xion@correo.com")
 
+def test_update_email_changing_only_case(user_service, sample_user_data_1, sample_user_data_2):
+    user_service.create_user(**sample_user_data_1)
+    user_service.create_user(**sample_user_data_2)
+    result = user_service.update_email(sample_user_data_1["username"], "XION@correo.com")
+    assert result["email"] == "XION@correo.com"
+    with pytest.raises(UserValidationError, match=messages.EMAIL_ALREADY_REGISTERED):
+        user_service.update_email(sample_user_data_1["username"], sample_user_data_2["email"].upper())
+
 
 # -------------------- UPDATE USERNAME --------------------
 
@@ -260,4 +274,124 @@ def test_user_status_workflow(user_service):
     # Bloquear usuario
     user_service.block_user("chris")
     user = user_service.get_user("chris")
-    assert user.status == UserStatus.BLOCKED
\ No newline at end of file
+    assert user.status == UserStatus.BLOCKED
+
+# -------------------- BULK CREATE --------------------
+
+def test_create_users_bulk_reports_each_row(user_service, sample_user_data_1):
+    user_service.create_user(**sample_user_data_1)
+    rows = [
+        {"username": "ana", "email": "ana@correo.com", "password": "pass123"},
+        ("beto", "beto@correo.com", "pass456"),
+        ("ana", "otra@correo.com", "pass789"),
+        ("carla", "ANA@correo.com", "pass789"),
+        ("dario", sample_user_data_1["email"], "pass789"),
+        ("eva", "eva@correo.com", "corta"),
+        ("", "vacio@correo.com", "pass789"),
+    ]
+    report = user_service.create_users_bulk(rows, chunk_size=3)
+    assert [row["row"] for row in report] == list(range(len(rows)))
+    assert [row["success"] for row in report] == [True, True, False, False, False, False, False]
+    assert report[2]["error"] == messages.USER_ALREADY_EXISTS
+    assert report[3]["error"] == messages.EMAIL_ALREADY_REGISTERED
+    assert report[4]["error"] == messages.EMAIL_ALREADY_REGISTERED
+    assert report[5]["error"] == messages.USER_INVALID_PASSWORD
+    assert report[6]["error"] == messages.USER_INVALID_USERNAME
+    assert verify_password("pass123", user_service.get_user("ana").password)
+    assert user_service.get_user_by_email("beto@correo.com").username == "beto"
+
+def test_create_users_bulk_accepts_generators(user_service):
+    rows = ((f"user{i}", f"user{i}@correo.com", "pass123") for i in range(5))
+    report = user_service.iter_create_users_bulk(rows, chunk_size=2)
+    assert all(row["success"] for row in report)
+    assert len(user_service.get_all_users()) == 5
+
+def test_create_users_bulk_with_custom_executor(user_service):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = user_service.create_users_bulk([("zoe", "zoe@correo.com", "pass123")], executor=executor)
+    assert report[0]["success"] is True
+    assert verify_password("pass123", user_service.get_user("zoe").password)
+
+def test_create_users_bulk_reports_malformed_rows(user_service):
+    rows = [("ana", "ana@correo.com"), {"username": "beto"}, ("carla", 123, "pass123"), None,
+            ("dario", "dario@correo.com", "pass123")]
+    report = user_service.create_users_bulk(rows)
+    assert [row["error"] for row in report[:4]] == [messages.INVALID_BULK_ROW] * 4
+    assert report[4]["success"] is True
+    assert [user.username for user in user_service.get_all_users()] == ["dario"]
+
+def test_create_users_bulk_does_not_fill_shared_password_pool(user_service, monkeypatch):
+    monkeypatch.setattr(password_utils, "_pool", password_utils.PasswordHashingPool(max_workers=2, max_queue=4))
+    rows = [(f"user{i}", f"user{i}@correo.com", "pass123") for i in range(10)]
+    assert all(row["success"] for row in user_service.create_users_bulk(rows))
+    assert password_utils.get_password_pool().metrics()["rejected"] == 0
+
+def test_create_users_bulk_only_fails_conflicting_rows(user_service, monkeypatch):
+    def conflict(users):
+        # Otra escritura toma el username de una fila entre la validacion y el insert
+        user_service.repository.add(User("bruno", "otro@correo.com", "hash"))
+        raise UserValidationError(messages.USER_ALREADY_EXISTS)
+    monkeypatch.setattr(user_service.repository, "add_many", conflict)
+    rows = [("ana", "ana@correo.com", "pass123"), ("bruno", "bruno@correo.com", "pass123"),
+            ("carla", "carla@correo.com", "pass123")]
+    report = user_service.create_users_bulk(rows)
+    assert [(row["success"], row["error"]) for row in report] == [
+        (True, None), (False, messages.USER_ALREADY_EXISTS), (True, None)]
+    assert user_service.get_user("ana").password != "pass123"
+
+
+# -------------------- REHASH ON LOGIN --------------------
+
+def wait_for_password_change(user_service, username, old_hash, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while user_service.get_user(username).password == old_hash and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return user_service.get_user(username).password
+
+def test_verify_rehashes_outdated_cost(user_service, bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    user = user_service.create_user("rehash", "rehash@correo.com", "pass123")
+    old_hash = user.password
+    bcrypt_rounds.set_bcrypt_rounds(5)
+    assert user_service.verify_user_password("rehash", "pass123") is True
+    new_hash = wait_for_password_change(user_service, "rehash", old_hash)
+    assert bcrypt_rounds.get_hash_rounds(new_hash) == 5
+    assert verify_password("pass123", new_hash)
+
+def test_verify_with_wrong_password_does_not_rehash(user_service, bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    user = user_service.create_user("rehash", "rehash@correo.com", "pass123")
+    bcrypt_rounds.set_bcrypt_rounds(5)
+    assert user_service._schedule_rehash("rehash", "pass123", "$2b$05$current") is None
+    assert user_service.verify_user_password("rehash", "wrongpass") is False
+    assert user_service.get_user("rehash").password == user.password
+
+def test_rehash_disabled(bcrypt_rounds):
+    service = UserService(rehash_on_login=False)
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    user = service.create_user("rehash", "rehash@correo.com", "pass123")
+    bcrypt_rounds.set_bcrypt_rounds(5)
+    assert service._schedule_rehash("rehash", "pass123", user.password) is None
+
+def test_rehash_does_not_override_new_password(user_service, bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    user = user_service.create_user("rehash", "rehash@correo.com", "pass123")
+    old_hash = user.password
+    user_service.update_password("rehash", "pass123", "newpass456")
+    user_service._rehash_password("rehash", "pass123", old_hash)
+    assert verify_password("newpass456", user_service.get_user("rehash").password)
+
+def test_rehash_skips_password_changed_after_read(user_service, bcrypt_rounds):
+    bcrypt_rounds.set_bcrypt_rounds(4)
+    user = user_service.create_user("rehash", "rehash@correo.com", "pass123")
+    old_hash = user.password
+    find = user_service.repository.find
+    def find_then_change(username):
+        # Copia como la que retorna un repositorio con I/O, seguida de un cambio concurrente
+        found = copy.copy(find(username))
+        del user_service.repository.find
+        user_service.update_password("rehash", "pass123", "newpass456")
+        return found
+    user_service.repository.find = find_then_change
+    user_service._rehash_password("rehash", "pass123", old_hash)
+    assert verify_password("newpass456", user_service.get_user("rehash").password)